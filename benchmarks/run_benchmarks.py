@@ -0,0 +1,515 @@
+"""
+Benchmarks for the computational hot paths of the day modules.
+
+Every benchmark times a fixed batch of operations several times and keeps the
+best run as nanoseconds per operation, which is the least noisy figure on a
+shared machine. Each timed run is followed by a run of a fixed pure-Python
+reference workload, and a benchmark's score is its time divided by the
+reference time measured alongside it.
+
+Absolute ns/op figures only mean something on the machine that recorded
+them, so runs are compared with the baseline by score: a benchmark regresses
+when its score is worse than the baseline's by more than the threshold. That
+cancels out most of the difference between a faster and a slower machine,
+but not all of it, and a loaded machine still moves scores by 10-30%. The
+comparison is therefore a report by default; --check turns it into a gate
+that exits 1 on a regression, meant for a quiet machine comparing against a
+baseline it recorded itself. Results are written as JSON.
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # report changes against baseline.json
+    python benchmarks/run_benchmarks.py --check              # also fail on a regression
+    python benchmarks/run_benchmarks.py --save-baseline      # record a new baseline on this machine
+    python benchmarks/run_benchmarks.py -k day_005 --threshold 0.1 --output results.json
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple
+
+# --- CONSTANTS ---
+BENCHMARK_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARK_DIR.parent / "src"
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_REPEAT = 7
+DEFAULT_THRESHOLD = 0.20  # Fail when the score is more than 20% worse than the baseline's
+REFERENCE_OPS = 20_000
+RESULTS_VERSION = 2  # Version 2 adds the reference timing that scores are computed from
+
+Operation = Callable[[], object]
+
+
+class Benchmark(NamedTuple):
+    """A registered benchmark: setup builds the operation, which runs `ops` iterations per call."""
+
+    name: str
+    setup: Callable[[], Operation]
+    ops: int
+
+
+class Comparison(NamedTuple):
+    """One benchmark measured against its baseline; `ratio` compares scores, not raw times."""
+
+    name: str
+    baseline_ns: float | None
+    current_ns: float
+    ratio: float | None
+    regressed: bool
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str, ops: int) -> Callable[[Callable[[], Operation]], Callable[[], Operation]]:
+    """Register a setup function; the callable it returns is what gets timed."""
+
+    def register(setup: Callable[[], Operation]) -> Callable[[], Operation]:
+        BENCHMARKS.append(Benchmark(name, setup, ops))
+        return setup
+
+    return register
+
+
+def load_day(name: str) -> ModuleType:
+    """Import a day module from src/ the same way pytest's pythonpath does."""
+    if str(SRC_DIR) not in sys.path:
+        sys.path.insert(0, str(SRC_DIR))
+    return importlib.import_module(name)
+
+
+# --- Day 2: tip calculator ---
+@benchmark("day_002.calculate_split", ops=10_000)
+def bench_day_002_calculate_split() -> Operation:
+    day_002 = load_day("day_002")
+    bills = [day_002.Money(1_000 + n * 7919 % 500_000) for n in range(10_000)]
+
+    def run() -> None:
+        for n, bill in enumerate(bills):
+            tip = day_002.calculate_tip_amount(bill, n % 31)
+            day_002.calculate_split_amount(day_002.calculate_total_with_tip(bill, tip), n % 12 + 1)
+
+    return run
+
+
+@benchmark("day_002.parse_bill_record", ops=10_000)
+def bench_day_002_parse_bill_record() -> Operation:
+    day_002 = load_day("day_002")
+    records = [
+        {"bill": f"{1 + n * 7919 % 100_000 / 100:.2f}", "tip": str(n % 31), "people": str(n % 12 + 1)}
+        for n in range(10_000)
+    ]
+
+    def run() -> None:
+        for record in records:
+            day_002.parse_bill_record(record)
+
+    return run
+
+
+@benchmark("day_002.validate_many", ops=10_000)
+def bench_day_002_validate_many() -> Operation:
+    day_002 = load_day("day_002")
+    column = [str(n % 12 + 1) for n in range(10_000)]
+    return lambda: day_002.validate_many("people", column)
+
+
+@benchmark("day_002.split_equal", ops=10_000)
+def bench_day_002_split_equal() -> Operation:
+    day_002 = load_day("day_002")
+    totals = [day_002.Money(1_000 + n * 7919 % 500_000) for n in range(10_000)]
+
+    def run() -> None:
+        for n, total in enumerate(totals):
+            day_002.split_equal(total, n % 12 + 1)
+
+    return run
+
+
+# --- Day 4: rock paper scissors ---
+@benchmark("day_004.determine_winner", ops=90_000)
+def bench_day_004_determine_winner() -> Operation:
+    day_004 = load_day("day_004")
+    rounds = [(player, computer) for player in day_004.CHOICES for computer in day_004.CHOICES] * 10_000
+
+    def run() -> None:
+        for player, computer in rounds:
+            day_004.determine_winner(player, computer)
+
+    return run
+
+
+# --- Day 5: password generator ---
+@benchmark("day_005.generate_password", ops=2_000)
+def bench_day_005_generate_password() -> Operation:
+    day_005 = load_day("day_005")
+
+    def run() -> None:
+        for _ in range(2_000):
+            day_005.generate_password(4, 4, 2, 2)
+
+    return run
+
+
+@benchmark("day_005.generate_passwords", ops=20_000)
+def bench_day_005_generate_passwords() -> Operation:
+    day_005 = load_day("day_005")
+    return lambda: day_005.generate_passwords(20_000, 4, 4, 2, 2)
+
+
+@benchmark("day_005.validate_password_requirements", ops=20_000)
+def bench_day_005_validate_password_requirements() -> Operation:
+    day_005 = load_day("day_005")
+    specs = [(n % 8, n % 5, n % 4, n % 3) for n in range(20_000)]
+
+    def run() -> None:
+        for spec in specs:
+            day_005.validate_password_requirements(*spec)
+
+    return run
+
+
+# --- Day 6: Karel primitives ---
+@benchmark("day_006.karel_primitives", ops=10_000)
+def bench_day_006_karel_primitives() -> Operation:
+    day_006 = load_day("day_006")
+
+    def run() -> None:
+        # The primitives narrate what Karel does; keep that out of the terminal
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(2_000):
+                if day_006.front_is_clear():
+                    day_006.move()
+                day_006.put_beeper()
+                if day_006.beepers_present():
+                    day_006.pick_beeper()
+                day_006.turn_left()
+
+    return run
+
+
+@benchmark("day_006.swarm_tick", ops=400_000)
+def bench_day_006_swarm_tick() -> Operation:
+    day_006 = load_day("day_006")
+    world = day_006.KarelWorld(1_000, 1_000)
+    swarm = day_006.KarelSwarm.scatter(world, 100_000, seed=6)
+    # Four ticks of 100k robot actions; array.array hands NumPy a buffer instead of a list to convert
+    actions = [array("b", [n * 7 % 6 for n in range(tick, tick + 100_000)]) for tick in range(4)]
+
+    def run() -> None:
+        for tick_actions in actions:
+            swarm.step(tick_actions)
+
+    return run
+
+
+@benchmark("day_006.interpreter", ops=130_003)
+def bench_day_006_interpreter() -> Operation:
+    day_006 = load_day("day_006")
+    world = day_006.KarelWorld(100, 100)
+    # 13 instructions per iteration including the loop bookkeeping, plus COUNT, the last LOOP and HALT
+    program = day_006.compile_program(
+        "repeat 10000 { put_beeper pick_beeper turn_left turn_left move turn_right turn_right move "
+        "if beepers_present { pick_beeper } else { turn_left turn_right } }"
+    )
+    return lambda: program.execute(world)
+
+
+@benchmark("day_006.distance_field", ops=250_000)
+def bench_day_006_distance_field() -> Operation:
+    day_006 = load_day("day_006")
+    world = day_006.KarelWorld(500, 500)
+    # Serpentine: wall every fourth column, leaving a gap alternately at the top and bottom
+    for wall_number, column in enumerate(range(2, 500, 4)):
+        gap = 0 if wall_number % 2 else 499
+        for y in range(500):
+            if y != gap:
+                world.add_wall(column, y)
+
+    def run() -> None:
+        world.distance_fields.clear()  # Time the BFS, not the cache
+        day_006.distance_field(world, (499, 499))
+
+    return run
+
+
+@benchmark("day_006.load_world_4096", ops=1)
+def bench_day_006_load_world_4096() -> Operation:
+    day_006 = load_day("day_006")
+    world = day_006.KarelWorld(4_096, 4_096)
+    for n in range(1, 100_000):
+        world.add_wall(n * 7919 % 4_096, n * 104_729 % 4_095 + 1)
+    # Kept alive by the closure; removed when the interpreter exits
+    directory = tempfile.TemporaryDirectory()
+    path = Path(directory.name) / "world.krw"
+    day_006.save_world(world, path)
+
+    def run() -> None:
+        loaded = day_006.load_world(path)
+        loaded.beepers_present()
+        _ = directory
+
+    return run
+
+
+@benchmark("day_006.plan_harvest", ops=5_000)
+def bench_day_006_plan_harvest() -> Operation:
+    day_006 = load_day("day_006")
+    world = day_006.KarelWorld(150, 150)
+    for n in range(1, 5_001):
+        cell = n * 7_919 % 22_500
+        world.set_beepers(cell % 150, cell // 150, 1)
+
+    def run() -> None:
+        world.distance_fields.clear()
+        day_006.plan_harvest(world)
+
+    return run
+
+
+@benchmark("day_006.spatial_queries", ops=200)
+def bench_day_006_spatial_queries() -> Operation:
+    day_006 = load_day("day_006")
+    world = day_006.KarelWorld(1_000, 1_000)
+    for n in range(1, 50_001):
+        cell = n * 7_919 % 1_000_000
+        world.set_beepers(cell % 1_000, cell // 1_000, 1)
+    world.spatial_index()
+    origins = [(n * 37 % 1_000, n * 91 % 1_000) for n in range(100)]
+
+    def run() -> None:
+        for x, y in origins:
+            world.nearest_beeper((x, y))
+            world.count_beepers((x // 2, y // 2), (x // 2 + 499, y // 2 + 499))
+
+    return run
+
+
+@benchmark("day_006.trace_seek", ops=4)
+def bench_day_006_trace_seek() -> Operation:
+    day_006 = load_day("day_006")
+    traced = day_006.TracedWorld(day_006.KarelWorld(100, 100))
+    for n in range(250_000):
+        traced.move()
+        traced.move()
+        traced.turn_left() if n % 2 else traced.put_beeper()
+        traced.pick_beeper()
+    replay = traced.trace.replay()
+    targets = (999_999, 3, 500_001, 0)
+
+    def run() -> None:
+        for step in targets:
+            replay.seek(step)
+
+    return run
+
+
+# --- Day 7: hangman ---
+@benchmark("day_007.guess_loop", ops=1_000)
+def bench_day_007_guess_loop() -> Operation:
+    day_007 = load_day("day_007")
+    words = day_007.hangman_words[:1_000]
+    guesses = "etaoinshrdlucmfwypvbgkqjxz"
+
+    def run() -> None:
+        for word in words:
+            game = day_007.HangmanGame(word)
+            for letter in guesses:
+                game.guess(letter)
+                if game.is_over:
+                    break
+
+    return run
+
+
+def reference_workload() -> int:
+    """
+    Fixed pure-Python work that scores are measured against.
+
+    Mixes the operations the day modules spend their time on: integer
+    arithmetic, dict and list updates, string building and builtin calls.
+    It never changes, so its time tracks the machine only.
+    """
+    counts: dict[int, int] = {}
+    parts = []
+    for n in range(REFERENCE_OPS):
+        key = n * 7919 % 257
+        counts[key] = counts.get(key, 0) + divmod(n * n, 97)[1]
+        parts.append(str(key))
+    return "".join(sorted(parts)).count("1") + len(counts)
+
+
+def time_benchmark(bench: Benchmark, repeat: int) -> dict[str, float | int]:
+    """
+    Time one benchmark after a warm-up run, interleaved with the reference workload.
+
+    Returns:
+        Dict with best and median nanoseconds per operation, the best
+        reference time per reference operation and the resulting score
+    """
+    operation = bench.setup()
+    operation()  # Warm caches and lazy imports before measuring
+    reference_workload()
+
+    samples = []
+    reference_samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        operation()
+        middle = time.perf_counter_ns()
+        reference_workload()
+        samples.append((middle - start) / bench.ops)
+        reference_samples.append((time.perf_counter_ns() - middle) / REFERENCE_OPS)
+
+    return {
+        "ns_per_op": min(samples),
+        "median_ns_per_op": statistics.median(samples),
+        "reference_ns_per_op": min(reference_samples),
+        "score": min(samples) / min(reference_samples),
+        "ops": bench.ops,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(selected: list[Benchmark], repeat: int) -> dict[str, Any]:
+    """Run the selected benchmarks and build the JSON results document."""
+    results = {}
+    for bench in selected:
+        results[bench.name] = time_benchmark(bench, repeat)
+        result = results[bench.name]
+        print(f"  {bench.name:<42} {result['ns_per_op']:>12,.0f} ns/op {result['score']:>12,.2f} x reference")
+
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[Comparison]:
+    """
+    Compare a run's scores against a baseline's.
+
+    Args:
+        current: Results document from run_benchmarks
+        baseline: Previously saved results document
+        threshold: Allowed score increase as a fraction (0.2 = 20%)
+
+    Returns:
+        One Comparison per benchmark in the current run; benchmarks the
+        baseline has no score for are reported as new
+    """
+    comparisons = []
+    for name, result in current["results"].items():
+        current_ns = result["ns_per_op"]
+        recorded = baseline.get("results", {}).get(name)
+        if recorded is None or "score" not in recorded:
+            comparisons.append(Comparison(name, None, current_ns, None, False))
+            continue
+
+        ratio = result["score"] / recorded["score"]
+        comparisons.append(Comparison(name, recorded["ns_per_op"], current_ns, ratio, ratio > 1 + threshold))
+    return comparisons
+
+
+def display_comparison(comparisons: list[Comparison], threshold: float) -> None:
+    """Print the comparison table."""
+    print(f"\n📊 Compared with baseline (threshold +{threshold:.0%} on time relative to the reference workload)")
+    print("-" * 86)
+    print(f"  {'Benchmark':<42} {'Baseline ns':>12} {'Current ns':>12} {'Score':>9}")
+    for comparison in comparisons:
+        if comparison.ratio is None or comparison.baseline_ns is None:
+            print(f"  {comparison.name:<42} {'—':>12} {comparison.current_ns:>12,.0f} {'new':>9}")
+            continue
+        marker = "❌" if comparison.regressed else "  "
+        change = comparison.ratio - 1
+        print(
+            f"  {comparison.name:<42} {comparison.baseline_ns:>12,.0f} {comparison.current_ns:>12,.0f}"
+            f" {change:>+9.1%} {marker}"
+        )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the day modules and gate on regressions.")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark")
+    parser.add_argument("--output", type=Path, help="Write this run's results to a JSON file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed score increase over the baseline before failing, as a fraction (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 when a benchmark regresses (use on a quiet machine)"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store this run as the new baseline instead of comparing"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmarks.
+
+    Returns:
+        Exit status: 0 on success, 1 if no benchmark matched or, with
+        --check, any benchmark regressed
+    """
+    args = _parse_args(argv)
+    selected = [bench for bench in BENCHMARKS if args.filter in bench.name]
+    if not selected:
+        print(f"❌ No benchmarks match {args.filter!r}")
+        return 1
+
+    print(f"⏱️  Running {len(selected)} benchmarks (best of {args.repeat})")
+    current = run_benchmarks(selected, args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        # Merge so a filtered run only replaces the benchmarks it measured
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        current["results"] = {**baseline.get("results", {}), **current["results"]}
+        args.baseline.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"⚠️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("version") != RESULTS_VERSION:
+        print(f"⚠️  Baseline {args.baseline} predates scored results; run with --save-baseline to refresh it")
+        return 0
+    comparisons = compare_results(current, baseline, args.threshold)
+    display_comparison(comparisons, args.threshold)
+
+    regressions = [comparison.name for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1 if args.check else 0
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
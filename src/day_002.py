@@ -25,13 +25,52 @@ This exercise focuses on:
 - Formatted output
 """
 
+import argparse
+import asyncio
+import csv
+import functools
+import json
 import logging
-from decimal import Decimal, InvalidOperation
+import sqlite3
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP, Decimal, InvalidOperation, localcontext
+from fractions import Fraction
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, TextIO
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 # --- CONSTANTS ---
 LARGE_PARTY = 20
 HUGE_PARTY = 50
 EXCESSIVE_TIP_AMOUNT = 30
+MIN_BILL_AMOUNT = 0.01
+MAX_BILL_AMOUNT = 100_000.0
+MIN_TIP_PERCENTAGE = 0
+MAX_TIP_PERCENTAGE = 100
+MIN_PEOPLE = 1
+MAX_PEOPLE = 100
+PIPELINE_CHUNK_ROWS = 10_000  # Output rows buffered before each write
+PIPELINE_FIELDS = ("bill", "tip", "people", "tip_amount", "total", "per_person")
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8002
+SERVICE_MAX_BATCH = 10_000  # Checks accepted in one request body
+SERVICE_MAX_BODY_BYTES = 16 * 1024 * 1024
+SERVICE_LATENCY_WINDOW = 10_000  # Recent requests kept for percentile counters
+HISTORY_BATCH_SIZE = 1_000  # Records buffered before each history commit
+PPM = 1_000_000  # Tax and service-charge rates are stored in parts per million
+FX_CACHE_SIZE = 1024  # Currency pairs whose conversion factor stays memoized
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+CENTS_PER_DOLLAR = 100
+PERCENT = 100
+CENT = Decimal("0.01")
+# Rounding modes supported identically by the Decimal and integer-cent paths
+SUPPORTED_ROUNDING = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_DOWN, ROUND_UP)
 
 
 def display_welcome_message() -> None:
@@ -48,9 +87,168 @@ def display_welcome_message() -> None:
     print()  # Empty line for better readability
 
 
+CANCEL_WORDS = frozenset(("q", "quit", "exit"))
+
+
+class ValidationLimits:
+    """
+    Precompiled input limits shared by the interactive, pipeline and service paths.
+
+    The Decimal bill bounds are built once here instead of on every
+    validation, so a single instance can check any number of inputs.
+    """
+
+    __slots__ = (
+        "max_bill",
+        "max_bill_amount",
+        "max_people",
+        "max_tip",
+        "min_bill",
+        "min_bill_amount",
+        "min_people",
+        "min_tip",
+    )
+
+    def __init__(
+        self,
+        bill: tuple[float, float] = (MIN_BILL_AMOUNT, MAX_BILL_AMOUNT),
+        tip: tuple[int, int] = (MIN_TIP_PERCENTAGE, MAX_TIP_PERCENTAGE),
+        people: tuple[int, int] = (MIN_PEOPLE, MAX_PEOPLE),
+    ) -> None:
+        """
+        Args:
+            bill: (minimum, maximum) bill amount in dollars
+            tip: (minimum, maximum) tip percentage
+            people: (minimum, maximum) party size
+        """
+        min_people, max_people = people
+        if min_people < 1:
+            raise ValueError("min_people must be at least 1")
+        if min_people > max_people:
+            raise ValueError(f"min_people ({min_people}) cannot exceed max_people ({max_people})")
+
+        self.min_bill_amount, self.max_bill_amount = bill
+        self.min_bill = Decimal(str(self.min_bill_amount))
+        self.max_bill = Decimal(str(self.max_bill_amount))
+        self.min_tip, self.max_tip = tip
+        self.min_people = min_people
+        self.max_people = max_people
+
+
+DEFAULT_LIMITS = ValidationLimits()
+
+
+class ParseResult(NamedTuple):
+    """
+    Outcome of parsing one raw input.
+
+    `code` is "ok", "invalid" (not a number), "fraction" (people must be
+    whole) or "range"; `error` holds a message for anything but "ok".
+    """
+
+    value: Decimal | int | None
+    code: str
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """True when the input parsed and passed the range checks."""
+        return self.code == "ok"
+
+
+def is_cancel(raw: str) -> bool:
+    """Return True if the raw input asks to cancel."""
+    return raw.strip().lower() in CANCEL_WORDS
+
+
+def parse_bill(raw: str, limits: ValidationLimits = DEFAULT_LIMITS) -> ParseResult:
+    """
+    Parse and range-check a bill amount without any I/O.
+
+    Returns:
+        ParseResult with the amount rounded to cents as a Decimal
+    """
+    try:
+        amount = Decimal(raw)
+    except InvalidOperation:
+        return ParseResult(None, "invalid", f"❌ Invalid bill amount: {raw}")
+    if not amount.is_finite():
+        return ParseResult(None, "invalid", f"❌ Invalid bill amount: {raw}")
+
+    if amount < limits.min_bill:
+        return ParseResult(None, "range", f"⚠️  Minimum: ${limits.min_bill_amount:.2f}")
+    if amount > limits.max_bill:
+        return ParseResult(None, "range", f"⚠️  Maximum: ${limits.max_bill_amount:,.2f}")
+    return ParseResult(amount.quantize(CENT), "ok")
+
+
+def parse_tip(raw: str, limits: ValidationLimits = DEFAULT_LIMITS) -> ParseResult:
+    """
+    Parse and range-check a tip percentage without any I/O.
+
+    Decimal input is truncated to a whole percentage, as in the prompt.
+    """
+    try:
+        tip_percentage = int(float(raw))
+    except (ValueError, OverflowError):
+        return ParseResult(None, "invalid", f"❌ Invalid tip percentage: {raw}")
+
+    is_valid, error_msg = _validate_tip_in_range(tip_percentage, limits.min_tip, limits.max_tip)
+    return ParseResult(tip_percentage, "ok") if is_valid else ParseResult(None, "range", error_msg)
+
+
+def parse_people(raw: str, limits: ValidationLimits = DEFAULT_LIMITS) -> ParseResult:
+    """Parse and range-check a party size without any I/O."""
+    try:
+        num_people_float = float(raw)
+        num_people = int(num_people_float)
+    except (ValueError, OverflowError):
+        return ParseResult(None, "invalid", f"❌ Invalid number of people: {raw}")
+    if num_people_float != num_people:
+        return ParseResult(None, "fraction", "❌ Number of people must be a whole number (no decimals).")
+
+    is_valid, error_msg = _validate_people_count(num_people, limits.min_people, limits.max_people)
+    return ParseResult(num_people, "ok") if is_valid else ParseResult(None, "range", error_msg)
+
+
+_FIELD_PARSERS = {"bill": parse_bill, "tip": parse_tip, "people": parse_people}
+
+
+def validate_many(
+    field: str, raw_values: Iterable[str], limits: ValidationLimits = DEFAULT_LIMITS
+) -> list[ParseResult]:
+    """
+    Validate a whole column of raw strings for one field.
+
+    Real columns repeat values heavily (tips of "15", parties of "2"), so
+    each distinct string is parsed once and its immutable result reused.
+
+    Args:
+        field: "bill", "tip" or "people"
+        raw_values: Raw strings, e.g. one CSV column
+        limits: Precompiled limits to check against
+
+    Returns:
+        One ParseResult per input, in order
+    """
+    try:
+        parser = _FIELD_PARSERS[field]
+    except KeyError:
+        raise ValueError(f"Unknown field {field!r}; use one of {', '.join(_FIELD_PARSERS)}") from None
+
+    seen: dict[str, ParseResult] = {}
+    results = []
+    for raw in raw_values:
+        result = seen.get(raw)
+        if result is None:
+            result = seen[raw] = parser(raw.strip(), limits)
+        results.append(result)
+    return results
+
+
 def get_total_bill(
-    min_amount: float = 0.01,
-    max_amount: float = 100_000.0,
+    min_amount: float = MIN_BILL_AMOUNT,
+    max_amount: float = MAX_BILL_AMOUNT,
     allow_cancel: bool = True,
     logger: logging.Logger | None = None,
 ) -> Decimal | None:
@@ -59,29 +257,26 @@ def get_total_bill(
 
     Returns Decimal for precise currency math.
     """
+    limits = ValidationLimits(bill=(min_amount, max_amount))
+
     while True:
         user_input = input("What was the total bill? $ ").strip()
 
-        if allow_cancel and user_input.lower() in ("q", "quit", "exit"):
+        if allow_cancel and is_cancel(user_input):
             if logger:
                 logger.info("User cancelled bill input")
             return None
 
-        try:
-            # Decimal for currency precision
-            amount = Decimal(user_input)
-
-            if amount < Decimal(str(min_amount)):
-                print(f"⚠️  Minimum: ${min_amount:.2f}")
-            elif amount > Decimal(str(max_amount)):
-                print(f"⚠️  Maximum: ${max_amount:,.2f}")
-            else:
-                return amount.quantize(Decimal("0.01"))  # Round to cents
+        result = parse_bill(user_input, limits)
+        if result.ok and isinstance(result.value, Decimal):
+            return result.value
 
-        except (ValueError, InvalidOperation):
+        if result.code == "invalid":
             print("❌ Invalid input. Enter a number like 42.50")
             if logger:
                 logger.warning(f"Invalid bill input: {user_input}")
+        else:
+            print(result.error)
 
 
 def _validate_tip_in_range(tip_percentage: int, min_percentage: int, max_percentage: int) -> tuple[bool, str | None]:
@@ -115,8 +310,8 @@ def _confirm_unusual_tip(tip_percentage: int) -> bool:
 
 
 def get_tip_percentage(
-    min_percentage: int = 0,
-    max_percentage: int = 100,
+    min_percentage: int = MIN_TIP_PERCENTAGE,
+    max_percentage: int = MAX_TIP_PERCENTAGE,
     suggested_values: tuple[int, ...] = (10, 12, 15),
     allow_cancel: bool = True,
     logger: logging.Logger | None = None,
@@ -124,39 +319,36 @@ def get_tip_percentage(
     """Get tip percentage with validation and suggestions."""
     suggestions = ", ".join(map(str, suggested_values))
     prompt = f"What percentage tip would you like to give? ({suggestions}%) "
+    limits = ValidationLimits(tip=(min_percentage, max_percentage))
 
     while True:
         user_input = input(prompt).strip()
 
         # Handle cancellation
-        if allow_cancel and user_input.lower() in ("q", "quit", "exit"):
+        if allow_cancel and is_cancel(user_input):
             if logger:
                 logger.info("User cancelled tip input")
             return None
 
-        try:
-            tip_value = float(user_input)
-            tip_percentage = int(tip_value)
-
-            # Validate range (extracted)
-            is_valid, error_msg = _validate_tip_in_range(tip_percentage, min_percentage, max_percentage)
-            if not is_valid:
-                print(error_msg)
-                continue
-
-            # Confirm unusual values (extracted)
-            if not _confirm_unusual_tip(tip_percentage):
-                continue
-
-            if logger:
-                logger.info(f"Tip percentage selected: {tip_percentage}%")
-
-            return tip_percentage
-
-        except ValueError:
+        result = parse_tip(user_input, limits)
+        if result.code == "invalid":
             print(f"❌ Invalid input. Enter a number like {suggestions}")
             if logger:
                 logger.warning(f"Invalid tip input attempted: {user_input}")
+            continue
+        if not result.ok or not isinstance(result.value, int):
+            print(result.error)
+            continue
+
+        # Confirm unusual values (extracted)
+        tip_percentage = result.value
+        if not _confirm_unusual_tip(tip_percentage):
+            continue
+
+        if logger:
+            logger.info(f"Tip percentage selected: {tip_percentage}%")
+
+        return tip_percentage
 
 
 def _validate_people_count(num_people: int, min_people: int, max_people: int) -> tuple[bool, str | None]:
@@ -199,14 +391,13 @@ def _confirm_unusual_group_size(num_people: int) -> bool:
 
 
 def get_number_of_people(
-    min_people: int = 1, max_people: int = 100, allow_cancel: bool = True, logger: logging.Logger | None = None
+    min_people: int = MIN_PEOPLE,
+    max_people: int = MAX_PEOPLE,
+    allow_cancel: bool = True,
+    logger: logging.Logger | None = None,
 ) -> int | None:
     """Robustly get number of people splitting the bill."""
-    if min_people < 1:
-        raise ValueError("min_people must be at least 1")
-    if min_people > max_people:
-        raise ValueError(f"min_people ({min_people}) cannot exceed max_people ({max_people})")
-
+    limits = ValidationLimits(people=(min_people, max_people))
     prompt = "How many people to split the bill? "
 
     while True:
@@ -216,118 +407,1307 @@ def get_number_of_people(
             print("💡 Please enter the number of people.")
             continue
 
-        if allow_cancel and user_input.lower() in ("q", "quit", "exit"):
+        if allow_cancel and is_cancel(user_input):
             if logger:
                 logger.info("User cancelled people count input")
             return None
 
-        try:
-            num_people_float = float(user_input)
+        result = parse_people(user_input, limits)
+        if result.code == "invalid":
+            print("❌ Invalid input. Enter a whole number like 2, 4, or 6.")
+            if logger:
+                logger.warning(f"Invalid people count: '{user_input}'")
+            continue
+        if not result.ok or not isinstance(result.value, int):
+            print(result.error)
+            continue
 
-            if num_people_float != int(num_people_float):
-                print("❌ Number of people must be a whole number (no decimals).")
-                continue
+        # Confirm unusual values (extracted)
+        num_people = result.value
+        if not _confirm_unusual_group_size(num_people):
+            continue
 
-            num_people = int(num_people_float)
+        if logger:
+            logger.info(f"Bill split among {num_people} people")
 
-            # Validate range (extracted)
-            is_valid, error_msg = _validate_people_count(num_people, min_people, max_people)
-            if not is_valid:
-                print(error_msg)
-                continue
+        return num_people
 
-            # Confirm unusual values (extracted)
-            if not _confirm_unusual_group_size(num_people):
-                continue
 
-            if logger:
-                logger.info(f"Bill split among {num_people} people")
+def _check_rounding(rounding: str) -> None:
+    """Reject rounding modes the integer-cent path cannot reproduce."""
+    if rounding not in SUPPORTED_ROUNDING:
+        raise ValueError(f"Unsupported rounding mode {rounding!r}; use one of {', '.join(SUPPORTED_ROUNDING)}")
 
-            return num_people
 
-        except ValueError:
-            print("❌ Invalid input. Enter a whole number like 2, 4, or 6.")
-            if logger:
-                logger.warning(f"Invalid people count: '{user_input}'")
+def _round_divide(numerator: int, denominator: int, rounding: str = ROUND_HALF_UP) -> int:
+    """
+    Integer division rounded like Decimal.quantize() with `rounding`.
+
+    Works on magnitudes so HALF_UP/UP round away from zero and DOWN toward
+    zero for negative amounts too, matching Decimal.
+    """
+    if rounding == ROUND_HALF_UP and numerator >= 0 and denominator > 0:
+        # Common case: one floor division, no sign handling
+        return (2 * numerator + denominator) // (2 * denominator)
+
+    sign = -1 if (numerator < 0) != (denominator < 0) else 1
+    quotient, remainder = divmod(abs(numerator), abs(denominator))
+    twice = 2 * remainder
+    if rounding == ROUND_HALF_UP:
+        quotient += twice >= abs(denominator)
+    elif rounding == ROUND_HALF_EVEN:
+        quotient += twice > abs(denominator) or (twice == abs(denominator) and quotient % 2 == 1)
+    elif rounding == ROUND_UP:
+        quotient += remainder > 0
+    return sign * quotient
+
+
+_set_attribute = object.__setattr__
 
 
-def calculate_tip_amount(total_bill: Decimal, tip_percentage: int) -> float:
+class Money:
+    """
+    Exact, immutable currency amount stored as integer cents.
+
+    Arithmetic never passes through float or Decimal, so tight loops avoid
+    allocation-heavy conversions and cent-level rounding drift. Amounts are
+    hashable and never change, so they are safe as dict keys and set members.
+    """
+
+    __slots__ = ("cents",)
+    cents: int
+
+    def __init__(self, cents: int) -> None:
+        _set_attribute(self, "cents", cents)  # The only write; __setattr__ refuses all others
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"Money is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Money is immutable; cannot delete {name!r}")
+
+    def __reduce__(self) -> tuple[type["Money"], tuple[int]]:
+        # The default slot-state pickling would restore cents through __setattr__
+        return Money, (self.cents,)
+
+    @classmethod
+    def from_decimal(cls, amount: Decimal, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Create from a dollar amount, rounding sub-cent digits with `rounding`."""
+        return cls(int(amount.scaleb(2).to_integral_value(rounding=rounding)))
+
+    def to_decimal(self) -> Decimal:
+        """Return the amount in dollars as a Decimal with two places."""
+        return Decimal(self.cents).scaleb(-2)
+
+    def __add__(self, other: "Money") -> "Money":
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other: "Money") -> "Money":
+        return Money(self.cents - other.cents)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents == other.cents
+
+    def __lt__(self, other: "Money") -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents < other.cents
+
+    def __le__(self, other: "Money") -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents <= other.cents
+
+    def __hash__(self) -> int:
+        return hash(self.cents)
+
+    def __float__(self) -> float:
+        return self.cents / CENTS_PER_DOLLAR
+
+    def __str__(self) -> str:
+        dollars, cents = divmod(abs(self.cents), CENTS_PER_DOLLAR)
+        return f"{'-' if self.cents < 0 else ''}{dollars}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def percentage(self, percent: int, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Return `percent`% of this amount, rounded to the cent."""
+        scaled = self.cents * percent
+        if rounding == ROUND_HALF_UP and scaled >= 0:
+            return Money((scaled + PERCENT // 2) // PERCENT)
+        return Money(_round_divide(scaled, PERCENT, rounding))
+
+    def share(self, parts: int, rounding: str = ROUND_HALF_UP) -> "Money":
+        """Return one of `parts` equal shares, rounded to the cent."""
+        if rounding == ROUND_HALF_UP and self.cents >= 0 and parts > 0:
+            return Money((2 * self.cents + parts) // (2 * parts))
+        return Money(_round_divide(self.cents, parts, rounding))
+
+    def split(self, parts: int) -> list["Money"]:
+        """
+        Split into `parts` amounts that add back up exactly.
+
+        The leftover cents go one each to the first shares.
+        """
+        if parts < 1:
+            raise ValueError("Cannot split into fewer than 1 part")
+        base, remainder = divmod(self.cents, parts)
+        return [Money(base + 1) for _ in range(remainder)] + [Money(base) for _ in range(parts - remainder)]
+
+
+def calculate_tip_amount(total_bill: Money, tip_percentage: int) -> Money:
     """
     Calculate the tip amount based on bill total and percentage.
 
     Args:
-        total_bill (Decimal): The total bill amount
+        total_bill (Money): The total bill amount
         tip_percentage (int): The tip percentage
 
     Returns:
-        float: The calculated tip amount
+        Money: The calculated tip amount, rounded half-up to the cent
     """
-    tip_amount = float(total_bill) * float(tip_percentage / 100)
-    return tip_amount
+    return total_bill.percentage(tip_percentage)
 
 
-def calculate_total_with_tip(total_bill: float, tip_amount: float) -> float:
+def calculate_total_with_tip(total_bill: Money, tip_amount: Money) -> Money:
     """
     Calculate the total bill including tip.
 
     Args:
-        total_bill (float): The original bill amount
-        tip_amount (float): The calculated tip amount
+        total_bill (Money): The original bill amount
+        tip_amount (Money): The calculated tip amount
 
     Returns:
-        float: The total amount including tip
+        Money: The total amount including tip
     """
     return total_bill + tip_amount
 
 
-def calculate_split_amount(total_with_tip: float, num_people: int) -> float:
+def calculate_split_amount(total_with_tip: Money, num_people: int) -> Money:
     """
     Calculate how much each person should pay.
 
     Args:
-        total_with_tip (float): The total bill including tip
+        total_with_tip (Money): The total bill including tip
         num_people (int): The number of people splitting the bill
 
     Returns:
-        float: The amount each person should pay
+        Money: The amount each person should pay, rounded half-up to the cent
+    """
+    return total_with_tip.share(num_people)
+
+
+class BatchSplit(NamedTuple):
+    """Per-check results of calculate_splits_batch(), all in integer cents."""
+
+    tip_cents: "npt.NDArray[np.int64]"
+    total_cents: "npt.NDArray[np.int64]"
+    share_cents: "npt.NDArray[np.int64]"
+
+
+def to_cents(amount: Decimal, rounding: str = ROUND_HALF_UP) -> int:
+    """
+    Convert a dollar amount to integer cents.
+
+    Args:
+        amount (Decimal): The amount in dollars
+        rounding (str): Decimal rounding mode for sub-cent amounts
+
+    Returns:
+        int: The amount in cents
+    """
+    return int(amount.quantize(CENT, rounding=rounding) * CENTS_PER_DOLLAR)
+
+
+def calculate_split_exact(
+    total_bill: Decimal, tip_percentage: int, num_people: int, rounding: str = ROUND_HALF_UP
+) -> tuple[Decimal, Decimal, Decimal]:
+    """
+    Reference Decimal calculation of tip, total and per-person share.
+
+    Each step is rounded to the cent with `rounding`, which is exactly what
+    calculate_splits_batch() reproduces in integer cents.
+
+    Args:
+        total_bill (Decimal): The original bill amount
+        tip_percentage (int): The tip percentage
+        num_people (int): The number of people splitting the bill
+        rounding (str): One of SUPPORTED_ROUNDING
+
+    Returns:
+        tuple: (tip_amount, total_with_tip, split_amount) as Decimals
+    """
+    _check_rounding(rounding)
+    with localcontext() as context:
+        # Enough digits that no quotient is rounded before quantize() sees it
+        context.prec = 50
+        tip_amount = (total_bill * tip_percentage / PERCENT).quantize(CENT, rounding=rounding)
+        total_with_tip = total_bill + tip_amount
+        split_amount = (total_with_tip / num_people).quantize(CENT, rounding=rounding)
+    return tip_amount, total_with_tip, split_amount
+
+
+def _divide_rounded(
+    numerator: "npt.NDArray[np.int64]", denominator: "int | npt.NDArray[np.int64]", rounding: str
+) -> "npt.NDArray[np.int64]":
+    """Divide non-negative int64 arrays, rounding the quotient with a Decimal rounding mode."""
+    import numpy as np  # noqa: PLC0415 - optional dependency, only needed in batch mode
+
+    quotient, remainder = np.divmod(numerator, denominator)
+    if rounding == ROUND_HALF_UP:
+        quotient += 2 * remainder >= denominator
+    elif rounding == ROUND_HALF_EVEN:
+        twice = 2 * remainder
+        quotient += (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    elif rounding == ROUND_UP:
+        quotient += remainder > 0
+    return quotient
+
+
+def calculate_splits_batch(
+    bill_cents: "npt.ArrayLike",
+    tip_percentages: "npt.ArrayLike",
+    party_sizes: "npt.ArrayLike",
+    rounding: str = ROUND_HALF_UP,
+) -> BatchSplit:
+    """
+    Calculate tips, totals and per-person shares for many checks at once.
+
+    All arithmetic is exact int64 cents, so results are identical to
+    calculate_split_exact() with the same rounding mode. Inputs broadcast
+    against each other, e.g. one tip percentage for every bill.
+
+    Requires NumPy (install the ``batch`` extra).
+
+    Args:
+        bill_cents: Bill amounts in integer cents
+        tip_percentages: Whole-number tip percentages
+        party_sizes: Number of people splitting each bill
+        rounding (str): One of SUPPORTED_ROUNDING
+
+    Returns:
+        BatchSplit: Arrays of tip, total and per-person share in cents
+    """
+    import numpy as np  # noqa: PLC0415 - optional dependency, only needed in batch mode
+
+    _check_rounding(rounding)
+    bills = np.asarray(bill_cents, dtype=np.int64)
+    tips = np.asarray(tip_percentages, dtype=np.int64)
+    people = np.asarray(party_sizes, dtype=np.int64)
+
+    if (bills < 0).any() or (tips < 0).any():
+        raise ValueError("Bill amounts and tip percentages must be non-negative")
+    if (people < 1).any():
+        raise ValueError("Party sizes must be at least 1")
+
+    tip_cents = _divide_rounded(bills * tips, PERCENT, rounding)
+    total_cents = bills + tip_cents
+    share_cents = _divide_rounded(total_cents, people, rounding)
+    return BatchSplit(tip_cents, total_cents, share_cents)
+
+
+def allocate_cents(total: Money, weights: Sequence[int]) -> list[Money]:
+    """
+    Allocate `total` in proportion to `weights` using largest remainders.
+
+    Everyone first gets the floor of their exact share; the leftover cents
+    go one each to the largest fractional remainders (earlier people win
+    ties). The shares always add up to `total` exactly.
+
+    Args:
+        total (Money): Amount to allocate (non-negative)
+        weights (Sequence[int]): Non-negative weight per person
+
+    Returns:
+        list[Money]: One share per weight, in order
+    """
+    weight_sum = sum(weights)
+    if total.cents < 0:
+        raise ValueError("Cannot allocate a negative amount")
+    if any(weight < 0 for weight in weights) or weight_sum == 0:
+        raise ValueError("Weights must be non-negative with a positive total")
+
+    shares = []
+    remainders = []
+    for weight in weights:
+        share, remainder = divmod(total.cents * weight, weight_sum)
+        shares.append(share)
+        remainders.append(remainder)
+
+    leftover = total.cents - sum(shares)
+    for index in sorted(range(len(weights)), key=lambda i: -remainders[i])[:leftover]:
+        shares[index] += 1
+    return [Money(share) for share in shares]
+
+
+def split_equal(total: Money, num_people: int) -> list[Money]:
+    """Split `total` evenly; leftover cents go one each to the first people."""
+    if num_people < 1:
+        raise ValueError("Need at least 1 person to split a bill")
+    return allocate_cents(total, [1] * num_people)
+
+
+def split_weighted(total: Money, weights: Sequence[int]) -> list[Money]:
+    """Split `total` by weight, e.g. [2, 1, 1] when one person covers two shares."""
+    return allocate_cents(total, weights)
+
+
+def split_itemized(subtotals: Sequence[Money], tip_percentage: int) -> list[Money]:
+    """
+    Split a bill where each person pays for what they ordered.
+
+    The tip is charged on the combined subtotal and shared in proportion
+    to each person's items, so the shares add up to the exact total.
+
+    Args:
+        subtotals (Sequence[Money]): Cost of each person's items
+        tip_percentage (int): The tip percentage
+
+    Returns:
+        list[Money]: Amount each person should pay, including tip
+    """
+    total_bill = Money(sum(subtotal.cents for subtotal in subtotals))
+    total_with_tip = calculate_total_with_tip(total_bill, calculate_tip_amount(total_bill, tip_percentage))
+    return allocate_cents(total_with_tip, [subtotal.cents for subtotal in subtotals])
+
+
+def allocate_cents_batch(total_cents: "npt.ArrayLike", weights: "npt.ArrayLike") -> "npt.NDArray[np.int64]":
+    """
+    Largest-remainder allocation for many bills in one vectorized pass.
+
+    Gives the same result as allocate_cents() row by row. Parties of
+    different sizes are padded with zero weights, which always receive 0.
+
+    Requires NumPy (install the ``batch`` extra).
+
+    Args:
+        total_cents: Shape (bills,) amounts to allocate
+        weights: Shape (bills, people) non-negative integer weights
+
+    Returns:
+        Shape (bills, people) int64 shares; each row sums to its total
+    """
+    import numpy as np  # noqa: PLC0415 - optional dependency, only needed in batch mode
+
+    totals = np.asarray(total_cents, dtype=np.int64)
+    weight_matrix = np.atleast_2d(np.asarray(weights, dtype=np.int64))
+    weight_sums = weight_matrix.sum(axis=1)
+    if (totals < 0).any():
+        raise ValueError("Cannot allocate a negative amount")
+    if (weight_matrix < 0).any() or (weight_sums == 0).any():
+        raise ValueError("Weights must be non-negative with a positive total per bill")
+
+    shares, remainders = np.divmod(totals[:, None] * weight_matrix, weight_sums[:, None])
+    leftover = totals - shares.sum(axis=1)
+
+    # Rank each person's remainder within their bill (stable: earlier people win ties)
+    order = np.argsort(-remainders, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(weight_matrix.shape[1]), axis=1)
+    shares += ranks < leftover[:, None]
+    return shares
+
+
+def split_equal_batch(total_cents: "npt.ArrayLike", party_sizes: "npt.ArrayLike") -> "npt.NDArray[np.int64]":
+    """
+    Split many bills evenly in one pass.
+
+    Uses the closed form instead of a padded weight matrix: everyone gets
+    ``total // n`` and the first ``total % n`` people get one cent more, so
+    memory is O(total people) however uneven the party sizes are.
+
+    Args:
+        total_cents: Shape (bills,) amounts to split
+        party_sizes: Shape (bills,) number of people per bill
+
+    Returns:
+        Shape (sum(party_sizes),) int64 shares, CSR-style: bill i's shares are
+        ``shares[offsets[i]:offsets[i + 1]]`` with ``offsets = [0, *cumsum(party_sizes)]``,
+        so ``np.split(shares, np.cumsum(party_sizes)[:-1])`` recovers one array per bill
+    """
+    import numpy as np  # noqa: PLC0415 - optional dependency, only needed in batch mode
+
+    totals = np.asarray(total_cents, dtype=np.int64)
+    people = np.asarray(party_sizes, dtype=np.int64)
+    if totals.shape != people.shape:
+        raise ValueError("total_cents and party_sizes must have the same shape")
+    if (totals < 0).any():
+        raise ValueError("Cannot allocate a negative amount")
+    if (people < 1).any():
+        raise ValueError("Party sizes must be at least 1")
+
+    base, extra = np.divmod(totals, people)
+    starts = np.cumsum(people) - people
+    seat = np.arange(people.sum()) - np.repeat(starts, people)
+    return np.repeat(base, people) + (seat < np.repeat(extra, people))
+
+
+class TaxRate(NamedTuple):
+    """Tax and service-charge rates for one jurisdiction, in parts per million."""
+
+    tax_ppm: int
+    service_charge_ppm: int
+
+
+class Check(NamedTuple):
+    """One restaurant check priced in a local currency and tax jurisdiction."""
+
+    bill: Money
+    tip_percentage: int
+    num_people: int
+    jurisdiction: str
+    currency: str
+
+
+class CheckBreakdown(NamedTuple):
+    """Charges for one check in its own currency, plus the settled total and share."""
+
+    service_charge: Money
+    tax: Money
+    tip: Money
+    total: Money
+    settlement_total: Money
+    per_person: Money
+
+
+def _percent_to_ppm(raw: str) -> int:
+    """Convert a percentage string such as "8.875" to exact parts per million."""
+    scaled = Decimal(raw) * (PPM // PERCENT)
+    if scaled != scaled.to_integral_value() or scaled < 0:
+        raise ValueError(f"Rate {raw}% must be non-negative with at most 4 decimal places")
+    return int(scaled)
+
+
+def _read_rate_rows(path: Path, key: str, value: str) -> list[dict[str, str]]:
+    """
+    Read a rate table as rows of strings.
+
+    CSV files need a header row. JSON files map the key column to either a
+    scalar, read as the `value` column, or an object of named values.
+
+    Raises:
+        ValueError: If a row is not a scalar or object, or lacks the key or `value` column
+    """
+    if path.suffix.lower() != ".json":
+        with path.open(encoding="utf-8", newline="") as handle:
+            rows = [
+                {name: (item or "").strip() for name, item in row.items() if name} for row in csv.DictReader(handle)
+            ]
+    else:
+        rows = []
+        for name, entry in json.loads(path.read_text(encoding="utf-8")).items():
+            if isinstance(entry, dict):
+                rows.append({key: name} | {field: str(item) for field, item in entry.items()})
+            elif isinstance(entry, str | int | float) and not isinstance(entry, bool):
+                rows.append({key: name, value: str(entry)})
+            else:
+                raise ValueError(f"{path}: {key} {name!r} must map to a number or an object, got {entry!r}")
+
+    for number, row in enumerate(rows, 1):
+        if not row.get(key):
+            raise ValueError(f"{path}: row {number} has no {key!r}")
+        if not row.get(value):
+            raise ValueError(f"{path}: {key} {row[key]!r} has no {value!r}")
+    return rows
+
+
+class RateTables:
+    """
+    In-memory tax and exchange-rate tables.
+
+    Jurisdictions and currencies are indexed by upper-case code, and
+    conversion factors between currency pairs are exact fractions memoized
+    in an LRU cache.
+    """
+
+    def __init__(
+        self,
+        tax_rates: dict[str, TaxRate],
+        fx_rates: dict[str, Fraction],
+        cache_size: int = FX_CACHE_SIZE,
+    ) -> None:
+        self.tax_rates = {code.upper(): rate for code, rate in tax_rates.items()}
+        self.fx_rates = {code.upper(): rate for code, rate in fx_rates.items()}
+        if any(rate <= 0 for rate in self.fx_rates.values()):
+            raise ValueError("Exchange rates must be positive")
+        self.conversion_factor = functools.lru_cache(maxsize=cache_size)(self._conversion_factor)
+
+    @classmethod
+    def load(cls, tax_path: Path, fx_path: Path, cache_size: int = FX_CACHE_SIZE) -> "RateTables":
+        """
+        Load tables from local CSV or JSON files.
+
+        Tax table columns: jurisdiction, tax_rate, service_charge (percent).
+        FX table columns: currency, rate (units per one base-currency unit).
+
+        Raises:
+            ValueError: If a row is malformed, naming the file and the row's key
+        """
+        tax_rates = {}
+        for row in _read_rate_rows(tax_path, "jurisdiction", "tax_rate"):
+            try:
+                tax_rates[row["jurisdiction"]] = TaxRate(
+                    _percent_to_ppm(row["tax_rate"]), _percent_to_ppm(row.get("service_charge") or "0")
+                )
+            except ArithmeticError:  # Text, NaN or infinity
+                raise ValueError(f"{tax_path}: jurisdiction {row['jurisdiction']!r} has an invalid rate") from None
+            except ValueError as error:
+                raise ValueError(f"{tax_path}: jurisdiction {row['jurisdiction']!r}: {error}") from None
+        fx_rates = {}
+        for row in _read_rate_rows(fx_path, "currency", "rate"):
+            try:
+                fx_rates[row["currency"]] = Fraction(Decimal(row["rate"]))
+            except (ArithmeticError, ValueError):  # Text, NaN or infinity
+                raise ValueError(
+                    f"{fx_path}: currency {row['currency']!r} has an invalid rate: {row['rate']}"
+                ) from None
+        return cls(tax_rates, fx_rates, cache_size)
+
+    def tax_rate(self, jurisdiction: str) -> TaxRate:
+        """Look up a jurisdiction's rates."""
+        try:
+            return self.tax_rates[jurisdiction.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown tax jurisdiction: {jurisdiction}") from None
+
+    def _conversion_factor(self, source: str, target: str) -> Fraction:
+        """Exact factor converting `source` amounts into `target` (cached per pair)."""
+        try:
+            return self.fx_rates[target.upper()] / self.fx_rates[source.upper()]
+        except KeyError as error:
+            raise ValueError(f"Unknown currency: {error.args[0]}") from None
+
+    def convert(self, amount: Money, source: str, target: str, rounding: str = ROUND_HALF_UP) -> Money:
+        """Convert `amount` between currencies, rounding once to the target cent."""
+        factor = self.conversion_factor(source, target)
+        return Money(_round_divide(amount.cents * factor.numerator, factor.denominator, rounding))
+
+
+def price_check(check: Check, tables: RateTables, settlement_currency: str) -> CheckBreakdown:
     """
-    return round(total_with_tip / num_people, 2)
+    Apply service charge, tax, tip, currency conversion and split to one check.
+
+    The service charge and tip are charged on the bill; tax is charged on the
+    bill plus service charge. The local total is converted once into the
+    settlement currency and then split per person.
+    """
+    rates = tables.tax_rate(check.jurisdiction)
+    service_charge = Money(_round_divide(check.bill.cents * rates.service_charge_ppm, PPM))
+    tax = Money(_round_divide((check.bill.cents + service_charge.cents) * rates.tax_ppm, PPM))
+    tip = calculate_tip_amount(check.bill, check.tip_percentage)
+    total = calculate_total_with_tip(check.bill + service_charge + tax, tip)
+    settlement_total = tables.convert(total, check.currency, settlement_currency)
+    per_person = calculate_split_amount(settlement_total, check.num_people)
+    return CheckBreakdown(service_charge, tax, tip, total, settlement_total, per_person)
 
 
-def format_currency(amount: float) -> str:
+def price_checks(checks: Iterable[Check], tables: RateTables, settlement_currency: str) -> Iterator[CheckBreakdown]:
+    """
+    Price a day's checks in one streaming pass.
+
+    Jurisdiction lookups are dict hits and each currency pair's conversion
+    factor is computed once, so the per-check cost is the integer tip,
+    tax and split arithmetic. With NumPy installed, price_checks_batch()
+    prices a materialized batch grouped by jurisdiction and currency.
+    """
+    for check in checks:
+        yield price_check(check, tables, settlement_currency)
+
+
+def price_checks_batch(checks: Iterable[Check], tables: RateTables, settlement_currency: str) -> list[CheckBreakdown]:
+    """
+    Price many checks at once, one vectorized pass per jurisdiction and currency.
+
+    Checks in a group share one TaxRate and one conversion factor, so the
+    group's service charge, tax and conversion are int64 array operations and
+    its tip and split go through calculate_splits_batch(). Results are
+    identical to price_check() and come back in input order.
+
+    Requires NumPy (install the ``batch`` extra).
+
+    Raises:
+        ValueError: For an unknown jurisdiction or currency, a negative bill or
+            tip, a party smaller than 1, or amounts too large for int64 cents
+    """
+    import numpy as np  # noqa: PLC0415 - optional dependency, only needed in batch mode
+
+    checks = list(checks)
+    groups: dict[tuple[str, str], list[int]] = {}
+    for position, check in enumerate(checks):
+        groups.setdefault((check.jurisdiction.upper(), check.currency.upper()), []).append(position)
+
+    limit = int(np.iinfo(np.int64).max)
+    breakdowns: dict[int, CheckBreakdown] = {}
+    for (jurisdiction, currency), positions in groups.items():
+        rates = tables.tax_rate(jurisdiction)
+        factor = tables.conversion_factor(currency, settlement_currency)
+        group = [checks[position] for position in positions]
+        bills = np.fromiter((check.bill.cents for check in group), dtype=np.int64, count=len(group))
+        tips = np.fromiter((check.tip_percentage for check in group), dtype=np.int64, count=len(group))
+        people = np.fromiter((check.num_people for check in group), dtype=np.int64, count=len(group))
+        tip = calculate_splits_batch(bills, tips, 1).tip_cents  # Also rejects negative bills, tips and parties
+
+        # Upper bounds of every intermediate product, in Python ints, before int64 could wrap
+        largest = int(bills.max())
+        service_bound = largest * rates.service_charge_ppm // PPM + 1
+        total_bound = largest + service_bound + (largest + service_bound) * rates.tax_ppm // PPM + int(tip.max()) + 1
+        peak = max(
+            largest * max(rates.service_charge_ppm, int(tips.max()) + 1),
+            (largest + service_bound) * rates.tax_ppm,
+            total_bound * factor.numerator,
+            2 * factor.denominator,
+        )
+        if peak > limit:
+            raise ValueError(f"{jurisdiction}/{currency} checks are too large for int64 batch pricing")
+
+        service = _divide_rounded(bills * rates.service_charge_ppm, PPM, ROUND_HALF_UP)
+        tax = _divide_rounded((bills + service) * rates.tax_ppm, PPM, ROUND_HALF_UP)
+        total = bills + service + tax + tip
+        settled = _divide_rounded(total * factor.numerator, factor.denominator, ROUND_HALF_UP)
+        per_person = calculate_splits_batch(settled, 0, people).share_cents
+
+        rows = zip(*(column.tolist() for column in (service, tax, tip, total, settled, per_person)), strict=True)
+        for position, row in zip(positions, rows, strict=True):
+            breakdowns[position] = CheckBreakdown(*map(Money, row))
+    return [breakdowns[position] for position in range(len(checks))]
+
+
+def format_currency(amount: Money | float) -> str:
     """
     Format the amount as currency with proper rounding.
 
     Args:
-        amount (float): The amount to format
+        amount (Money | float): The amount to format
 
     Returns:
         str: The formatted currency string with 2 decimal places
     """
+    if isinstance(amount, Money):
+        return f"${amount}"
     formatted_amount = f"${amount:.2f}"
     return formatted_amount
 
 
-def display_results(split_amount: float, total_bill: Decimal, tip_percentage: int, num_people: int) -> None:
+def display_results(split_amount: Money, total_bill: Money, tip_percentage: int, num_people: int) -> None:
     """
     Display the calculation results to the user.
 
     Args:
-        split_amount (float): The amount each person should pay
-        total_bill (Decimal): The original bill amount
+        split_amount (Money): The amount each person should pay
+        total_bill (Money): The original bill amount
         tip_percentage (int): The tip percentage used
         num_people (int): The number of people splitting
     """
     print("\n" + "🧾" * 25)
     print("CALCULATION RESULTS:")
-    print(f"Total Bill: ${total_bill}")
+    print(f"Total Bill: {format_currency(total_bill)}")
     print(f"Tip Percentage: {tip_percentage}%")
     print(f"Number of People: {num_people}")
     print(f"Each person should pay: {format_currency(split_amount)}")
     print("🧾" * 25)
 
 
-def main() -> None:
+def iter_bill_records(source: TextIO, input_format: str = "csv") -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Lazily read raw bill records from CSV (with a header row) or JSONL.
+
+    Records need ``bill``, ``tip`` and ``people`` fields; extra fields are
+    ignored. Values are returned as strings for validation.
+
+    Yields:
+        Tuple of (line_number, fields)
+    """
+    if input_format == "csv":
+        reader = csv.DictReader(source)
+        for record in reader:
+            yield reader.line_num, {key: (value or "").strip() for key, value in record.items() if key}
+    elif input_format == "jsonl":
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, {}
+                continue
+            if not isinstance(record, dict):
+                yield line_number, {}
+                continue
+            yield line_number, {key: str(value).strip() for key, value in record.items() if value is not None}
+    else:
+        raise ValueError(f"Unsupported input format: {input_format!r}")
+
+
+def parse_bill_record(
+    fields: dict[str, str], limits: ValidationLimits = DEFAULT_LIMITS
+) -> tuple[tuple[Decimal, int, int] | None, str | None]:
+    """
+    Validate one raw bill record with the interactive range rules.
+
+    Unlike the interactive helpers, unusual tips or party sizes are accepted
+    without asking for confirmation.
+
+    Returns:
+        Tuple of ((total_bill, tip_percentage, num_people), None) when valid,
+        or (None, error_message) when not
+    """
+    missing = [name for name in ("bill", "tip", "people") if not fields.get(name)]
+    if missing:
+        return None, f"❌ Missing field{'s' if len(missing) > 1 else ''}: {', '.join(missing)}"
+
+    bill = parse_bill(fields["bill"], limits)
+    if not isinstance(bill.value, Decimal):
+        return None, bill.error
+    tip = parse_tip(fields["tip"], limits)
+    if not isinstance(tip.value, int):
+        return None, tip.error
+    people = parse_people(fields["people"], limits)
+    if not isinstance(people.value, int):
+        return None, people.error
+
+    return (bill.value, tip.value, people.value), None
+
+
+def _split_values(
+    total_bill: Decimal, tip_percentage: int, num_people: int
+) -> tuple[Money, int, int, Money, Money, Money]:
+    """Run the calculate_* functions for one validated check, in PIPELINE_FIELDS order."""
+    bill = Money.from_decimal(total_bill)
+    tip_amount = calculate_tip_amount(bill, tip_percentage)
+    total_with_tip = calculate_total_with_tip(bill, tip_amount)
+    split_amount = calculate_split_amount(total_with_tip, num_people)
+    return bill, tip_percentage, num_people, tip_amount, total_with_tip, split_amount
+
+
+def process_bill_stream(
+    source: TextIO,
+    sink: TextIO,
+    input_format: str = "csv",
+    logger: logging.Logger | None = None,
+    history: "CalculationHistory | None" = None,
+) -> tuple[int, int]:
+    """
+    Validate bills from `source` and write per-person amounts to `sink`.
+
+    Rows are processed one at a time and written in chunks of
+    PIPELINE_CHUNK_ROWS, so memory stays constant for any input size. Output
+    uses the input format (CSV with a header row, or JSONL). Amounts are
+    exact Money cents. Rejected rows are reported on stderr with their line
+    number. Each written row is also appended to `history` when given.
+
+    Returns:
+        Tuple of (rows_written, rows_rejected)
+    """
+    written = 0
+    rejected = 0
+    pending: list[str] = []
+
+    if input_format == "csv":
+        sink.write(",".join(PIPELINE_FIELDS) + "\n")
+
+    for line_number, fields in iter_bill_records(source, input_format):
+        parsed, error_msg = parse_bill_record(fields)
+        if parsed is None:
+            rejected += 1
+            print(f"Line {line_number}: {error_msg or '❌ Invalid record'}", file=sys.stderr)
+            if logger:
+                logger.warning(f"Rejected bill record on line {line_number}: {fields}")
+            continue
+
+        values = _split_values(*parsed)
+        if history is not None:
+            history.record(values)
+        if input_format == "csv":
+            pending.append(",".join(map(str, values)) + "\n")
+        else:
+            row = dict(zip(PIPELINE_FIELDS, values, strict=True))
+            # Money stays a string so JSON consumers never see float rounding
+            pending.append(json.dumps(row, default=str) + "\n")
+        written += 1
+
+        if len(pending) >= PIPELINE_CHUNK_ROWS:
+            sink.write("".join(pending))
+            pending.clear()
+
+    sink.write("".join(pending))
+    if logger:
+        logger.info(f"Pipeline wrote {written} rows, rejected {rejected}")
+    return written, rejected
+
+
+class CalculationHistory:
+    """
+    Append-only SQLite log of every split calculated.
+
+    Records are buffered and written with one executemany() per
+    HISTORY_BATCH_SIZE records inside a single transaction. Timestamp, party
+    size and bill amount are indexed, and the query methods aggregate in
+    SQL so millions of rows never become Python objects.
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS calculations (
+            id INTEGER PRIMARY KEY,
+            recorded_at REAL NOT NULL,
+            bill_cents INTEGER NOT NULL,
+            tip_percentage INTEGER NOT NULL,
+            num_people INTEGER NOT NULL,
+            tip_cents INTEGER NOT NULL,
+            total_cents INTEGER NOT NULL,
+            per_person_cents INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_calculations_recorded_at ON calculations (recorded_at)",
+        "CREATE INDEX IF NOT EXISTS idx_calculations_num_people ON calculations (num_people)",
+        "CREATE INDEX IF NOT EXISTS idx_calculations_bill_cents ON calculations (bill_cents)",
+    )
+    _INSERT = (
+        "INSERT INTO calculations (recorded_at, bill_cents, tip_percentage, num_people, tip_cents, total_cents, "
+        "per_person_cents) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(self, path: Path | str = ":memory:", batch_size: int = HISTORY_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self._pending: list[tuple[float, int, int, int, int, int, int]] = []
+        self._connection = sqlite3.connect(str(path))
+        if str(path) != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in self._SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self) -> "CalculationHistory":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record(
+        self,
+        values: tuple[Money, int, int, Money, Money, Money],
+        recorded_at: float | None = None,
+    ) -> None:
+        """
+        Queue one calculation, committing when a full batch is pending.
+
+        Args:
+            values: (bill, tip_percentage, num_people, tip_amount, total_with_tip, split_amount)
+            recorded_at: Unix timestamp (default: now)
+        """
+        bill, tip_percentage, num_people, tip_amount, total_with_tip, split_amount = values
+        self._pending.append(
+            (
+                time.time() if recorded_at is None else recorded_at,
+                bill.cents,
+                tip_percentage,
+                num_people,
+                tip_amount.cents,
+                total_with_tip.cents,
+                split_amount.cents,
+            )
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit all pending records in one transaction."""
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(self._INSERT, self._pending)
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Flush pending records and close the database."""
+        self.flush()
+        self._connection.close()
+
+    def _where(
+        self, since: float | None, until: float | None, num_people: int | None, min_bill: Money | None
+    ) -> tuple[str, list[float | int]]:
+        """Build an index-friendly WHERE clause for the query filters."""
+        clauses: list[str] = []
+        params: list[float | int] = []
+        for clause, value in (
+            ("recorded_at >= ?", since),
+            ("recorded_at < ?", until),
+            ("num_people = ?", num_people),
+            ("bill_cents >= ?", None if min_bill is None else min_bill.cents),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        num_people: int | None = None,
+        min_bill: Money | None = None,
+    ) -> int:
+        """Number of recorded calculations matching the filters."""
+        self.flush()
+        where, params = self._where(since, until, num_people, min_bill)
+        return int(self._connection.execute(f"SELECT COUNT(*) FROM calculations{where}", params).fetchone()[0])
+
+    def average_tip_percentage(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        num_people: int | None = None,
+        min_bill: Money | None = None,
+    ) -> float | None:
+        """Mean tip percentage of matching calculations (None when there are none)."""
+        self.flush()
+        where, params = self._where(since, until, num_people, min_bill)
+        row = self._connection.execute(f"SELECT AVG(tip_percentage) FROM calculations{where}", params).fetchone()
+        return None if row[0] is None else float(row[0])
+
+    def daily_totals(
+        self, since: float | None = None, until: float | None = None
+    ) -> list[tuple[str, int, Money, Money]]:
+        """
+        Aggregate calculations per UTC day.
+
+        Returns:
+            List of (date, calculations, bills_total, totals_with_tip) ordered by date
+        """
+        self.flush()
+        where, params = self._where(since, until, None, None)
+        rows = self._connection.execute(
+            "SELECT date(recorded_at, 'unixepoch') AS day, COUNT(*), SUM(bill_cents), SUM(total_cents) "
+            f"FROM calculations{where} GROUP BY day ORDER BY day",
+            params,
+        )
+        return [(day, count, Money(bills), Money(totals)) for day, count, bills, totals in rows]
+
+
+class TipCalculatorService:
+    """
+    Asyncio HTTP/1.1 JSON service around the tip calculations.
+
+    Endpoints:
+    - POST /split: one check object, a list of checks, or {"checks": [...]};
+      answers {"results": [...]} with one row or {"error": ...} per check
+    - GET /stats: request count and p50/p99 latency in milliseconds
+    - GET /health: liveness probe
+
+    Uses only the standard library; connections are kept alive so a
+    terminal can send many checks without reconnecting.
+    """
+
+    def __init__(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT, max_batch: int = SERVICE_MAX_BATCH) -> None:
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.requests = 0
+        self._latencies_ms: deque[float] = deque(maxlen=SERVICE_LATENCY_WINDOW)
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> asyncio.Server:
+        """Start listening; with port 0 the chosen port is stored in self.port."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        server = self._server or await self.start()
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections and wait for the listener to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def latency_stats(self) -> dict[str, float]:
+        """Return request count and p50/p99 latency over the recent window."""
+        ordered = sorted(self._latencies_ms)
+        if not ordered:
+            return {"requests": self.requests, "p50_ms": 0.0, "p99_ms": 0.0}
+        return {
+            "requests": self.requests,
+            "p50_ms": ordered[(len(ordered) - 1) // 2],
+            "p99_ms": ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)],
+        }
+
+    def split_checks(self, payload: Any) -> tuple[int, dict[str, Any]]:
+        """Validate and calculate a batch of checks, returning (status, response body)."""
+        checks = payload.get("checks") if isinstance(payload, dict) and "checks" in payload else payload
+        if isinstance(checks, dict):
+            checks = [checks]
+        if not isinstance(checks, list):
+            return 400, {"error": "Body must be a check object, a list of checks, or {'checks': [...]}"}
+        if len(checks) > self.max_batch:
+            return 413, {"error": f"At most {self.max_batch} checks per request"}
+
+        results: list[dict[str, Any]] = []
+        for check in checks:
+            fields = (
+                {key: str(value).strip() for key, value in check.items() if value is not None}
+                if isinstance(check, dict)
+                else {}
+            )
+            parsed, error_msg = parse_bill_record(fields)
+            if parsed is None:
+                results.append({"error": error_msg})
+                continue
+            row = dict(zip(PIPELINE_FIELDS, _split_values(*parsed), strict=True))
+            results.append({key: value if isinstance(value, int) else str(value) for key, value in row.items()})
+        return 200, {"results": results}
+
+    def _route(self, method: str, path: str, body: bytes) -> tuple[int, dict[str, Any]]:
+        """Dispatch one request to its endpoint."""
+        if path == "/split":
+            if method != "POST":
+                return 405, {"error": "Use POST"}
+            try:
+                payload = json.loads(body)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return 400, {"error": "Body is not valid JSON"}
+            return self.split_checks(payload)
+        if path in ("/stats", "/health"):
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return 200, self.latency_stats() if path == "/stats" else {"status": "ok"}
+        return 404, {"error": f"Unknown path {path}"}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve keep-alive HTTP requests on one connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                method, path, version = (request_line.decode("latin-1").split() + ["", "", ""])[:3]
+
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                raw_length = headers.get("content-length") or "0"
+                length = int(raw_length) if raw_length.isascii() and raw_length.isdigit() else -1
+                if length < 0:  # The body cannot be framed, so answer and drop the connection
+                    status, response = 400, {"error": f"Invalid Content-Length: {raw_length!r}"}
+                    keep_alive = False
+                elif length > SERVICE_MAX_BODY_BYTES:
+                    status, response = 413, {"error": "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, response = self._route(method, path.split("?")[0], body)
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+                payload = json.dumps(response).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+
+                self.requests += 1
+                self._latencies_ms.append((time.perf_counter() - start) * 1000)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # Client went away or sent a malformed request line/header
+        finally:
+            writer.close()
+
+
+def run_service(host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> None:
+    """Run the tip calculation service until interrupted."""
+    service = TipCalculatorService(host, port)
+
+    async def serve() -> None:
+        await service.start()
+        print(f"🌐 Tip Calculator service on http://{service.host}:{service.port}/split", file=sys.stderr)
+        await service.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped.", file=sys.stderr)
+
+
+def benchmark_money(iterations: int = 100_000) -> dict[str, float]:
+    """
+    Time one tip/total/split calculation on each arithmetic path.
+
+    Compares the old float/Decimal round trip, the Decimal reference
+    (calculate_split_exact) and the Money path, and counts how often the
+    float path lands a cent away from the exact result.
+
+    Returns:
+        Dict with nanoseconds per calculation for each path and the float
+        path's cent error count
+    """
+    bills = [Decimal(n % 100_000).scaleb(-2) + 1 for n in range(0, 7919 * iterations, 7919)]
+    tips = [n % 31 for n in range(iterations)]
+    people = [n % 12 + 1 for n in range(iterations)]
+    money_bills = [Money.from_decimal(bill) for bill in bills]
+
+    # The float implementations the calculate_* functions used before Money
+    def legacy_tip(total_bill: Decimal, tip_percentage: int) -> float:
+        return float(total_bill) * float(tip_percentage / 100)
+
+    def legacy_total(total_bill: float, tip_amount: float) -> float:
+        return total_bill + tip_amount
+
+    def legacy_split(total_with_tip: float, num_people: int) -> float:
+        return round(total_with_tip / num_people, 2)
+
+    start = time.perf_counter()
+    legacy = [
+        legacy_split(legacy_total(float(bill), legacy_tip(bill, tip)), size)
+        for bill, tip, size in zip(bills, tips, people, strict=True)
+    ]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = [calculate_split_exact(bill, tip, size)[2] for bill, tip, size in zip(bills, tips, people, strict=True)]
+    decimal_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for bill, tip, size in zip(money_bills, tips, people, strict=True):
+        calculate_split_amount(calculate_total_with_tip(bill, calculate_tip_amount(bill, tip)), size)
+    money_seconds = time.perf_counter() - start
+
+    cent_errors = sum(
+        Money.from_decimal(Decimal(f"{value:.2f}")) != Money.from_decimal(reference)
+        for value, reference in zip(legacy, exact, strict=True)
+    )
+    return {
+        "float_ns": legacy_seconds / iterations * 1e9,
+        "decimal_ns": decimal_seconds / iterations * 1e9,
+        "money_ns": money_seconds / iterations * 1e9,
+        "float_cent_errors": cent_errors,
+    }
+
+
+def _display_benchmark(iterations: int) -> None:
+    """Run and print the arithmetic microbenchmarks."""
+    results = benchmark_money(iterations)
+    print(f"⏱️  {iterations:,} tip/total/split calculations per path")
+    print(f"   float/Decimal mix: {results['float_ns']:,.0f} ns")
+    print(f"   Decimal reference: {results['decimal_ns']:,.0f} ns")
+    print(f"   Money (int cents): {results['money_ns']:,.0f} ns")
+    print(f"   Float results off by a cent: {results['float_cent_errors']:,.0f}")
+
+
+def _infer_format(path: Path | None) -> str:
+    """Guess the pipeline format from a file extension (stdin defaults to CSV)."""
+    if path is not None and path.suffix.lower() in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    return "csv"
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options; with none given the calculator runs interactively."""
+    parser = argparse.ArgumentParser(description="Tip Calculator")
+    parser.add_argument(
+        "--pipeline",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="split bills from a CSV/JSONL FILE (or stdin) without prompting",
+    )
+    parser.add_argument(
+        "--format", choices=("csv", "jsonl"), help="pipeline input/output format (default: by extension)"
+    )
+    parser.add_argument("--output", type=Path, help="file to write pipeline results to (default: stdout)")
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="COUNT",
+        help="time COUNT calculations on the float, Decimal and Money paths",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        type=int,
+        const=SERVICE_PORT,
+        metavar="PORT",
+        help=f"run the JSON HTTP service (default port: {SERVICE_PORT})",
+    )
+    parser.add_argument("--host", default=SERVICE_HOST, help=f"address for --serve (default: {SERVICE_HOST})")
+    parser.add_argument(
+        "--history",
+        type=Path,
+        metavar="DB",
+        help="append every calculation to this SQLite history file",
+    )
+    parser.add_argument("--report", action="store_true", help="print daily totals from the --history file")
+    return parser.parse_args(argv)
+
+
+def _run_pipeline(args: argparse.Namespace) -> None:
+    """Run the non-interactive pipeline for the CLI."""
+    input_path = None if args.pipeline == "-" else Path(args.pipeline)
+    input_format = args.format or _infer_format(input_path)
+
+    source = sys.stdin if input_path is None else input_path.open(encoding="utf-8", newline="")
+    sink = sys.stdout if args.output is None else args.output.open("w", encoding="utf-8", buffering=1024 * 1024)
+    history = None if args.history is None else CalculationHistory(args.history)
+    try:
+        written, rejected = process_bill_stream(source, sink, input_format, history=history)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        if history is not None:
+            history.close()
+    print(f"✅ {written:,} bills split, {rejected:,} rejected", file=sys.stderr)
+
+
+def _display_history_report(path: Path) -> None:
+    """Print per-day totals and the average tip from a history file."""
+    with CalculationHistory(path) as history:
+        average = history.average_tip_percentage()
+        print("📚 CALCULATION HISTORY")
+        print("=" * 50)
+        for day, count, bills, totals in history.daily_totals():
+            print(f"{day}: {count:,} bills, {format_currency(bills)} billed, {format_currency(totals)} with tip")
+        print("=" * 50)
+        print(f"Calculations: {history.count():,}")
+        print(f"Average tip: {'n/a' if average is None else f'{average:.1f}%'}")
+
+
+def _run_non_interactive(args: argparse.Namespace) -> bool:
+    """Run the mode selected on the command line; False means run interactively."""
+    if args.pipeline is not None:
+        _run_pipeline(args)
+    elif args.benchmark is not None:
+        _display_benchmark(args.benchmark)
+    elif args.serve is not None:
+        run_service(args.host, args.serve)
+    elif args.report:
+        if args.history is None:
+            print("❌ --report needs --history DB", file=sys.stderr)
+            sys.exit(2)
+        _display_history_report(args.history)
+    else:
+        return False
+    return True
+
+
+def main(argv: list[str] | None = None) -> None:
     """
     Main function that orchestrates the tip calculation process.
 
@@ -336,7 +1716,13 @@ def main() -> None:
     2. Get user inputs
     3. Perform calculations
     4. Display results
+
+    With --pipeline, bills are read from CSV/JSONL instead of prompts.
     """
+    args = _parse_args(argv)
+    if _run_non_interactive(args):
+        return
+
     try:
         # Step 1: Welcome the user
         display_welcome_message()
@@ -361,12 +1747,17 @@ def main() -> None:
             return
 
         # Step 3: Perform calculations
-        tip_amount = calculate_tip_amount(total_bill, tip_percentage)
-        total_with_tip = calculate_total_with_tip(float(total_bill), tip_amount)
+        bill = Money.from_decimal(total_bill)
+        tip_amount = calculate_tip_amount(bill, tip_percentage)
+        total_with_tip = calculate_total_with_tip(bill, tip_amount)
         split_amount = calculate_split_amount(total_with_tip, num_people)
 
         # Step 4: Display results
-        display_results(split_amount, total_bill, tip_percentage, num_people)
+        display_results(split_amount, bill, tip_percentage, num_people)
+
+        if args.history is not None:
+            with CalculationHistory(args.history) as history:
+                history.record((bill, tip_percentage, num_people, tip_amount, total_with_tip, split_amount))
 
     except KeyboardInterrupt:
         print("\n\nProgram interrupted by user. Goodbye!")
@@ -379,10 +1770,10 @@ def main() -> None:
 # ✅ Input validation for all user inputs  # DONE!
 # - Support for custom tip percentages
 # - Different rounding strategies
-# - Tax calculation inclusion
-# - Multiple currency support
-# - Bill splitting strategies (equal, weighted, etc.)
-# - Save calculation history to file
+# ✅ Tax calculation inclusion  # DONE!
+# ✅ Multiple currency support  # DONE!
+# ✅ Bill splitting strategies (equal, weighted, itemized)  # DONE!
+# ✅ Save calculation history to file  # DONE!
 
 if __name__ == "__main__":
     """
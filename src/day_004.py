@@ -7,6 +7,22 @@ Project: Rock Paper Scissors
 
 import random
 
+CHOICES = ("rock", "paper", "scissors")
+BEATS = {"rock": "scissors", "scissors": "paper", "paper": "rock"}
+
+TIE = "It's a tie!"
+PLAYER_WINS = "You win! 🎉"
+COMPUTER_WINS = "Computer wins! 🤖"
+
+
+def determine_winner(player_choice: str, computer_choice: str) -> str:
+    """Resolve one round of Rock Paper Scissors from the player's point of view."""
+    if player_choice == computer_choice:
+        return TIE
+    if BEATS.get(player_choice) == computer_choice:
+        return PLAYER_WINS
+    return COMPUTER_WINS
+
 
 def main() -> None:
     print("Welcome to Rock Paper Scissors!")
@@ -14,19 +30,9 @@ def main() -> None:
     # Player choice input
     player_choice = input("What do you choose? Type Rock, Paper or Scissors: ").lower()
 
-    computer_choice = random.choice(["rock", "paper", "scissors"])
+    computer_choice = random.choice(CHOICES)
 
-    result = ""
-    if player_choice == computer_choice:
-        result = "It's a tie!"
-    elif (
-        (player_choice == "rock" and computer_choice == "scissors")
-        or (player_choice == "scissors" and computer_choice == "paper")
-        or (player_choice == "paper" and computer_choice == "rock")
-    ):
-        result = "You win! 🎉"
-    else:
-        result = "Computer wins! 🤖"
+    result = determine_winner(player_choice, computer_choice)
 
     print(f"Computer chose: {computer_choice}")
     print(f"You chose: {player_choice}")
@@ -3,9 +3,23 @@ Day 5
 - Create a Password Generator
 """
 
+import argparse
+import bisect
+import functools
+import itertools
 import logging
+import math
+import mmap
+import os
 import secrets
 import string
+import sys
+import time
+from collections import Counter, deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import NamedTuple, TextIO
 
 # --- Character Set Definitions ---
 NUMBERS = string.digits  # "0123456789"
@@ -14,13 +28,29 @@ LOWERCASE_LETTERS = string.ascii_lowercase  # "abcdefghijklmnopqrstuvwxyz"
 SYMBOLS = "!#$%^&+=*()"  # Required special characters
 # --- CONSTANTS ---
 MINIMUM_LENGTH_PASSWORD = 8
+ENTROPY_BLOCK_SIZE = 64 * 1024  # Bytes read from os.urandom per refill
+BYTE_VALUES = 256
+STREAM_BATCH_SIZE = 8192  # Passwords generated and written per chunk
+OUTPUT_BUFFER_SIZE = 1024 * 1024  # Bytes buffered before each write to a file
+PARALLEL_CHUNK_SIZE = 50_000  # Passwords generated per worker task
+CHUNKS_IN_FLIGHT_PER_WORKER = 2  # Bounds memory held by pending results
+PRINTABLE_ASCII_SIZE = 95
+# Printable ASCII outside the four defined sets, used as the pool for "other" characters
+OTHER_CHARACTERS_POOL = PRINTABLE_ASCII_SIZE - len(LOWERCASE_LETTERS + UPPERCASE_LETTERS + SYMBOLS + NUMBERS)
+AUDIT_BLOCK_SIZE = 8 * 1024 * 1024  # Bytes of a mapped file classified per translate() pass
+# Upper entropy bound (bits, exclusive) for each strength label; anything above is "Very Strong"
+STRENGTH_THRESHOLDS = ((28.0, "Very Weak"), (36.0, "Weak"), (60.0, "Reasonable"), (128.0, "Strong"))
+
+# (num_lowercase, num_uppercase, num_symbols, num_numbers)
+PasswordSpec = tuple[int, int, int, int]
 
 
 def generate_password(num_lowercase: int, num_uppercase: int, num_symbols: int, num_numbers: int) -> str:
     """
     Generate a cryptographically secure random password.
 
-    Uses secrets module for cryptographic randomness instead of random module.
+    Thin wrapper over PasswordPolicy.generate() for the cached policy of this
+    composition; randomness comes from os.urandom, never the random module.
 
     Args:
         num_lowercase: Number of lowercase letters
@@ -30,30 +60,343 @@ def generate_password(num_lowercase: int, num_uppercase: int, num_symbols: int,
 
     Returns:
         Randomly generated secure password string
+
+    Raises:
+        ValueError: If any component count is negative
     """
-    # Build password components using secrets
-    password_chars: list[str] = []
+    return get_password_policy(num_lowercase, num_uppercase, num_symbols, num_numbers).generate(1)[0]
 
-    # Add required lowercase letters
-    password_chars.extend(secrets.choice(LOWERCASE_LETTERS) for _ in range(num_lowercase))
 
-    # Add required uppercase letters
-    password_chars.extend(secrets.choice(UPPERCASE_LETTERS) for _ in range(num_uppercase))
+def _generate_password_reference(num_lowercase: int, num_uppercase: int, num_symbols: int, num_numbers: int) -> str:
+    """
+    The original per-character generator: one secrets call per character and shuffle swap.
 
-    # Add required symbols
+    Kept unchanged as the baseline benchmark_password_generation() measures
+    the batch path against, and as a reference distribution for tests.
+    """
+    password_chars: list[str] = []
+    password_chars.extend(secrets.choice(LOWERCASE_LETTERS) for _ in range(num_lowercase))
+    password_chars.extend(secrets.choice(UPPERCASE_LETTERS) for _ in range(num_uppercase))
     password_chars.extend(secrets.choice(SYMBOLS) for _ in range(num_symbols))
-
-    # Add required numbers
     password_chars.extend(secrets.choice(NUMBERS) for _ in range(num_numbers))
 
-    # Shuffle using secrets (more secure than random.shuffle)
-    password_list = list(password_chars)
-    for i in range(len(password_list) - 1, 0, -1):
+    for i in range(len(password_chars) - 1, 0, -1):
         j = secrets.randbelow(i + 1)
-        password_list[i], password_list[j] = password_list[j], password_list[i]
+        password_chars[i], password_chars[j] = password_chars[j], password_chars[i]
+
+    return "".join(password_chars)
+
+
+class _EntropyPool:
+    """
+    Buffered source of CSPRNG bytes.
+
+    Reads os.urandom in large blocks so a whole batch costs a handful of
+    syscalls instead of several per password.
+    """
+
+    def __init__(self, size_hint: int = ENTROPY_BLOCK_SIZE) -> None:
+        self._buffer = os.urandom(max(size_hint, 1))
+        self._offset = 0
+
+    def take(self, size: int) -> bytes:
+        """Return the next `size` random bytes, refilling the buffer if needed."""
+        end = self._offset + size
+        if end > len(self._buffer):
+            remaining = self._buffer[self._offset :]
+            self._buffer = remaining + os.urandom(max(size, ENTROPY_BLOCK_SIZE))
+            self._offset = 0
+            end = size
+        chunk = self._buffer[self._offset : end]
+        self._offset = end
+        return chunk
+
+
+# (translate table, bytes to reject, acceptance limit) for one alphabet
+_RejectionTable = tuple[bytes, bytes, int]
+
+
+def _rejection_table(alphabet: bytes) -> _RejectionTable:
+    """
+    Build a bytes.translate() table that maps random bytes onto `alphabet`.
+
+    Bytes at or above the largest multiple of len(alphabet) are rejected,
+    which removes modulo bias; the rest map to alphabet[byte % size].
+    """
+    size = len(alphabet)
+    limit = BYTE_VALUES - BYTE_VALUES % size
+    table = bytes(alphabet[value % size] for value in range(BYTE_VALUES))
+    return table, bytes(range(limit, BYTE_VALUES)), limit
+
+
+# One table per character class, in PasswordSpec order
+_CLASS_TABLES: tuple[_RejectionTable, ...] = tuple(
+    _rejection_table(charset.encode("ascii")) for charset in (LOWERCASE_LETTERS, UPPERCASE_LETTERS, SYMBOLS, NUMBERS)
+)
+
+
+@functools.cache
+def _shuffle_table(bound: int) -> _RejectionTable:
+    """Table for a Fisher-Yates index below `bound` (at most BYTE_VALUES), built once and shared by all policies."""
+    return _rejection_table(bytes(range(bound)))
+
+
+def _accept_bytes(pool: _EntropyPool, rejection: _RejectionTable, count: int) -> bytes:
+    """Translate pool bytes through a rejection table until `count` accepted values remain."""
+    table, rejected, limit = rejection
+    accepted = bytearray()
+    while len(accepted) < count:
+        missing = count - len(accepted)
+        # Over-draw by the expected rejection rate so one pass is usually enough
+        accepted += pool.take(missing * BYTE_VALUES // limit + 16).translate(table, rejected)
+    return bytes(accepted[:count])
+
+
+def _uniform_words(pool: _EntropyPool, bound: int, count: int) -> list[int]:
+    """Draw `count` uniform integers below a bound too large for one byte, using 4-byte words."""
+    word_range = 1 << 32
+    limit = word_range - word_range % bound
+    values: list[int] = []
+    while len(values) < count:
+        raw = pool.take(4 * (count - len(values)))
+        for offset in range(0, len(raw), 4):
+            word = int.from_bytes(raw[offset : offset + 4], "little")
+            if word < limit:
+                values.append(word % bound)
+    return values[:count]
+
+
+class PasswordPolicy:
+    """
+    Immutable, pre-validated password composition.
+
+    Requirement checks run once at construction, which only counts and
+    compares, so validating a composition stays cheap. `class_tables` pairs
+    each character class the policy uses with its shared translate table, so
+    generating from a valid policy does no per-call validation or setup.
+    Shuffle tables are module-level and built on first use.
+    """
+
+    __slots__ = (
+        "class_tables",
+        "errors",
+        "is_valid",
+        "length",
+        "minimum_length",
+        "num_lowercase",
+        "num_numbers",
+        "num_symbols",
+        "num_uppercase",
+        "suggestions",
+    )
+
+    num_lowercase: int
+    num_uppercase: int
+    num_symbols: int
+    num_numbers: int
+    minimum_length: int
+    length: int
+    class_tables: tuple[tuple[_RejectionTable, int], ...]
+    is_valid: bool
+    errors: tuple[str, ...]
+    suggestions: tuple[str, ...]
+
+    def __init__(
+        self,
+        num_lowercase: int,
+        num_uppercase: int,
+        num_symbols: int,
+        num_numbers: int,
+        minimum_length: int = MINIMUM_LENGTH_PASSWORD,
+    ) -> None:
+        counts = (num_lowercase, num_uppercase, num_symbols, num_numbers)
+        length = sum(counts)
+        errors, suggestions = self._check_requirements(counts, length, minimum_length)
+
+        init = object.__setattr__
+        init(self, "num_lowercase", num_lowercase)
+        init(self, "num_uppercase", num_uppercase)
+        init(self, "num_symbols", num_symbols)
+        init(self, "num_numbers", num_numbers)
+        init(self, "minimum_length", minimum_length)
+        init(self, "length", length)
+        init(
+            self,
+            "class_tables",
+            tuple((table, count) for table, count in zip(_CLASS_TABLES, counts, strict=True) if count),
+        )
+        init(self, "is_valid", not errors)
+        init(self, "errors", tuple(errors))
+        init(self, "suggestions", tuple(suggestions))
+
+    @staticmethod
+    def _check_requirements(counts: PasswordSpec, length: int, minimum_length: int) -> tuple[list[str], list[str]]:
+        """Build the error and suggestion messages for a composition."""
+        num_lowercase, num_uppercase, num_symbols, num_numbers = counts
+        errors = []
+        suggestions = []
+
+        # Check total length
+        if length < minimum_length:
+            missing = minimum_length - length
+            errors.append(f"❌ Total: {length} characters (need at least {minimum_length})")
+            suggestions.append(f"   💡 Add {missing} more character{'s' if missing > 1 else ''}")
+
+        # Check numbers
+        if num_numbers < 1:
+            errors.append("❌ Numbers: 0 (need at least 1)")
+            suggestions.append("   💡 Add at least 1 number")
+
+        # Check lowercase letters
+        if num_lowercase < 1:
+            errors.append("❌ Lowercase Letters: 0 (need at least 1)")
+            suggestions.append("   💡 Add at least 1 lowercase letter")
+
+        # Check uppercase letters
+        if num_uppercase < 1:
+            errors.append("❌ Uppercase Letters: 0 (need at least 1)")
+            suggestions.append("   💡 Add at least 1 uppercase letter")
+
+        # Check symbols
+        if num_symbols < 1:
+            errors.append("❌ Symbols: 0 (need at least 1)")
+            suggestions.append("   💡 Add at least 1 special character")
+
+        return errors, suggestions
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> tuple[type["PasswordPolicy"], tuple[int, ...]]:
+        # Rebuild through __init__ so pickling (e.g. to worker processes) respects immutability
+        return type(self), (*self.counts, self.minimum_length)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PasswordPolicy):
+            return NotImplemented
+        return (self.counts, self.minimum_length) == (other.counts, other.minimum_length)
+
+    def __hash__(self) -> int:
+        return hash((self.counts, self.minimum_length))
+
+    def __repr__(self) -> str:
+        return (
+            f"PasswordPolicy(num_lowercase={self.num_lowercase}, num_uppercase={self.num_uppercase}, "
+            f"num_symbols={self.num_symbols}, num_numbers={self.num_numbers}, minimum_length={self.minimum_length})"
+        )
+
+    @property
+    def counts(self) -> PasswordSpec:
+        """Tuple of (num_lowercase, num_uppercase, num_symbols, num_numbers)."""
+        return self.num_lowercase, self.num_uppercase, self.num_symbols, self.num_numbers
+
+    def validate(self) -> tuple[bool, list[str], list[str]]:
+        """
+        Return the precomputed validation result.
+
+        Returns:
+            Tuple of (is_valid, errors, suggestions)
+        """
+        return self.is_valid, list(self.errors), list(self.suggestions)
+
+    def generate(self, n: int) -> list[str]:
+        """
+        Generate `n` passwords with this composition.
+
+        All randomness comes from one pre-sized os.urandom buffer. Characters
+        are mapped with rejection sampling (no modulo bias) and each password
+        is shuffled with a Fisher-Yates pass whose indices come from the same
+        buffer, so the output distribution matches generate_password().
+
+        Raises:
+            ValueError: If `n` or any component count is negative
+        """
+        if n < 0 or min(self.counts) < 0:
+            raise ValueError("Password count and component counts must be non-negative")
+        if n == 0:
+            return []
+
+        length = self.length
+        # One byte per character plus one per shuffle index, with headroom for rejections
+        pool = _EntropyPool(2 * n * length + ENTROPY_BLOCK_SIZE // 16)
+
+        # Draw every password's characters per class in one translate() call
+        columns = [(_accept_bytes(pool, table, n * count), count) for table, count in self.class_tables]
+
+        # Shuffle index streams: swaps[k][p] is password p's draw for bound (length - k)
+        swaps: list[bytes | list[int]] = []
+        for i in range(length - 1, 0, -1):
+            if i < BYTE_VALUES:
+                swaps.append(_accept_bytes(pool, _shuffle_table(i + 1), n))
+            else:
+                swaps.append(_uniform_words(pool, i + 1, n))
+
+        passwords: list[str] = []
+        for p in range(n):
+            chars = bytearray()
+            for column, count in columns:
+                chars += column[p * count : (p + 1) * count]
+
+            for k, i in enumerate(range(length - 1, 0, -1)):
+                j = swaps[k][p]
+                chars[i], chars[j] = chars[j], chars[i]
+
+            passwords.append(chars.decode("ascii"))
+
+        return passwords
+
 
-    # Convert list to string
-    return "".join(password_list)
+@functools.lru_cache(maxsize=256)
+def get_password_policy(num_lowercase: int, num_uppercase: int, num_symbols: int, num_numbers: int) -> PasswordPolicy:
+    """Return a cached PasswordPolicy so repeated checks of the same composition are free."""
+    return PasswordPolicy(num_lowercase, num_uppercase, num_symbols, num_numbers)
+
+
+def generate_passwords(n: int, num_lowercase: int, num_uppercase: int, num_symbols: int, num_numbers: int) -> list[str]:
+    """
+    Generate `n` passwords with the same composition as generate_password().
+
+    Thin wrapper over PasswordPolicy.generate().
+
+    Args:
+        n: Number of passwords to generate
+        num_lowercase: Number of lowercase letters per password
+        num_uppercase: Number of uppercase letters per password
+        num_symbols: Number of special characters per password
+        num_numbers: Number of digits per password
+
+    Returns:
+        List of `n` randomly generated password strings
+    """
+    return get_password_policy(num_lowercase, num_uppercase, num_symbols, num_numbers).generate(n)
+
+
+def benchmark_password_generation(
+    count: int = 10_000, num_lowercase: int = 4, num_uppercase: int = 4, num_symbols: int = 2, num_numbers: int = 2
+) -> dict[str, float]:
+    """
+    Compare per-password cost of the original secrets-per-character loop vs generate_passwords().
+
+    Returns:
+        Dict with microseconds per password for each path and the speedup
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        _generate_password_reference(num_lowercase, num_uppercase, num_symbols, num_numbers)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generate_passwords(count, num_lowercase, num_uppercase, num_symbols, num_numbers)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "loop_us_per_password": loop_seconds / count * 1e6,
+        "batch_us_per_password": batch_seconds / count * 1e6,
+        "speedup": loop_seconds / batch_seconds if batch_seconds else float("inf"),
+    }
 
 
 def validate_password_requirements(
@@ -62,40 +405,445 @@ def validate_password_requirements(
     """
     Validate password requirements and provide feedback.
 
+    Thin wrapper over the cached PasswordPolicy for this composition.
+
     Returns:
         Tuple of (is_valid, errors, suggestions)
     """
-    errors = []
-    suggestions = []
-    total_length = num_lowercase + num_uppercase + num_symbols + num_numbers
+    return get_password_policy(num_lowercase, num_uppercase, num_symbols, num_numbers).validate()
+
+
+def _resolve_policy(spec: PasswordSpec | PasswordPolicy) -> PasswordPolicy:
+    """
+    Turn a spec into a policy, rejecting compositions that fail the requirements.
+
+    Raises:
+        ValueError: If the composition does not meet the password requirements
+    """
+    policy = spec if isinstance(spec, PasswordPolicy) else get_password_policy(*spec)
+    if not policy.is_valid:
+        raise ValueError("; ".join(policy.errors))
+    return policy
+
+
+def iter_passwords(
+    spec: PasswordSpec | PasswordPolicy, count: int | None = None, batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Lazily yield passwords built from `spec`.
+
+    Passwords are produced in batches of `batch_size`, so memory stays flat
+    however many are requested.
+
+    Args:
+        spec: PasswordPolicy, or tuple of (num_lowercase, num_uppercase, num_symbols, num_numbers)
+        count: Number of passwords to yield, or None for an endless stream
+        batch_size: Passwords generated per batch
+
+    Raises:
+        ValueError: If `spec` does not meet the password requirements
+    """
+    policy = _resolve_policy(spec)
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    remaining = count
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        yield from policy.generate(size)
+        if remaining is not None:
+            remaining -= size
+
+
+def write_passwords(
+    stream: TextIO, spec: PasswordSpec | PasswordPolicy, count: int | None = None, batch_size: int = STREAM_BATCH_SIZE
+) -> int:
+    """
+    Write newline-separated passwords to `stream`, one chunk per batch.
+
+    Returns:
+        Number of passwords written
+    """
+    written = 0
+    passwords = iter_passwords(spec, count, batch_size)
+    while chunk := list(itertools.islice(passwords, batch_size)):
+        stream.write("\n".join(chunk) + "\n")
+        written += len(chunk)
+    return written
 
-    # Check total length
-    if total_length < MINIMUM_LENGTH_PASSWORD:
-        missing = MINIMUM_LENGTH_PASSWORD - total_length
-        errors.append(f"❌ Total: {total_length} characters (need at least 8)")
-        suggestions.append(f"   💡 Add {missing} more character{'s' if missing > 1 else ''}")
 
-    # Check numbers
-    if num_numbers < 1:
-        errors.append("❌ Numbers: 0 (need at least 1)")
-        suggestions.append("   💡 Add at least 1 number")
+class WorkerStats:
+    """Passwords produced and time spent by one worker process."""
 
-    # Check lowercase letters
-    if num_lowercase < 1:
-        errors.append("❌ Lowercase Letters: 0 (need at least 1)")
-        suggestions.append("   💡 Add at least 1 lowercase letter")
+    __slots__ = ("passwords", "pid", "seconds")
 
-    # Check uppercase letters
-    if num_uppercase < 1:
-        errors.append("❌ Uppercase Letters: 0 (need at least 1)")
-        suggestions.append("   💡 Add at least 1 uppercase letter")
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.passwords = 0
+        self.seconds = 0.0
 
-    # Check symbols
-    if num_symbols < 1:
-        errors.append("❌ Symbols: 0 (need at least 1)")
-        suggestions.append("   💡 Add at least 1 special character")
+    @property
+    def rate(self) -> float:
+        """Passwords per second of busy time."""
+        return self.passwords / self.seconds if self.seconds else 0.0
 
-    return len(errors) == 0, errors, suggestions
+
+def _generate_chunk(policy: PasswordPolicy, size: int) -> tuple[int, float, list[str]]:
+    """
+    Worker task: generate one chunk of passwords.
+
+    Runs in a child process, so every chunk draws from that worker's own
+    os.urandom entropy. The whole policy is pickled, so a custom
+    minimum_length reaches the worker intact.
+
+    Returns:
+        Tuple of (worker_pid, seconds_spent, passwords)
+    """
+    start = time.perf_counter()
+    passwords = policy.generate(size)
+    return os.getpid(), time.perf_counter() - start, passwords
+
+
+def iter_passwords_parallel(
+    spec: PasswordSpec | PasswordPolicy,
+    count: int | None = None,
+    workers: int | None = None,
+    ordered: bool = True,
+    stats: dict[int, WorkerStats] | None = None,
+) -> Iterator[list[str]]:
+    """
+    Yield chunks of passwords generated across a pool of worker processes.
+
+    Only a bounded number of chunks are in flight at once, so memory stays
+    flat for large or endless requests.
+
+    Args:
+        spec: PasswordPolicy, or tuple of (num_lowercase, num_uppercase, num_symbols, num_numbers)
+        count: Total passwords to generate, or None for an endless stream
+        workers: Number of worker processes (default: CPU count)
+        ordered: Yield chunks in submission order; otherwise as they complete
+        stats: Optional dict filled with per-worker throughput, keyed by pid
+
+    Raises:
+        ValueError: If `spec` does not meet the password requirements
+    """
+    # Same policy gate as the serial path, checked once in the parent
+    policy = _resolve_policy(spec)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+    remaining = count
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[tuple[int, float, list[str]]]] = deque()
+
+        while True:
+            while len(pending) < max_in_flight and (remaining is None or remaining > 0):
+                size = PARALLEL_CHUNK_SIZE if remaining is None else min(PARALLEL_CHUNK_SIZE, remaining)
+                pending.append(executor.submit(_generate_chunk, policy, size))
+                if remaining is not None:
+                    remaining -= size
+
+            if not pending:
+                return
+
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+
+            pid, seconds, passwords = future.result()
+            if stats is not None:
+                worker = stats.setdefault(pid, WorkerStats(pid))
+                worker.passwords += len(passwords)
+                worker.seconds += seconds
+            yield passwords
+
+
+def write_passwords_parallel(
+    stream: TextIO,
+    spec: PasswordSpec | PasswordPolicy,
+    count: int | None = None,
+    workers: int | None = None,
+    ordered: bool = True,
+) -> dict[int, WorkerStats]:
+    """
+    Write newline-separated passwords from a worker pool to `stream`.
+
+    Returns:
+        Per-worker throughput statistics keyed by pid
+    """
+    stats: dict[int, WorkerStats] = {}
+    for chunk in iter_passwords_parallel(spec, count, workers, ordered, stats):
+        stream.write("\n".join(chunk) + "\n")
+    return stats
+
+
+class PasswordScore(NamedTuple):
+    """Character-class breakdown, entropy estimate and policy verdict for one password."""
+
+    lowercase: int
+    uppercase: int
+    symbols: int
+    numbers: int
+    other: int
+    entropy_bits: float
+    strength: str
+    meets_policy: bool
+
+    @property
+    def length(self) -> int:
+        """Total number of characters."""
+        return self.lowercase + self.uppercase + self.symbols + self.numbers + self.other
+
+
+def _class_code_table(keep_newlines: bool) -> bytes:
+    """
+    Build a translate() table mapping every byte to a one-letter class code.
+
+    l/u/s/n mark the four defined sets and o marks anything else. With
+    `keep_newlines`, newline bytes pass through so a translated blob can
+    still be split into lines.
+    """
+    table = bytearray(b"o" * BYTE_VALUES)
+    for charset, code in (
+        (LOWERCASE_LETTERS, b"l"),
+        (UPPERCASE_LETTERS, b"u"),
+        (SYMBOLS, b"s"),
+        (NUMBERS, b"n"),
+    ):
+        for char in charset.encode("ascii"):
+            table[char] = code[0]
+    if keep_newlines:
+        table[ord("\n")] = ord("\n")
+    return bytes(table)
+
+
+_CLASS_CODE_TABLE = _class_code_table(keep_newlines=False)
+_LINE_CLASS_CODE_TABLE = _class_code_table(keep_newlines=True)
+
+# Bits per character for each combination of classes present, indexed by bitmask
+_CLASS_POOL_SIZES = (
+    len(LOWERCASE_LETTERS),
+    len(UPPERCASE_LETTERS),
+    len(SYMBOLS),
+    len(NUMBERS),
+    OTHER_CHARACTERS_POOL,
+)
+_BITS_PER_CHARACTER = tuple(
+    math.log2(pool) if (pool := sum(size for bit, size in enumerate(_CLASS_POOL_SIZES) if mask >> bit & 1)) else 0.0
+    for mask in range(1 << len(_CLASS_POOL_SIZES))
+)
+_STRENGTH_BOUNDS = [bound for bound, _ in STRENGTH_THRESHOLDS]
+_STRENGTH_LABELS = [label for _, label in STRENGTH_THRESHOLDS] + ["Very Strong"]
+
+
+def classify_password(password: str) -> tuple[int, int, int, int, int]:
+    """
+    Count characters per class.
+
+    Returns:
+        Tuple of (lowercase, uppercase, symbols, numbers, other)
+    """
+    codes = password.encode("ascii", "replace").translate(_CLASS_CODE_TABLE)
+    return _count_classes(codes)
+
+
+def _count_classes(codes: bytes) -> tuple[int, int, int, int, int]:
+    """Count class codes in a translated password (all work done by bytes.count)."""
+    lowercase = codes.count(b"l")
+    uppercase = codes.count(b"u")
+    symbols = codes.count(b"s")
+    numbers = codes.count(b"n")
+    return lowercase, uppercase, symbols, numbers, len(codes) - lowercase - uppercase - symbols - numbers
+
+
+def estimate_entropy(counts: tuple[int, int, int, int, int]) -> float:
+    """
+    Estimate brute-force entropy in bits from per-class counts.
+
+    Uses the classic pool model: length * log2(size of all classes present).
+    """
+    mask = 0
+    for bit, count in enumerate(counts):
+        if count:
+            mask |= 1 << bit
+    return sum(counts) * _BITS_PER_CHARACTER[mask]
+
+
+def password_strength(entropy_bits: float) -> str:
+    """Map an entropy estimate to a strength label using STRENGTH_THRESHOLDS."""
+    return _STRENGTH_LABELS[bisect.bisect_right(_STRENGTH_BOUNDS, entropy_bits)]
+
+
+def _score_codes(codes: bytes, verdicts: dict[tuple[int, int, int, int], bool]) -> PasswordScore:
+    """Score one translated password, memoizing policy verdicts per composition."""
+    counts = _count_classes(codes)
+    composition = counts[:4]
+    meets_policy = verdicts.get(composition)
+    if meets_policy is None:
+        meets_policy = verdicts[composition] = validate_password_requirements(*composition)[0]
+    entropy_bits = estimate_entropy(counts)
+    return PasswordScore(*counts, entropy_bits, password_strength(entropy_bits), meets_policy)
+
+
+def score_password(password: str) -> PasswordScore:
+    """Score a single password against the character classes and the policy."""
+    return score_passwords([password])[0]
+
+
+def score_passwords(passwords: Sequence[str]) -> list[PasswordScore]:
+    """
+    Score many passwords at once.
+
+    The whole batch is joined and classified with a single bytes.translate()
+    call, then each line is tallied with bytes.count(), so no Python code
+    runs per character. Characters outside ASCII count as "other", and the
+    policy verdict uses validate_password_requirements() once per distinct
+    composition.
+
+    Returns:
+        One PasswordScore per input password, in order
+    """
+    if not passwords:
+        return []
+
+    lines = "\n".join(passwords).encode("ascii", "replace").translate(_LINE_CLASS_CODE_TABLE).split(b"\n")
+    if len(lines) != len(passwords):
+        # Some password contains a newline; classify each one separately
+        lines = [password.encode("ascii", "replace").translate(_CLASS_CODE_TABLE) for password in passwords]
+
+    verdicts: dict[tuple[int, int, int, int], bool] = {}
+    return [_score_codes(codes, verdicts) for codes in lines]
+
+
+class PasswordAuditReport:
+    """Aggregate policy statistics for a scanned credential file."""
+
+    __slots__ = ("bytes_scanned", "length_histogram", "missing", "passwords", "seconds", "violations")
+
+    def __init__(self) -> None:
+        self.passwords = 0
+        self.violations = 0
+        self.bytes_scanned = 0
+        self.seconds = 0.0
+        self.length_histogram: Counter[int] = Counter()
+        self.missing: Counter[str] = Counter()
+
+    @property
+    def mb_per_second(self) -> float:
+        """Scan throughput in megabytes per second."""
+        return self.bytes_scanned / self.seconds / 1e6 if self.seconds else 0.0
+
+    def merge(self, other: "PasswordAuditReport") -> None:
+        """Fold another (shard) report's counters into this one; timing is left to the caller."""
+        self.passwords += other.passwords
+        self.violations += other.violations
+        self.bytes_scanned += other.bytes_scanned
+        self.length_histogram.update(other.length_histogram)
+        self.missing.update(other.missing)
+
+
+def _line_start_at_or_after(mapped: mmap.mmap, offset: int) -> int:
+    """Return the offset of the first line that starts at or after `offset`."""
+    if offset <= 0:
+        return 0
+    newline = mapped.find(b"\n", offset - 1)
+    return len(mapped) if newline == -1 else newline + 1
+
+
+def _tally_block(codes: bytes, report: PasswordAuditReport) -> None:
+    """Add one block of class-coded lines to `report`."""
+    verdicts: dict[tuple[int, int, int, int], bool] = {}
+    # Identical class patterns are common, so tally each distinct pattern once
+    for line, occurrences in Counter(codes.split(b"\n")).items():
+        if not line:
+            continue  # Blank lines and the empty tail after the final newline
+        lowercase, uppercase, symbols, numbers, _ = _count_classes(line)
+        composition = (lowercase, uppercase, symbols, numbers)
+        meets_policy = verdicts.get(composition)
+        if meets_policy is None:
+            meets_policy = verdicts[composition] = validate_password_requirements(*composition)[0]
+
+        report.passwords += occurrences
+        report.length_histogram[len(line)] += occurrences
+        if not meets_policy:
+            report.violations += occurrences
+        for name, count in (
+            ("lowercase", lowercase),
+            ("uppercase", uppercase),
+            ("symbols", symbols),
+            ("numbers", numbers),
+        ):
+            if not count:
+                report.missing[name] += occurrences
+
+
+def _audit_range(path: Path, start: int, end: int) -> PasswordAuditReport:
+    """
+    Audit the lines that start within bytes [start, end) of `path`.
+
+    The file is memory-mapped; line boundaries are located with mmap.find()
+    and each block is sliced from a memoryview of the map, so only one
+    block at a time is ever copied for classification.
+    """
+    report = PasswordAuditReport()
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return report  # mmap cannot map an empty file
+
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = _line_start_at_or_after(mapped, start)
+            stop = _line_start_at_or_after(mapped, end)
+            with memoryview(mapped) as view:
+                while position < stop:
+                    block_end = min(position + AUDIT_BLOCK_SIZE, stop)
+                    if block_end < stop:
+                        # Never split a line: end the block after its last newline
+                        newline = mapped.rfind(b"\n", position, block_end)
+                        if newline == -1:
+                            newline = mapped.find(b"\n", block_end)
+                        block_end = stop if newline == -1 else min(newline + 1, stop)
+
+                    codes = view[position:block_end].tobytes().translate(_LINE_CLASS_CODE_TABLE, b"\r")
+                    _tally_block(codes, report)
+                    report.bytes_scanned += block_end - position
+                    position = block_end
+    return report
+
+
+def audit_password_file(path: Path, workers: int | None = None) -> PasswordAuditReport:
+    """
+    Scan a newline-delimited password file for policy violations.
+
+    Memory use is bounded by AUDIT_BLOCK_SIZE per process regardless of
+    file size. Each line's bytes are classified against the module's
+    character sets (non-ASCII bytes count as "other").
+
+    Args:
+        path: File with one password per line
+        workers: Shard the file into byte ranges across this many processes;
+            None or 1 scans in the current process
+
+    Returns:
+        Aggregate statistics: password count, policy violations, length
+        histogram, missing-class counts and throughput
+    """
+    start = time.perf_counter()
+    size = path.stat().st_size
+
+    if workers is None or workers <= 1 or size < AUDIT_BLOCK_SIZE:
+        report = _audit_range(path, 0, size)
+    else:
+        report = PasswordAuditReport()
+        bounds = [size * shard // workers for shard in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = executor.map(_audit_range, [path] * workers, bounds[:-1], bounds[1:])
+            for shard in shards:
+                report.merge(shard)
+
+    report.seconds = time.perf_counter() - start
+    return report
 
 
 def display_password_requirements() -> None:
@@ -229,8 +977,126 @@ def _display_generated_password(password: str) -> None:
     print("=" * 50)
 
 
-def main() -> None:
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options; with none given the generator runs interactively."""
+    parser = argparse.ArgumentParser(description="Secure Password Generator")
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="COUNT",
+        help="compare per-password cost of the single and batch generators over COUNT passwords",
+    )
+    parser.add_argument(
+        "--stream",
+        type=int,
+        metavar="COUNT",
+        help="write COUNT passwords (0 for endless) to stdout or --output without prompting",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="with --stream, generate across N worker processes; with --audit, shard the file across N processes",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="with --workers, write chunks as they complete instead of in submission order",
+    )
+    parser.add_argument(
+        "--audit",
+        type=Path,
+        metavar="FILE",
+        help="scan a newline-delimited password file for policy violations",
+    )
+    parser.add_argument("--output", type=Path, help="file to write streamed passwords to (default: stdout)")
+    parser.add_argument("--lowercase", type=int, default=4, help="lowercase letters per password (default: 4)")
+    parser.add_argument("--uppercase", type=int, default=4, help="uppercase letters per password (default: 4)")
+    parser.add_argument("--symbols", type=int, default=2, help="special characters per password (default: 2)")
+    parser.add_argument("--numbers", type=int, default=2, help="digits per password (default: 2)")
+    return parser.parse_args(argv)
+
+
+def _write_stream(stream: TextIO, spec: PasswordPolicy, count: int | None, args: argparse.Namespace) -> None:
+    """Write passwords serially, or across worker processes when --workers is given."""
+    if args.workers is None:
+        write_passwords(stream, spec, count)
+        return
+
+    stats = write_passwords_parallel(stream, spec, count, args.workers, ordered=not args.unordered)
+    # Report on stderr so stdout stays a clean password stream
+    for worker in sorted(stats.values(), key=lambda worker: worker.pid):
+        print(
+            f"⚙️  Worker {worker.pid}: {worker.passwords:,} passwords in {worker.seconds:.2f}s ({worker.rate:,.0f}/s)",
+            file=sys.stderr,
+        )
+
+
+def _stream_to_output(args: argparse.Namespace) -> None:
+    """Stream passwords for the CLI, reporting requirement errors on stderr."""
+    count = args.stream or None
+    # Validate before opening --output, so a bad spec never truncates an existing file
+    try:
+        policy = _resolve_policy((args.lowercase, args.uppercase, args.symbols, args.numbers))
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        if args.output is None:
+            _write_stream(sys.stdout, policy, count, args)
+        else:
+            with args.output.open("w", encoding="ascii", buffering=OUTPUT_BUFFER_SIZE) as output:
+                _write_stream(output, policy, count, args)
+    except BrokenPipeError:
+        # Downstream consumer (e.g. `head`) closed the pipe. Point stdout at devnull so the
+        # interpreter's final flush does not raise again, then exit as the Python docs recommend
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+
+def _display_audit_report(report: PasswordAuditReport) -> None:
+    """Print aggregate audit statistics."""
+    print("=" * 50)
+    print("🔎 PASSWORD AUDIT")
+    print("=" * 50)
+    print(f"   Passwords scanned: {report.passwords:,}")
+    print(f"   Policy violations: {report.violations:,}")
+    print(f"   Throughput: {report.mb_per_second:,.1f} MB/s ({report.bytes_scanned:,} bytes in {report.seconds:.2f}s)")
+
+    print("\n📏 Length Histogram:")
+    for length, count in sorted(report.length_histogram.items()):
+        print(f"   {length:>4}: {count:,}")
+
+    print("\n❌ Missing Character Classes:")
+    for name in ("lowercase", "uppercase", "symbols", "numbers"):
+        print(f"   {name.capitalize()}: {report.missing[name]:,}")
+    print("=" * 50)
+
+
+def _display_benchmark(count: int) -> None:
+    """Run and print the generation benchmark."""
+    results = benchmark_password_generation(count)
+    print(f"⏱️  Generated {count:,} passwords per path")
+    print(f"   secrets-per-character loop: {results['loop_us_per_password']:.2f} µs/password")
+    print(f"   generate_passwords batch: {results['batch_us_per_password']:.2f} µs/password")
+    print(f"   Speedup: {results['speedup']:.1f}x")
+
+
+def main(argv: list[str] | None = None) -> None:
     """Main password generator function."""
+    args = _parse_args(argv)
+    if args.benchmark is not None:
+        _display_benchmark(args.benchmark)
+        return
+    if args.stream is not None:
+        _stream_to_output(args)
+        return
+    if args.audit is not None:
+        _display_audit_report(audit_password_file(args.audit, args.workers))
+        return
+
     print("🔐 Secure Password Generator")
     print("=" * 50)
 
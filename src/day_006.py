@@ -24,12 +24,30 @@ Note: We'll simulate Karel's world using text-based representation
 since we don't have the actual Karel environment.
 """
 
-# TODO: Import any necessary modules
-# Consider what might help with grid simulation or visualization
-from collections.abc import Callable
+import heapq
+import mmap
+import multiprocessing
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import lru_cache, partial
+from itertools import pairwise
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, NamedTuple, TextIO
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 # --- Karel World Constants ---
-GRID_SIZE: int = 10  # 10x10 grid world
+GRID_SIZE: int = 10  # Default world size; each KarelWorld has its own width and height
 WALL: str = "▓"
 EMPTY: str = "·"
 KAREL_NORTH: str = "↑"
@@ -38,25 +56,433 @@ KAREL_SOUTH: str = "↓"
 KAREL_WEST: str = "←"
 BEEPER: str = "○"
 
+# Direction codes, clockwise so that turning is arithmetic modulo 4
+NORTH: int = 0
+EAST: int = 1
+SOUTH: int = 2
+WEST: int = 3
+DIRECTION_ARROWS: tuple[str, ...] = (KAREL_NORTH, KAREL_EAST, KAREL_SOUTH, KAREL_WEST)
+
+# Cell encoding: one byte per cell holding the beeper count, or WALL_CELL
+WALL_CELL: int = 0xFF
+MAX_BEEPERS: int = 0xFE
+
+# Spatial index: bytes.translate tables turning a row of cells into bitset digits or plain beeper counts
+SPATIAL_BUCKET: int = 16  # Side of the square buckets that keep beeper totals
+WALL_FLAGS: bytes = bytes(ord("1") if value == WALL_CELL else ord("0") for value in range(256))
+BEEPER_FLAGS: bytes = bytes(ord("1") if 0 < value < WALL_CELL else ord("0") for value in range(256))
+BEEPER_COUNTS: bytes = bytes(0 if value == WALL_CELL else value for value in range(256))
+
+# Batch grading limits
+DEFAULT_MAX_STEPS: int = 100_000
+DEFAULT_TIMEOUT: float = 5.0  # Seconds per run
+DEADLINE_CHECK_MASK: int = 0x3FF  # Look at the clock every 1024 steps
+HARD_TIMEOUT_GRACE: float = 1.0  # Extra seconds before a worker that ignores its budget is killed
+
+# Swarm action codes, one per robot per tick
+ACTION_NONE: int = 0
+ACTION_MOVE: int = 1
+ACTION_TURN_LEFT: int = 2
+ACTION_TURN_RIGHT: int = 3
+ACTION_PICK: int = 4
+ACTION_PUT: int = 5
+
+# Karel language opcodes; each instruction is an (opcode, argument) pair
+OP_MOVE: int = 0
+OP_TURN_LEFT: int = 1
+OP_TURN_RIGHT: int = 2
+OP_PICK: int = 3
+OP_PUT: int = 4
+OP_JUMP: int = 5  # Jump to argument
+OP_COUNT: int = 6  # Push a repeat counter
+OP_LOOP: int = 7  # Pop the counter and jump to argument when it runs out, else decrement it
+OP_CALL: int = 8
+OP_RETURN: int = 9
+OP_HALT: int = 10
+OP_BRANCH: int = 16  # 16 | negate << 3 | condition: jump to argument unless the condition holds
+NEGATE_FLAG: int = 8
+DEFAULT_MAX_INSTRUCTIONS: int = 1_000_000
+MAX_CALL_DEPTH: int = 1_000
+MAX_REPEAT: int = 2**31 - 1  # Largest count an array("l") slot holds on every platform
+PROGRAM_CACHE_SIZE: int = 256
+
+KAREL_COMMANDS: dict[str, int] = {
+    "move": OP_MOVE,
+    "turn_left": OP_TURN_LEFT,
+    "turn_right": OP_TURN_RIGHT,
+    "pick_beeper": OP_PICK,
+    "put_beeper": OP_PUT,
+}
+# Condition codes 0-2 sense relative to Karel's heading; SENSOR_TURNS gives the turn for each
+KAREL_CONDITIONS: dict[str, int] = {
+    "front_is_clear": 0,
+    "left_is_clear": 1,
+    "right_is_clear": 2,
+    "beepers_present": 3,
+    "facing_north": 4,
+    "facing_east": 5,
+    "facing_south": 6,
+    "facing_west": 7,
+}
+SENSOR_TURNS: tuple[int, int, int] = (0, 3, 1)
+CONDITION_BEEPERS: int = 3
+CONDITION_FACING_NORTH: int = 4
+KEYWORDS = frozenset(("define", "if", "else", "while", "repeat", "not"))
+
+# Maze solving
+DISTANCE_CACHE_SIZE: int = 8  # Distance fields kept per world, least recently used dropped first
+UNREACHABLE: int = -1
+
+# Harvest planning
+HARVEST_NEIGHBOURS: int = 8  # Closest beepers remembered per beeper for the tour heuristics
+HARVEST_BUCKET: int = 16  # Side of the square buckets used to find the nearest stray beeper
+MAX_REVERSAL: int = 25_000  # Longest tour segment a 2-opt move may reverse
+
+# Binary world files: header, then the padded grid exactly as it sits in memory
+WORLD_MAGIC: bytes = b"KRLW"
+WORLD_FORMAT_VERSION: int = 1
+WORLD_HEADER = struct.Struct("<4sHHIIIB3x")  # magic, version, header size, width, height, position, direction
+TEXT_DIRECTIONS: dict[str, int] = {"north": 0, "east": 1, "south": 2, "west": 3}
+
+# Step traces: one byte per primitive call, each one reversible
+TRACE_MOVE: int = 0
+TRACE_MOVE_BLOCKED: int = 1
+TRACE_TURN_LEFT: int = 2
+TRACE_TURN_RIGHT: int = 3
+TRACE_PUT: int = 4
+TRACE_PICK: int = 5
+TRACE_PICK_EMPTY: int = 6
+DEFAULT_TRACE_CAPACITY: int = 1 << 16  # Steps preallocated; the buffer doubles when full
+DEFAULT_CHECKPOINT_INTERVAL: int = 1024
+
+# Animation
+DEFAULT_FPS: float = 30.0
+CELL_SYMBOLS: tuple[str, ...] = (EMPTY, *[BEEPER] * MAX_BEEPERS, WALL)  # Indexed by cell byte
+
+
+# A grid is the world's own bytearray, or a copy-on-write view of a memory-mapped world file
+Grid = bytearray | memoryview
+
 
 # --- Karel State ---
 class KarelWorld:
     """
     Simulates Karel's world with position, direction, and beepers.
+
+    The grid is a flat bytearray with one byte per cell: the beeper count,
+    or WALL_CELL for a wall. It is padded with a ring of wall cells, so
+    every sensor and move is a single index lookup with no bounds checks.
+    Karel's position is kept as a flat index and the direction as an int
+    code; (x, y) coordinates start at the bottom-left corner, and north
+    is towards larger y.
     """
 
-    def __init__(self) -> None:
-        # TODO: Initialize Karel's world state
-        # - Position (x, y)
-        # - Direction (north, east, south, west)
-        # - Beeper locations
-        # - Wall locations
-        # - Grid representation
-        self.karel_position: tuple[int, int] = (0, 0)
-        self.karel_direction: str = KAREL_NORTH
-        self.beepers: set[tuple[int, int]] = set()
-        self.walls: set[tuple[int, int]] = set()
-        self.grid: list[list[str]] = []
+    __slots__ = (
+        "cells",
+        "direction",
+        "dirty",
+        "distance_fields",
+        "height",
+        "offsets",
+        "position",
+        "spatial",
+        "stride",
+        "width",
+    )
+
+    def __init__(self, width: int = GRID_SIZE, height: int = GRID_SIZE) -> None:
+        if width < 1 or height < 1:
+            raise ValueError(f"World must be at least 1x1, got {width}x{height}")
+
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        # Index step for one move in each direction code
+        self.offsets: tuple[int, int, int, int] = (self.stride, 1, -self.stride, -1)
+
+        self.cells: Grid = bytearray(self.stride * (height + 2))
+        self.cells[: self.stride] = bytes([WALL_CELL]) * self.stride
+        self.cells[-self.stride :] = bytes([WALL_CELL]) * self.stride
+        self.cells[self.stride :: self.stride] = bytes([WALL_CELL]) * (height + 1)
+        self.cells[self.stride - 1 :: self.stride] = bytes([WALL_CELL]) * (height + 2)
+
+        self.position = self.index(0, 0)
+        self.direction = NORTH
+        # Cached BFS distance fields keyed by goal index; replaced whenever a wall changes
+        self.distance_fields: OrderedDict[int, array] = OrderedDict()
+        # Built on the first spatial query, then kept up to date by the editing and beeper methods
+        self.spatial: SpatialIndex | None = None
+        # Indices of cells written since the last frame; only tracked while a WorldRenderer is attached
+        self.dirty: set[int] | None = None
+
+    def __reduce__(self) -> tuple[Callable[..., "KarelWorld"], tuple[int, int, bytearray, int, int]]:
+        # Memory-mapped grids cannot be pickled, so ship the bytes; distance caches are rebuilt on demand
+        return _world_from_grid, (self.width, self.height, bytearray(self.cells), self.position, self.direction)
+
+    # --- Coordinates ---
+    def index(self, x: int, y: int) -> int:
+        """
+        Flat cell index for (x, y).
+
+        Raises:
+            ValueError: If (x, y) is outside the world
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"({x}, {y}) is outside the {self.width}x{self.height} world")
+        return (y + 1) * self.stride + x + 1
+
+    def coordinates(self, index: int) -> tuple[int, int]:
+        """(x, y) for a flat cell index."""
+        row, column = divmod(index, self.stride)
+        return column - 1, row - 1
+
+    @property
+    def karel_position(self) -> tuple[int, int]:
+        """Karel's (x, y) position."""
+        return self.coordinates(self.position)
+
+    @property
+    def karel_direction(self) -> str:
+        """Arrow for the direction Karel is facing."""
+        return DIRECTION_ARROWS[self.direction]
+
+    def place_karel(self, x: int, y: int, direction: int = NORTH) -> None:
+        """
+        Put Karel at (x, y) facing the given direction code.
+
+        Raises:
+            ValueError: If the cell is a wall or the direction is unknown
+        """
+        index = self.index(x, y)
+        if self.cells[index] == WALL_CELL:
+            raise ValueError(f"Cannot place Karel inside a wall at ({x}, {y})")
+        if direction not in (NORTH, EAST, SOUTH, WEST):
+            raise ValueError(f"Unknown direction code: {direction}")
+        self.position = index
+        self.direction = direction
+
+    # --- World editing ---
+    def add_wall(self, x: int, y: int) -> None:
+        """
+        Turn the cell at (x, y) into a wall, discarding any beepers there.
+
+        Raises:
+            ValueError: If Karel is standing on that cell
+        """
+        index = self.index(x, y)
+        if index == self.position:
+            raise ValueError(f"Cannot build a wall on Karel at ({x}, {y})")
+        before = self.cells[index]
+        self.cells[index] = WALL_CELL
+        self.distance_fields = OrderedDict()
+        if self.dirty is not None:
+            self.dirty.add(index)
+        if self.spatial is not None and before != WALL_CELL:
+            self.spatial.note_beepers(index, before, 0)
+            self.spatial.note_wall(index)
+
+    def remove_wall(self, x: int, y: int) -> None:
+        """Clear the wall at (x, y), if any."""
+        index = self.index(x, y)
+        if self.cells[index] == WALL_CELL:
+            self.cells[index] = 0
+            self.distance_fields = OrderedDict()
+            if self.dirty is not None:
+                self.dirty.add(index)
+            if self.spatial is not None:
+                self.spatial.note_wall(index)
+
+    def is_wall(self, x: int, y: int) -> bool:
+        """True if (x, y) is a wall."""
+        return self.cells[self.index(x, y)] == WALL_CELL
+
+    def set_beepers(self, x: int, y: int, count: int) -> None:
+        """
+        Set the number of beepers on (x, y).
+
+        Raises:
+            ValueError: If the cell is a wall or the count does not fit in a cell
+        """
+        index = self.index(x, y)
+        if self.cells[index] == WALL_CELL:
+            raise ValueError(f"Cannot put beepers inside a wall at ({x}, {y})")
+        if not 0 <= count <= MAX_BEEPERS:
+            raise ValueError(f"Beeper count must be between 0 and {MAX_BEEPERS}, got {count}")
+        if self.spatial is not None:
+            self.spatial.note_beepers(index, self.cells[index], count)
+        self.cells[index] = count
+        if self.dirty is not None:
+            self.dirty.add(index)
+
+    def beeper_count(self, x: int, y: int) -> int:
+        """Number of beepers on (x, y); walls hold none."""
+        value = self.cells[self.index(x, y)]
+        return 0 if value == WALL_CELL else value
+
+    @property
+    def walls(self) -> frozenset[tuple[int, int]]:
+        """
+        Read-only snapshot of every wall inside the world (the border ring excluded).
+
+        Built by scanning the grid, so each access costs O(width x height);
+        edit walls with add_wall() and remove_wall().
+        """
+        coordinates = self.coordinates
+        return frozenset(coordinates(index) for index in self._interior_indices() if self.cells[index] == WALL_CELL)
+
+    @property
+    def beepers(self) -> MappingProxyType[tuple[int, int], int]:
+        """
+        Read-only snapshot of the beeper count on every cell holding at least one.
+
+        Iterating it or testing `in` works on coordinates, as with a set of
+        beeper cells. Built by scanning the grid, so each access costs
+        O(width x height); edit beepers with set_beepers() or the primitives.
+        """
+        cells, coordinates = self.cells, self.coordinates
+        return MappingProxyType(
+            {coordinates(index): cells[index] for index in self._interior_indices() if 0 < cells[index] < WALL_CELL}
+        )
+
+    # --- Spatial queries ---
+    def spatial_index(self) -> "SpatialIndex":
+        """The world's SpatialIndex, built on first use."""
+        if self.spatial is None:
+            self.spatial = SpatialIndex(self)
+        return self.spatial
+
+    def count_beepers(self, corner: tuple[int, int], opposite: tuple[int, int]) -> int:
+        """
+        Total beepers in the rectangle spanned by two (x, y) corners, both included.
+
+        Raises:
+            ValueError: If a corner is outside the world
+        """
+        self.index(*corner)
+        self.index(*opposite)
+        (x_min, x_max), (y_min, y_max) = sorted((corner[0], opposite[0])), sorted((corner[1], opposite[1]))
+        return self.spatial_index().count(x_min, y_min, x_max, y_max)
+
+    def nearest_beeper(self, origin: tuple[int, int] | None = None) -> tuple[int, int] | None:
+        """
+        Closest cell holding beepers by Manhattan distance (walls ignored), or None if there are none.
+
+        Args:
+            origin: Cell to measure from (default: Karel's position)
+        """
+        x, y = self.karel_position if origin is None else origin
+        self.index(x, y)
+        return self.spatial_index().nearest(x, y)
+
+    def open_cells_ahead(self) -> int:
+        """Moves Karel can make straight ahead before a wall or the edge of the world."""
+        return self.spatial_index().ahead(self.position, self.direction)[0]
+
+    def beeper_ahead(self) -> int | None:
+        """Moves to the first cell with beepers straight ahead, or None if a wall or the edge comes first."""
+        return self.spatial_index().ahead(self.position, self.direction)[1]
+
+    def _interior_indices(self) -> Iterator[int]:
+        """Flat indices of every cell inside the border ring, row by row."""
+        for row in range(1, self.height + 1):
+            start = row * self.stride + 1
+            yield from range(start, start + self.width)
+
+    # --- Primitives ---
+    def move(self) -> bool:
+        """Step forward one cell; returns False and stays put if blocked."""
+        target = self.position + self.offsets[self.direction]
+        if self.cells[target] == WALL_CELL:
+            return False
+        self.position = target
+        return True
+
+    def turn_left(self) -> None:
+        """Turn 90 degrees counter-clockwise."""
+        self.direction = (self.direction + 3) & 3
+
+    def turn_right(self) -> None:
+        """Turn 90 degrees clockwise."""
+        self.direction = (self.direction + 1) & 3
+
+    def front_is_clear(self) -> bool:
+        """True if the cell ahead is not a wall or the edge of the world."""
+        return self.cells[self.position + self.offsets[self.direction]] != WALL_CELL
+
+    def left_is_clear(self) -> bool:
+        """True if the cell to the left is not a wall or the edge of the world."""
+        return self.cells[self.position + self.offsets[(self.direction + 3) & 3]] != WALL_CELL
+
+    def right_is_clear(self) -> bool:
+        """True if the cell to the right is not a wall or the edge of the world."""
+        return self.cells[self.position + self.offsets[(self.direction + 1) & 3]] != WALL_CELL
+
+    def facing_north(self) -> bool:
+        """True if Karel is facing north."""
+        return self.direction == NORTH
+
+    def facing_east(self) -> bool:
+        """True if Karel is facing east."""
+        return self.direction == EAST
+
+    def facing_south(self) -> bool:
+        """True if Karel is facing south."""
+        return self.direction == SOUTH
+
+    def facing_west(self) -> bool:
+        """True if Karel is facing west."""
+        return self.direction == WEST
+
+    def put_beeper(self) -> None:
+        """
+        Place a beeper on Karel's cell.
+
+        Raises:
+            ValueError: If the cell already holds MAX_BEEPERS
+        """
+        count = self.cells[self.position]
+        if count >= MAX_BEEPERS:
+            raise ValueError(f"A cell can hold at most {MAX_BEEPERS} beepers")
+        self.cells[self.position] = count + 1
+        if self.spatial is not None:
+            self.spatial.note_beepers(self.position, count, count + 1)
+        if self.dirty is not None:
+            self.dirty.add(self.position)
+
+    def pick_beeper(self) -> bool:
+        """Pick a beeper up from Karel's cell; returns False if there is none."""
+        count = self.cells[self.position]
+        if not count:
+            return False
+        self.cells[self.position] = count - 1
+        if self.spatial is not None:
+            self.spatial.note_beepers(self.position, count, count - 1)
+        if self.dirty is not None:
+            self.dirty.add(self.position)
+        return True
+
+    def beepers_present(self) -> bool:
+        """True if Karel's cell holds at least one beeper."""
+        return self.cells[self.position] > 0
+
+    # --- Display ---
+    def render(self) -> str:
+        """Text picture of the world, north at the top."""
+        cells, stride = self.cells, self.stride
+        lines = []
+        for row in range(self.height, 0, -1):
+            symbols = []
+            for index in range(row * stride + 1, row * stride + 1 + self.width):
+                if index == self.position:
+                    symbols.append(DIRECTION_ARROWS[self.direction])
+                elif cells[index] == WALL_CELL:
+                    symbols.append(WALL)
+                elif cells[index]:
+                    symbols.append(BEEPER)
+                else:
+                    symbols.append(EMPTY)
+            lines.append(" ".join(symbols))
+        return "\n".join(lines)
 
     def display_world(self) -> None:
         """
@@ -68,15 +494,190 @@ class KarelWorld:
         - Beepers
         - Empty spaces
         """
-        # TODO: Create a visual representation of the grid
-        # Print the grid with Karel, walls, and beepers
         print("Karel's World:")
         print("=" * 30)
-        # Implementation needed
-        print("World display not yet implemented")
+        print(self.render())
         print("=" * 30)
 
 
+# --- Spatial Index ---
+def _bits(flags: bytes) -> int:
+    """Bitset from one b"0" or b"1" digit per cell, the first cell in bit 0."""
+    return int(flags[::-1], 2)
+
+
+def _first_bit(bits: int, position: int, forward: bool) -> int | None:
+    """Distance from `position` to the nearest set bit above it (forward) or below it, or None."""
+    if forward:
+        ahead = bits >> (position + 1)
+        return (ahead & -ahead).bit_length() if ahead else None
+    behind = bits & ((1 << position) - 1)
+    return position - behind.bit_length() + 1 if behind else None
+
+
+def _closest_bit(bits: int, position: int) -> tuple[int, int]:
+    """(distance, bit) for the set bit closest to `position`; `bits` must not be 0."""
+    ahead = _first_bit(bits, position - 1, forward=True)  # Counts from the cell before `position`
+    behind = _first_bit(bits, position, forward=False)
+    if ahead is not None and (behind is None or ahead - 1 <= behind):
+        return ahead - 1, position + ahead - 1
+    if behind is None:
+        raise ValueError("No bits set")
+    return behind, position - behind
+
+
+class SpatialIndex:
+    """
+    Wall and beeper bitsets for every row and column, plus beeper totals per bucket.
+
+    Bit x of row y's bitset is set when (x, y) is a wall (or holds beepers);
+    column x has bit y for the same cell. A Python int holds a whole row, so
+    the first wall ahead of Karel or the closest beeper in a row takes a few
+    big-integer operations instead of a walk over cells. Totals per
+    SPATIAL_BUCKET-sided square let region counts add up whole buckets and
+    only look at single cells along the region's edge.
+    """
+
+    __slots__ = (
+        "beeper_columns",
+        "beeper_rows",
+        "bucket_columns",
+        "bucket_totals",
+        "cells",
+        "height",
+        "stride",
+        "wall_columns",
+        "wall_rows",
+        "width",
+    )
+
+    def __init__(self, world: KarelWorld) -> None:
+        width, height, stride = world.width, world.height, world.stride
+        self.width, self.height, self.stride, self.cells = width, height, stride, world.cells
+        self.bucket_columns = -(-width // SPATIAL_BUCKET)
+        self.bucket_totals = [0] * (self.bucket_columns * -(-height // SPATIAL_BUCKET))
+
+        # One bytes.translate per row or column turns cells into bitset digits
+        self.wall_rows: list[int] = []
+        self.beeper_rows: list[int] = []
+        for y in range(height):
+            start = (y + 1) * stride + 1
+            row = bytes(world.cells[start : start + width])
+            self.wall_rows.append(_bits(row.translate(WALL_FLAGS)))
+            self.beeper_rows.append(_bits(row.translate(BEEPER_FLAGS)))
+            counts = row.translate(BEEPER_COUNTS)
+            first_bucket = y // SPATIAL_BUCKET * self.bucket_columns
+            for bucket, x in enumerate(range(0, width, SPATIAL_BUCKET), first_bucket):
+                self.bucket_totals[bucket] += sum(counts[x : x + SPATIAL_BUCKET])
+        self.wall_columns: list[int] = []
+        self.beeper_columns: list[int] = []
+        for x in range(width):
+            column = bytes(world.cells[stride + 1 + x :: stride][:height])
+            self.wall_columns.append(_bits(column.translate(WALL_FLAGS)))
+            self.beeper_columns.append(_bits(column.translate(BEEPER_FLAGS)))
+
+    # --- Updates ---
+    def note_beepers(self, cell: int, before: int, after: int) -> None:
+        """Record that `cell` went from `before` to `after` beepers."""
+        row, column = divmod(cell, self.stride)
+        x, y = column - 1, row - 1
+        if (before == 0) != (after == 0):
+            self.beeper_rows[y] ^= 1 << x
+            self.beeper_columns[x] ^= 1 << y
+        self.bucket_totals[y // SPATIAL_BUCKET * self.bucket_columns + x // SPATIAL_BUCKET] += after - before
+
+    def note_wall(self, cell: int) -> None:
+        """Record that a wall was built on, or removed from, an empty `cell`."""
+        row, column = divmod(cell, self.stride)
+        x, y = column - 1, row - 1
+        self.wall_rows[y] ^= 1 << x
+        self.wall_columns[x] ^= 1 << y
+
+    # --- Queries ---
+    def count(self, x_min: int, y_min: int, x_max: int, y_max: int) -> int:
+        """Total beepers in the rectangle, both corners included."""
+        total = 0
+        for bucket_y in range(y_min // SPATIAL_BUCKET, y_max // SPATIAL_BUCKET + 1):
+            bottom = bucket_y * SPATIAL_BUCKET
+            top = min(bottom + SPATIAL_BUCKET, self.height) - 1
+            rows = range(max(y_min, bottom), min(y_max, top) + 1)
+            for bucket_x in range(x_min // SPATIAL_BUCKET, x_max // SPATIAL_BUCKET + 1):
+                left = bucket_x * SPATIAL_BUCKET
+                right = min(left + SPATIAL_BUCKET, self.width) - 1
+                first, last = max(x_min, left), min(x_max, right)
+                if len(rows) == top - bottom + 1 and first == left and last == right:
+                    total += self.bucket_totals[bucket_y * self.bucket_columns + bucket_x]
+                else:
+                    total += self._count_cells(rows, first, last)
+        return total
+
+    def _count_cells(self, rows: range, first: int, last: int) -> int:
+        """Beepers in columns first..last of the given rows, visiting only cells that hold some."""
+        cells, stride = self.cells, self.stride
+        mask = (1 << (last - first + 1)) - 1
+        total = 0
+        for y in rows:
+            bits = (self.beeper_rows[y] >> first) & mask
+            base = (y + 1) * stride + first
+            while bits:
+                low = bits & -bits
+                total += cells[base + low.bit_length()]
+                bits ^= low
+        return total
+
+    def nearest(self, x: int, y: int) -> tuple[int, int] | None:
+        """
+        Closest cell with beepers to (x, y) by Manhattan distance, or None.
+
+        Rows are searched outward from y and the search stops once rows are
+        further away than the best distance found, so its cost grows with
+        that distance rather than with the size of the world.
+        """
+        rows = self.beeper_rows
+        best = None
+        best_distance = self.width + self.height
+        for dy in range(max(y, self.height - 1 - y) + 1):
+            if dy >= best_distance:
+                break
+            for row in (y - dy, y + dy) if dy else (y,):
+                if 0 <= row < self.height and rows[row]:
+                    dx, column = _closest_bit(rows[row], x)
+                    if dx + dy < best_distance:
+                        best, best_distance = (column, row), dx + dy
+        return best
+
+    def ahead(self, cell: int, direction: int) -> tuple[int, int | None]:
+        """
+        Looking from `cell` towards `direction`: the moves possible before a wall or
+        the edge, and the distance to the first cell with beepers before that (or None).
+        """
+        row, column = divmod(cell, self.stride)
+        x, y = column - 1, row - 1
+        if direction in (EAST, WEST):
+            walls, beepers, position, size = self.wall_rows[y], self.beeper_rows[y], x, self.width
+        else:
+            walls, beepers, position, size = self.wall_columns[x], self.beeper_columns[x], y, self.height
+        forward = direction in (NORTH, EAST)
+        wall = _first_bit(walls, position, forward)
+        if wall is None:
+            wall = size - position if forward else position + 1
+        beeper = _first_bit(beepers, position, forward)
+        return wall - 1, beeper if beeper is not None and beeper < wall else None
+
+
+def _world_from_grid(width: int, height: int, cells: Grid, position: int, direction: int) -> KarelWorld:
+    """Wrap an existing padded grid in a KarelWorld without copying it."""
+    world = KarelWorld.__new__(KarelWorld)
+    world.width, world.height, world.stride = width, height, width + 2
+    world.offsets = (world.stride, 1, -world.stride, -1)
+    world.cells = cells
+    world.position, world.direction = position, direction
+    world.distance_fields = OrderedDict()
+    world.spatial = None
+    world.dirty = None
+    return world
+
+
 # Global world instance
 world: KarelWorld = KarelWorld()
 
@@ -92,12 +693,7 @@ def move() -> bool:
     Returns:
         bool: True if movement was successful, False if blocked
     """
-    # TODO: Implement movement logic
-    # Check if front is clear (no wall and within bounds)
-    # Update Karel's position if movement is possible
-    # Return success status
-    print("Karel attempts to move...")
-    return False
+    return world.move()
 
 
 def turn_left() -> None:
@@ -108,21 +704,17 @@ def turn_left() -> None:
     - Facing North → turns to face West
     - Facing East → turns to face North
     """
-    # TODO: Implement turning logic
-    # Update Karel's direction counter-clockwise
-    print("Karel turns left")
+    world.turn_left()
 
 
 def turn_right() -> None:
     """
     Turn Karel 90 degrees to the right.
 
-    This is not a primitive Karel command, so you'll need to
-    implement it using turn_left() or direct direction change.
+    This is not a primitive Karel command; with integer direction codes
+    it is a single step clockwise instead of three left turns.
     """
-    # TODO: Implement right turn using left turns or direct change
-    # Hint: Three left turns = one right turn
-    print("Karel turns right")
+    world.turn_right()
 
 
 def front_is_clear() -> bool:
@@ -132,9 +724,7 @@ def front_is_clear() -> bool:
     Returns:
         bool: True if Karel can move forward, False if blocked
     """
-    # TODO: Check the cell in front of Karel
-    # Consider direction and grid boundaries
-    return True
+    return world.front_is_clear()
 
 
 def left_is_clear() -> bool:
@@ -144,8 +734,7 @@ def left_is_clear() -> bool:
     Returns:
         bool: True if left side is clear, False if blocked
     """
-    # TODO: Check the cell to Karel's left
-    return True
+    return world.left_is_clear()
 
 
 def right_is_clear() -> bool:
@@ -155,8 +744,7 @@ def right_is_clear() -> bool:
     Returns:
         bool: True if right side is clear, False if blocked
     """
-    # TODO: Check the cell to Karel's right
-    return True
+    return world.right_is_clear()
 
 
 def facing_north() -> bool:
@@ -166,8 +754,7 @@ def facing_north() -> bool:
     Returns:
         bool: True if facing north, False otherwise
     """
-    # TODO: Check Karel's current direction
-    return False
+    return world.direction == NORTH
 
 
 def facing_east() -> bool:
@@ -177,8 +764,7 @@ def facing_east() -> bool:
     Returns:
         bool: True if facing east, False otherwise
     """
-    # TODO: Check Karel's current direction
-    return False
+    return world.direction == EAST
 
 
 def facing_south() -> bool:
@@ -188,8 +774,7 @@ def facing_south() -> bool:
     Returns:
         bool: True if facing south, False otherwise
     """
-    # TODO: Check Karel's current direction
-    return False
+    return world.direction == SOUTH
 
 
 def facing_west() -> bool:
@@ -199,18 +784,17 @@ def facing_west() -> bool:
     Returns:
         bool: True if facing west, False otherwise
     """
-    # TODO: Check Karel's current direction
-    return False
+    return world.direction == WEST
 
 
 def put_beeper() -> None:
     """
     Place a beeper at Karel's current location.
 
-    Karel can carry infinite beepers in this simulation.
+    Karel can carry infinite beepers in this simulation; a cell holds
+    at most MAX_BEEPERS.
     """
-    # TODO: Add a beeper to Karel's current position
-    print("Karel puts down a beeper")
+    world.put_beeper()
 
 
 def pick_beeper() -> bool:
@@ -220,9 +804,7 @@ def pick_beeper() -> bool:
     Returns:
         bool: True if beeper was picked up, False if no beeper present
     """
-    # TODO: Remove a beeper from current position if available
-    print("Karel picks up a beeper")
-    return True
+    return world.pick_beeper()
 
 
 def beepers_present() -> bool:
@@ -232,11 +814,1902 @@ def beepers_present() -> bool:
     Returns:
         bool: True if beepers are present, False otherwise
     """
-    # TODO: Check current cell for beepers
-    return False
+    return world.beepers_present()
+
+
+# --- Batch Simulation ---
+KarelProgram = Callable[[KarelWorld], object]
+WorldCheck = Callable[[KarelWorld], bool]
+
+
+class StepLimitError(RuntimeError):
+    """Raised when a program uses more primitive calls than its run allows."""
+
+
+class RunLimits(NamedTuple):
+    """Per-run budget: primitive calls and wall-clock seconds."""
+
+    max_steps: int = DEFAULT_MAX_STEPS
+    timeout: float = DEFAULT_TIMEOUT
+
+
+DEFAULT_RUN_LIMITS = RunLimits()
+
+
+class BudgetedWorld(KarelWorld):
+    """
+    A private copy of a world whose primitives count steps against a budget.
+
+    Every primitive call, sensors included, is one step, so a loop that
+    only senses still runs out. The clock is read every 1024 steps rather
+    than on each one. The budget is cooperative: it cannot interrupt a
+    program that stops calling primitives, which run_batch handles by
+    killing the worker process.
+    """
+
+    __slots__ = ("deadline", "max_steps", "steps")
+
+    def __init__(self, world: KarelWorld, limits: RunLimits = DEFAULT_RUN_LIMITS) -> None:
+        # Same geometry, own copy of the grid, so the original world is never modified
+        self.width, self.height, self.stride, self.offsets = world.width, world.height, world.stride, world.offsets
+        self.cells = bytearray(world.cells)
+        self.position, self.direction = world.position, world.direction
+        # Same walls, so the cached fields still apply; a wall change replaces rather than clears the dict
+        self.distance_fields = world.distance_fields
+        self.spatial = None
+        self.dirty = None
+        self.steps = 0
+        self.max_steps = limits.max_steps
+        self.deadline = time.perf_counter() + limits.timeout
+
+    def _step(self) -> None:
+        """Charge one step, raising once the step or time budget is spent."""
+        if self.steps >= self.max_steps:
+            raise StepLimitError(f"Exceeded {self.max_steps:,} steps")
+        self.steps += 1
+        if not self.steps & DEADLINE_CHECK_MASK and time.perf_counter() > self.deadline:
+            raise TimeoutError(f"Ran out of time after {self.steps:,} steps")
+
+    def move(self) -> bool:
+        self._step()
+        return super().move()
+
+    def turn_left(self) -> None:
+        self._step()
+        super().turn_left()
+
+    def turn_right(self) -> None:
+        self._step()
+        super().turn_right()
+
+    def front_is_clear(self) -> bool:
+        self._step()
+        return super().front_is_clear()
+
+    def left_is_clear(self) -> bool:
+        self._step()
+        return super().left_is_clear()
+
+    def right_is_clear(self) -> bool:
+        self._step()
+        return super().right_is_clear()
+
+    def facing_north(self) -> bool:
+        self._step()
+        return super().facing_north()
+
+    def facing_east(self) -> bool:
+        self._step()
+        return super().facing_east()
+
+    def facing_south(self) -> bool:
+        self._step()
+        return super().facing_south()
+
+    def facing_west(self) -> bool:
+        self._step()
+        return super().facing_west()
+
+    def put_beeper(self) -> None:
+        self._step()
+        super().put_beeper()
+
+    def pick_beeper(self) -> bool:
+        self._step()
+        return super().pick_beeper()
+
+    def beepers_present(self) -> bool:
+        self._step()
+        return super().beepers_present()
+
+
+class RunResult(NamedTuple):
+    """
+    Outcome of one program run.
+
+    `outcome` is "passed", "failed" (the check rejected the final world),
+    "step_limit", "timeout" or "error" (the program raised).
+    """
+
+    world_id: int
+    outcome: str
+    steps: int
+    seconds: float
+    error: str | None = None
+
+    @property
+    def passed(self) -> bool:
+        """True if the run finished and the check accepted the final world."""
+        return self.outcome == "passed"
+
+
+class BatchReport:
+    """Aggregate results of grading one program against many worlds."""
+
+    __slots__ = ("max_steps", "outcomes", "results", "seconds", "total_steps")
+
+    def __init__(self) -> None:
+        self.results: list[RunResult] = []
+        self.outcomes: Counter[str] = Counter()
+        self.total_steps = 0
+        self.max_steps = 0
+        self.seconds = 0.0
+
+    def add(self, result: RunResult) -> None:
+        """Fold one run into the totals."""
+        self.results.append(result)
+        self.outcomes[result.outcome] += 1
+        self.total_steps += result.steps
+        self.max_steps = max(self.max_steps, result.steps)
+
+    @property
+    def runs(self) -> int:
+        """Number of runs graded."""
+        return len(self.results)
+
+    @property
+    def passed(self) -> int:
+        """Number of runs that passed."""
+        return self.outcomes["passed"]
+
+    @property
+    def pass_rate(self) -> float:
+        """Fraction of runs that passed."""
+        return self.passed / self.runs if self.runs else 0.0
+
+    @property
+    def mean_steps(self) -> float:
+        """Average steps per run."""
+        return self.total_steps / self.runs if self.runs else 0.0
+
+
+def run_program(
+    program: KarelProgram,
+    world: KarelWorld,
+    check: WorldCheck | None = None,
+    limits: RunLimits = DEFAULT_RUN_LIMITS,
+    world_id: int = 0,
+) -> RunResult:
+    """
+    Run a Karel program on a copy of `world` under a step and time budget.
+
+    Args:
+        program: Callable that drives Karel through the world it is given
+        world: Starting world; it is copied, never modified
+        check: Predicate on the final world; None accepts any run that finishes
+        limits: Step and time budget for this run
+        world_id: Identifier echoed in the result
+
+    Returns:
+        RunResult with the outcome, steps used and elapsed seconds
+    """
+    budgeted = BudgetedWorld(world, limits)
+    start = time.perf_counter()
+    try:
+        program(budgeted)
+    except StepLimitError as error:
+        return RunResult(world_id, "step_limit", budgeted.steps, time.perf_counter() - start, str(error))
+    except TimeoutError as error:
+        return RunResult(world_id, "timeout", budgeted.steps, time.perf_counter() - start, str(error))
+    except Exception as error:  # Student code may raise anything; grade it rather than crash the batch
+        return RunResult(world_id, "error", budgeted.steps, time.perf_counter() - start, repr(error))
+
+    seconds = time.perf_counter() - start
+    try:
+        outcome = "passed" if check is None or check(budgeted) else "failed"
+    except Exception as error:  # A broken check fails this run, not the worker grading it
+        return RunResult(world_id, "error", budgeted.steps, seconds, f"check raised {error!r}")
+    return RunResult(world_id, outcome, budgeted.steps, seconds)
+
+
+def _run_indexed(
+    program: KarelProgram, check: WorldCheck | None, limits: RunLimits, item: tuple[int, KarelWorld]
+) -> RunResult:
+    """Worker task: grade one (world_id, world) pair."""
+    world_id, world = item
+    return run_program(program, world, check, limits, world_id)
+
+
+BatchTask = Callable[[tuple[int, KarelWorld]], RunResult]
+
+
+def _batch_worker(connection: Connection, task: BatchTask) -> None:
+    """Worker process loop: grade each item received until the parent sends None."""
+    while (item := connection.recv()) is not None:
+        connection.send(task(item))
+
+
+class _BatchWorker:
+    """One grading process, the run it is busy with and when that run must be over."""
+
+    __slots__ = ("connection", "deadline", "process", "started", "world_id")
+
+    def __init__(self, task: BatchTask) -> None:
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_batch_worker, args=(child, task), daemon=True)
+        self.process.start()
+        child.close()
+        self.world_id = -1
+        self.started = self.deadline = 0.0
+
+    def assign(self, item: tuple[int, KarelWorld], seconds: float) -> None:
+        """Hand the worker one run, allowing it `seconds` of wall-clock time."""
+        self.world_id = item[0]
+        self.started = time.perf_counter()
+        self.deadline = self.started + seconds
+        self.connection.send(item)
+
+    def stop(self) -> None:
+        """Ask an idle worker to exit and wait for it."""
+        self.connection.send(None)
+        self.process.join()
+        self.connection.close()
+
+    def kill(self) -> None:
+        """Terminate the worker whatever it is doing."""
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+def run_batch(
+    program: KarelProgram,
+    worlds: Sequence[KarelWorld],
+    check: WorldCheck | None = None,
+    limits: RunLimits = DEFAULT_RUN_LIMITS,
+    workers: int | None = None,
+) -> BatchReport:
+    """
+    Grade one Karel program against many worlds across worker processes.
+
+    `program` and `check` are sent to the workers by pickling, so they must
+    be module-level functions. Each worker grades one world at a time under
+    a wall-clock limit of `limits.timeout` plus HARD_TIMEOUT_GRACE seconds:
+    the step budget in BudgetedWorld only runs while the program calls
+    primitives, so a worker stuck in plain Python past its limit is
+    terminated, replaced, and the run reported as a "timeout". Results come
+    back in world order.
+
+    Args:
+        program: Callable that drives Karel through the world it is given
+        worlds: Starting worlds, graded independently
+        check: Predicate on each final world; None accepts any run that finishes
+        limits: Step and time budget applied to every run
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        BatchReport with per-world results and aggregate counts
+    """
+    start = time.perf_counter()
+    report = BatchReport()
+    task = partial(_run_indexed, program, check, limits)
+    hard_limit = limits.timeout + HARD_TIMEOUT_GRACE
+    pending = iter(enumerate(worlds))
+    results: list[RunResult | None] = [None] * len(worlds)
+    idle = [_BatchWorker(task) for _ in range(min(workers or os.cpu_count() or 1, len(worlds)))]
+    busy: dict[Connection, _BatchWorker] = {}
+
+    def dispatch(worker: _BatchWorker) -> None:
+        """Give `worker` the next world, or park it once none are left."""
+        item = next(pending, None)
+        if item is None:
+            idle.append(worker)
+        else:
+            worker.assign(item, hard_limit)
+            busy[worker.connection] = worker
+
+    for worker in idle[:]:
+        idle.remove(worker)
+        dispatch(worker)
+
+    while busy:
+        now = time.perf_counter()
+        ready = wait(list(busy), timeout=max(0.0, min(worker.deadline for worker in busy.values()) - now))
+        for connection in [connection for connection in busy if connection in ready]:
+            worker = busy.pop(connection)
+            try:
+                results[worker.world_id] = connection.recv()
+            except EOFError:  # The program brought the whole process down, e.g. with os._exit()
+                seconds = time.perf_counter() - worker.started
+                results[worker.world_id] = RunResult(worker.world_id, "error", 0, seconds, "Worker process died")
+                worker.kill()
+                worker = _BatchWorker(task)
+            dispatch(worker)
+
+        now = time.perf_counter()
+        for connection, worker in list(busy.items()):
+            if now >= worker.deadline:
+                del busy[connection]
+                worker.kill()
+                error = f"Killed after {now - worker.started:.1f}s without finishing"
+                results[worker.world_id] = RunResult(worker.world_id, "timeout", 0, now - worker.started, error)
+                dispatch(_BatchWorker(task))
+
+    for worker in idle:
+        worker.stop()
+    for result in results:
+        if result is not None:
+            report.add(result)
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+# --- Multiple Karel Instances ---
+class TickStats(NamedTuple):
+    """What happened to a swarm during one tick."""
+
+    moved: int
+    blocked: int
+    picked: int
+    put: int
+
+
+class KarelSwarm:
+    """
+    Many Karel robots sharing one world, advanced together one tick at a time.
+
+    Positions (flat cell indices) and directions live in NumPy arrays and the
+    grid is a zero-copy view of the world's bytearray, so beepers picked or put
+    by the swarm show up in the world itself. Each tick applies one action per
+    robot with array operations only; robots never share a cell.
+    """
+
+    __slots__ = ("cells", "directions", "occupant", "offsets", "positions", "world")
+
+    def __init__(
+        self,
+        world: KarelWorld,
+        xs: "npt.ArrayLike",
+        ys: "npt.ArrayLike",
+        directions: "npt.ArrayLike" = NORTH,
+    ) -> None:
+        """
+        Args:
+            world: World the robots live in
+            xs, ys: Starting coordinates, one pair per robot
+            directions: Direction code per robot, or one code for all
+
+        Raises:
+            ValueError: If a robot starts outside the world, inside a wall or on another robot
+        """
+        import numpy as np  # noqa: PLC0415 - optional dependency, only needed in swarm mode
+
+        x = np.asarray(xs, dtype=np.int64)
+        y = np.asarray(ys, dtype=np.int64)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("xs and ys must be 1-D arrays of the same length")
+        if ((x < 0) | (x >= world.width) | (y < 0) | (y >= world.height)).any():
+            raise ValueError(f"Every robot must start inside the {world.width}x{world.height} world")
+
+        self.world = world
+        self.cells: npt.NDArray[np.uint8] = np.frombuffer(world.cells, dtype=np.uint8)
+        self.offsets: npt.NDArray[np.int64] = np.array(world.offsets, dtype=np.int64)
+        self.positions: npt.NDArray[np.int64] = (y + 1) * world.stride + x + 1
+        self.directions: npt.NDArray[np.int64] = np.broadcast_to(
+            np.asarray(directions, dtype=np.int64) & 3, x.shape
+        ).copy()
+
+        if (self.cells[self.positions] == WALL_CELL).any():
+            raise ValueError("Robots cannot start inside a wall")
+        # Robot id standing on each cell, or -1
+        self.occupant: npt.NDArray[np.int64] = np.full(self.cells.size, -1, dtype=np.int64)
+        self.occupant[self.positions] = np.arange(x.size)
+        if np.count_nonzero(self.occupant >= 0) != x.size:
+            raise ValueError("Two robots cannot start on the same cell")
+
+    @classmethod
+    def scatter(cls, world: KarelWorld, count: int, seed: int | None = None) -> "KarelSwarm":
+        """
+        Place `count` robots on distinct random free cells, facing random directions.
+
+        Raises:
+            ValueError: If the world has fewer free cells than robots
+        """
+        import numpy as np  # noqa: PLC0415 - optional dependency, only needed in swarm mode
+
+        rng = np.random.default_rng(seed)
+        cells = np.frombuffer(world.cells, dtype=np.uint8)
+        free = np.flatnonzero(cells != WALL_CELL)
+        if free.size < count:
+            raise ValueError(f"Only {free.size:,} free cells for {count:,} robots")
+        rows, columns = np.divmod(rng.choice(free, size=count, replace=False), world.stride)
+        return cls(world, columns - 1, rows - 1, rng.integers(0, 4, size=count))
+
+    def __len__(self) -> int:
+        return int(self.positions.size)
+
+    @property
+    def xs(self) -> "npt.NDArray[np.int64]":
+        """x coordinate of every robot."""
+        return self.positions % self.world.stride - 1
+
+    @property
+    def ys(self) -> "npt.NDArray[np.int64]":
+        """y coordinate of every robot."""
+        return self.positions // self.world.stride - 1
+
+    def front_is_clear(self) -> "npt.NDArray[np.bool_]":
+        """Per robot: True if the cell ahead is not a wall (other robots are ignored)."""
+        ahead: npt.NDArray[np.int64] = self.positions + self.offsets[self.directions]
+        return self.cells[ahead] < WALL_CELL
+
+    def beepers_present(self) -> "npt.NDArray[np.bool_]":
+        """Per robot: True if its cell holds a beeper."""
+        return self.cells[self.positions] > 0
+
+    def step(self, actions: "npt.ArrayLike") -> TickStats:
+        """
+        Advance every robot by one action.
+
+        Turns, picks and puts always apply (a pick on an empty cell or a put
+        on a full one does nothing). A move is blocked by a wall, by a robot
+        that stays where it is, by a head-on swap, or by a lower-numbered
+        robot moving into the same cell. A robot may move into a cell its
+        occupant is leaving, so a queue advances as a whole and a cycle of
+        three or more robots rotates.
+
+        Args:
+            actions: One ACTION_* code per robot, or one code for all
+
+        Returns:
+            TickStats counting moves made and blocked, beepers picked and put
+        """
+        import numpy as np  # noqa: PLC0415 - optional dependency, only needed in swarm mode
+
+        actions = np.broadcast_to(np.asarray(actions), self.positions.shape)
+        positions, directions, cells = self.positions, self.directions, self.cells
+
+        directions[actions == ACTION_TURN_LEFT] += 3
+        directions[actions == ACTION_TURN_RIGHT] += 1
+        directions &= 3
+
+        # Beepers: robots never share a cell, so the fancy-indexed updates never collide
+        picking = positions[actions == ACTION_PICK]
+        picking = picking[cells[picking] > 0]
+        cells[picking] -= 1
+        putting = positions[actions == ACTION_PUT]
+        putting = putting[cells[putting] < MAX_BEEPERS]
+        cells[putting] += 1
+        if picking.size or putting.size:
+            self.world.spatial = None  # Rebuilt on the next spatial query
+            if self.world.dirty is not None:
+                self.world.dirty.update(picking.tolist(), putting.tolist())
+
+        movers = np.flatnonzero(actions == ACTION_MOVE)
+        targets = positions[movers] + self.offsets[directions[movers]]
+        ok = cells[targets] != WALL_CELL
+
+        # Several robots heading for one cell: the lowest robot id gets it
+        order = np.argsort(targets, kind="stable")
+        first = np.ones(order.size, dtype=bool)
+        first[1:] = targets[order[1:]] != targets[order[:-1]]
+        ok[order[~first]] = False
+
+        # A mover heading for an occupied cell follows the robot there: it moves only if that robot does.
+        # Every cell has at most one live mover heading for it, so followers form chains and cycles.
+        live, live_targets = movers[ok], targets[ok]
+        ahead = self.occupant[live_targets]
+        moves = np.zeros(positions.size, dtype=bool)
+        moves[live[ahead < 0]] = True
+        chained = ahead >= 0
+        followers = live[chained]
+        pointer = np.arange(positions.size)
+        pointer[followers] = ahead[chained]
+        undecided = np.zeros(positions.size, dtype=bool)
+        # A head-on swap is a two-robot cycle that is never allowed
+        undecided[followers[pointer[pointer[followers]] != followers]] = True
+
+        # Pointer jumping: each pass doubles how far down its chain an undecided robot looks,
+        # so a chain of any length is settled in O(log n) array passes
+        pending = np.flatnonzero(undecided)
+        for _ in range(positions.size.bit_length() + 1):
+            if not pending.size:
+                break
+            leader = pointer[pending]
+            settled = ~undecided[leader]
+            moves[pending[settled]] = moves[leader[settled]]
+            undecided[pending[settled]] = False
+            pending, leader = pending[~settled], leader[~settled]
+            pointer[pending] = pointer[leader]
+        # Robots still undecided go round a cycle of three or more, which turns as a whole
+        moves[pending] = True
+
+        moving = moves[live]
+        moved = live[moving]
+        self.occupant[positions[moved]] = -1
+        positions[moved] = live_targets[moving]
+        self.occupant[positions[moved]] = moved
+
+        return TickStats(int(moved.size), int(movers.size - moved.size), int(picking.size), int(putting.size))
+
+
+# --- Karel Language ---
+_TOKEN_PATTERN = re.compile(r"[A-Za-z_]\w*|\d+|[{}]|\S")
+
+
+class ExecutionStats(NamedTuple):
+    """Work done by one run of a compiled program."""
+
+    instructions: int
+    actions: int
+
+
+def _tokenize(source: str) -> list[tuple[str, int]]:
+    """
+    Split Karel source into (token, line) pairs; `#` starts a comment.
+
+    Raises:
+        ValueError: On a character that is not part of the language
+    """
+    tokens = []
+    for line_number, line in enumerate(source.splitlines(), start=1):
+        for token in _TOKEN_PATTERN.findall(line.partition("#")[0]):
+            if not (token[0].isalnum() or token[0] == "_" or token in "{}"):
+                raise ValueError(f"line {line_number}: unexpected character {token!r}")
+            tokens.append((token, line_number))
+    return tokens
+
+
+class _Compiler:
+    """Recursive-descent compiler from Karel source to a flat instruction array."""
+
+    def __init__(self, source: str) -> None:
+        self.tokens = _tokenize(source)
+        self.position = 0
+        self.code: list[int] = []
+        self.calls: list[tuple[int, str, int]] = []  # (argument slot, name, line) to patch
+        self.functions: dict[str, int] = {}
+
+    def peek(self) -> str | None:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self) -> tuple[str, int]:
+        if self.position >= len(self.tokens):
+            last_line = self.tokens[-1][1] if self.tokens else 1
+            raise ValueError(f"line {last_line}: unexpected end of program")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def expect(self, expected: str) -> None:
+        token, line = self.take()
+        if token != expected:
+            raise ValueError(f"line {line}: expected {expected!r}, got {token!r}")
+
+    def emit(self, op: int, argument: int = 0) -> int:
+        """Append one instruction; returns the index of its argument slot for later patching."""
+        self.code += (op, argument)
+        return len(self.code) - 1
+
+    def here(self) -> int:
+        """Instruction number the next emitted instruction will get."""
+        return len(self.code) // 2
+
+    def compile(self) -> "CompiledProgram":
+        definitions: list[tuple[str, int, int]] = []
+        while self.peek() is not None:
+            if self.peek() == "define":
+                self.take()
+                name, line = self.take()
+                if name in KEYWORDS or name in KAREL_COMMANDS or name in KAREL_CONDITIONS:
+                    raise ValueError(f"line {line}: cannot redefine {name!r}")
+                if name in self.functions or any(name == other for other, _, _ in definitions):
+                    raise ValueError(f"line {line}: {name!r} is defined twice")
+                definitions.append((name, self.position, line))
+                self.skip_block()
+            else:
+                self.statement()
+        self.emit(OP_HALT)
+
+        # Function bodies follow the main program, each ending in RETURN
+        for name, start, _ in definitions:
+            self.functions[name] = self.here()
+            self.position = start
+            self.block()
+            self.emit(OP_RETURN)
+
+        for slot, name, line in self.calls:
+            if name not in self.functions:
+                raise ValueError(f"line {line}: unknown command {name!r}")
+            self.code[slot] = self.functions[name]
+        return CompiledProgram(array("l", self.code), dict(self.functions))
+
+    def skip_block(self) -> None:
+        """Step over a balanced { ... } block; definitions are compiled after the main program."""
+        self.expect("{")
+        depth = 1
+        while depth:
+            token, _ = self.take()
+            depth += (token == "{") - (token == "}")
+
+    def block(self) -> None:
+        self.expect("{")
+        while self.peek() != "}":
+            if self.peek() is None:
+                self.take()  # Raises "unexpected end of program"
+            self.statement()
+        self.take()
+
+    def condition(self) -> int:
+        negate = 0
+        token, line = self.take()
+        if token == "not":
+            negate = NEGATE_FLAG
+            token, line = self.take()
+        if token not in KAREL_CONDITIONS:
+            raise ValueError(f"line {line}: expected a condition, got {token!r}")
+        return OP_BRANCH | negate | KAREL_CONDITIONS[token]
+
+    def statement(self) -> None:
+        token, line = self.take()
+        if token in KAREL_COMMANDS:
+            self.emit(KAREL_COMMANDS[token])
+        elif token == "if":
+            skip = self.emit(self.condition())
+            self.block()
+            if self.peek() == "else":
+                self.take()
+                done = self.emit(OP_JUMP)
+                self.code[skip] = self.here()
+                self.block()
+                self.code[done] = self.here()
+            else:
+                self.code[skip] = self.here()
+        elif token == "while":
+            top = self.here()
+            exit_slot = self.emit(self.condition())
+            self.block()
+            self.emit(OP_JUMP, top)
+            self.code[exit_slot] = self.here()
+        elif token == "repeat":
+            count, count_line = self.take()
+            if not count.isdecimal():
+                raise ValueError(f"line {count_line}: repeat needs a number, got {count!r}")
+            if int(count) > MAX_REPEAT:
+                raise ValueError(f"line {count_line}: repeat count {count} exceeds {MAX_REPEAT:,}")
+            self.emit(OP_COUNT, int(count))
+            top = self.here()
+            exit_slot = self.emit(OP_LOOP)
+            self.block()
+            self.emit(OP_JUMP, top)
+            self.code[exit_slot] = self.here()
+        elif token in KEYWORDS or token in KAREL_CONDITIONS or not (token[0].isalpha() or token[0] == "_"):
+            raise ValueError(f"line {line}: unexpected {token!r}")
+        else:
+            self.calls.append((self.emit(OP_CALL), token, line))
+
+
+def _check_budget(executed: int, max_instructions: int, deadline: float | None) -> int:
+    """
+    Raise if a program has used up its budget; otherwise return the next checkpoint.
+
+    Raises:
+        StepLimitError: If `executed` has reached `max_instructions`
+        TimeoutError: If the deadline has passed
+    """
+    if executed >= max_instructions:
+        raise StepLimitError(f"Exceeded {max_instructions:,} instructions")
+    if deadline is not None and time.perf_counter() > deadline:
+        raise TimeoutError(f"Ran out of time after {executed:,} instructions")
+    return min(max_instructions, executed + DEADLINE_CHECK_MASK + 1)
+
+
+class CompiledProgram:
+    """
+    A Karel program compiled to a flat array of (opcode, argument) pairs.
+
+    Programs are plain data, so they pickle cheaply to worker processes and
+    can be run on any number of worlds. Calling one with a world runs it,
+    which lets a compiled program be passed straight to run_batch.
+    """
+
+    __slots__ = ("code", "functions")
+
+    def __init__(self, code: array, functions: dict[str, int]) -> None:
+        self.code = code
+        self.functions = functions
+
+    def __len__(self) -> int:
+        return len(self.code) // 2
+
+    def __call__(self, world: KarelWorld) -> None:
+        if isinstance(world, BudgetedWorld):
+            self.execute(world, world.max_steps - world.steps, world.deadline)
+        else:
+            self.execute(world)
+
+    def execute(  # noqa: PLR0912, PLR0915 - one flat dispatch loop, so no function call per instruction
+        self, world: KarelWorld, max_instructions: int = DEFAULT_MAX_INSTRUCTIONS, deadline: float | None = None
+    ) -> ExecutionStats:
+        """
+        Run the program on `world`.
+
+        The loop works on local copies of the grid, position and direction and
+        branches on integer opcodes, so no Python function is called per
+        instruction. Karel's final position and direction are written back,
+        and on a BudgetedWorld the instructions executed are charged to its
+        step count, even when the run is cut short. A TracedWorld is instead driven through
+        its own primitives, so that its trace records every action.
+
+        Args:
+            world: World to run in; its grid is updated in place
+            max_instructions: Instructions allowed before giving up
+            deadline: time.perf_counter() value to stop at, checked every 1024 instructions
+
+        Returns:
+            ExecutionStats with instructions executed and primitive actions taken
+
+        Raises:
+            StepLimitError: If the program runs more than `max_instructions`
+            TimeoutError: If the deadline passes
+            RecursionError: If calls nest deeper than MAX_CALL_DEPTH
+            ValueError: If a cell would exceed MAX_BEEPERS
+        """
+        if isinstance(world, TracedWorld):
+            return self._execute_on_primitives(world, max_instructions, deadline)
+        # Plain lists index faster than array; opcodes are bound to locals to skip global lookups
+        ops, arguments = self.code[::2].tolist(), self.code[1::2].tolist()
+        cells, offsets, spatial, dirty = world.cells, world.offsets, world.spatial, world.dirty
+        position, direction = world.position, world.direction
+        returns: list[int] = []
+        counters: list[int] = []
+        pc = executed = actions = 0
+        # Budgets are checked when `executed` reaches the checkpoint, and only at jumps and
+        # calls: every loop passes through one, and straight-line code is bounded by its length
+        checkpoint = min(max_instructions, DEADLINE_CHECK_MASK + 1)
+        branch, move, turn_left, jump = OP_BRANCH, OP_MOVE, OP_TURN_LEFT, OP_JUMP
+
+        try:
+            while True:
+                op = ops[pc]
+                pc += 1
+                executed += 1
+                if op >= branch:
+                    condition = op & 7
+                    if condition < CONDITION_BEEPERS:
+                        target = position + offsets[(direction + SENSOR_TURNS[condition]) & 3]
+                        holds = cells[target] != WALL_CELL
+                    elif condition == CONDITION_BEEPERS:
+                        holds = cells[position] > 0
+                    else:
+                        holds = direction == condition - CONDITION_FACING_NORTH
+                    if holds == bool(op & NEGATE_FLAG):
+                        pc = arguments[pc - 1]
+                elif op == move:
+                    actions += 1
+                    target = position + offsets[direction]
+                    if cells[target] != WALL_CELL:
+                        position = target
+                elif op == turn_left:
+                    actions += 1
+                    direction = (direction + 3) & 3
+                elif op == jump:
+                    if executed >= checkpoint:
+                        checkpoint = _check_budget(executed, max_instructions, deadline)
+                    pc = arguments[pc - 1]
+                elif op == OP_TURN_RIGHT:
+                    actions += 1
+                    direction = (direction + 1) & 3
+                elif op == OP_PICK:
+                    actions += 1
+                    if cells[position]:
+                        cells[position] -= 1
+                        if spatial is not None:
+                            spatial.note_beepers(position, cells[position] + 1, cells[position])
+                        if dirty is not None:
+                            dirty.add(position)
+                elif op == OP_PUT:
+                    actions += 1
+                    if cells[position] >= MAX_BEEPERS:
+                        raise ValueError(f"A cell can hold at most {MAX_BEEPERS} beepers")
+                    cells[position] += 1
+                    if spatial is not None:
+                        spatial.note_beepers(position, cells[position] - 1, cells[position])
+                    if dirty is not None:
+                        dirty.add(position)
+                elif op == OP_LOOP:
+                    if counters[-1]:
+                        counters[-1] -= 1
+                    else:
+                        counters.pop()
+                        pc = arguments[pc - 1]
+                elif op == OP_COUNT:
+                    counters.append(arguments[pc - 1])
+                elif op == OP_CALL:
+                    if executed >= checkpoint:
+                        checkpoint = _check_budget(executed, max_instructions, deadline)
+                    if len(returns) >= MAX_CALL_DEPTH:
+                        raise RecursionError(f"Calls nested deeper than {MAX_CALL_DEPTH}")
+                    returns.append(pc)
+                    pc = arguments[pc - 1]
+                elif op == OP_RETURN:
+                    pc = returns.pop()
+                else:  # OP_HALT
+                    return ExecutionStats(executed, actions)
+        finally:
+            world.position, world.direction = position, direction
+            if isinstance(world, BudgetedWorld):
+                # Straight-line code between budget checks can overshoot; the budget is charged in full
+                world.steps = min(world.steps + executed, world.max_steps)
+
+    def _execute_on_primitives(  # noqa: PLR0912 - the same flat dispatch as execute
+        self, world: KarelWorld, max_instructions: int, deadline: float | None
+    ) -> ExecutionStats:
+        """Run the program by calling the world's primitive methods, one call per action or sensor."""
+        ops, arguments = self.code[::2].tolist(), self.code[1::2].tolist()
+        primitives: dict[int, Callable[[], object]] = {
+            OP_MOVE: world.move,
+            OP_TURN_LEFT: world.turn_left,
+            OP_TURN_RIGHT: world.turn_right,
+            OP_PICK: world.pick_beeper,
+            OP_PUT: world.put_beeper,
+        }
+        sensors = (
+            world.front_is_clear,
+            world.left_is_clear,
+            world.right_is_clear,
+            world.beepers_present,
+            world.facing_north,
+            world.facing_east,
+            world.facing_south,
+            world.facing_west,
+        )
+        returns: list[int] = []
+        counters: list[int] = []
+        pc = executed = actions = 0
+        checkpoint = min(max_instructions, DEADLINE_CHECK_MASK + 1)
+
+        while True:
+            op, argument = ops[pc], arguments[pc]
+            pc += 1
+            executed += 1
+            if op >= OP_BRANCH:
+                if sensors[op & 7]() == bool(op & NEGATE_FLAG):
+                    pc = argument
+            elif op in primitives:
+                actions += 1
+                primitives[op]()
+            elif op == OP_LOOP:
+                if counters[-1]:
+                    counters[-1] -= 1
+                else:
+                    counters.pop()
+                    pc = argument
+            elif op == OP_COUNT:
+                counters.append(argument)
+            elif op in (OP_JUMP, OP_CALL):
+                if executed >= checkpoint:
+                    checkpoint = _check_budget(executed, max_instructions, deadline)
+                if op == OP_CALL:
+                    if len(returns) >= MAX_CALL_DEPTH:
+                        raise RecursionError(f"Calls nested deeper than {MAX_CALL_DEPTH}")
+                    returns.append(pc)
+                pc = argument
+            elif op == OP_RETURN:
+                pc = returns.pop()
+            else:  # OP_HALT
+                return ExecutionStats(executed, actions)
+
+    def disassemble(self) -> str:
+        """Readable listing of the instructions, one per line."""
+        names = {value: name.removeprefix("OP_") for name, value in globals().items() if name.startswith("OP_")}
+        conditions = {code: name for name, code in KAREL_CONDITIONS.items()}
+        lines = []
+        for pc in range(len(self)):
+            op, argument = self.code[2 * pc], self.code[2 * pc + 1]
+            if op >= OP_BRANCH:
+                negate = "not " if op & NEGATE_FLAG else ""
+                lines.append(f"{pc:>5}  BRANCH unless {negate}{conditions[op & 7]} -> {argument}")
+            elif op in (OP_JUMP, OP_LOOP, OP_CALL, OP_COUNT):
+                lines.append(f"{pc:>5}  {names[op]} {argument}")
+            else:
+                lines.append(f"{pc:>5}  {names[op]}")
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=PROGRAM_CACHE_SIZE)
+def compile_program(source: str) -> CompiledProgram:
+    """
+    Compile Karel source text; identical sources share one cached program.
+
+    The language::
+
+        define turn_around { turn_left turn_left }   # new commands, callable before or after
+        move  turn_left  turn_right  pick_beeper  put_beeper
+        if [not] <condition> { ... } [else { ... }]
+        while [not] <condition> { ... }
+        repeat <number> { ... }                      # number at most MAX_REPEAT
+
+    Conditions: front_is_clear, left_is_clear, right_is_clear,
+    beepers_present, facing_north, facing_east, facing_south, facing_west.
+
+    Raises:
+        ValueError: On a syntax error, with the line number
+    """
+    return _Compiler(source).compile()
+
+
+# --- Save / Load ---
+def save_world(world: KarelWorld, path: Path) -> int:
+    """
+    Write `world` as a binary world file.
+
+    The file is a fixed WORLD_HEADER followed by the padded grid byte for
+    byte, so load_world can map it straight back into memory.
+
+    Returns:
+        Bytes written
+    """
+    header = WORLD_HEADER.pack(
+        WORLD_MAGIC,
+        WORLD_FORMAT_VERSION,
+        WORLD_HEADER.size,
+        world.width,
+        world.height,
+        world.position,
+        world.direction,
+    )
+    with path.open("wb") as handle:
+        handle.write(header)
+        handle.write(world.cells)
+    return WORLD_HEADER.size + len(world.cells)
+
+
+def load_world(path: Path) -> KarelWorld:
+    """
+    Load a binary world file without copying or parsing its grid.
+
+    The file is memory-mapped copy-on-write and the world's grid is a view
+    into the mapping, so loading costs the same for any size. Pages are read
+    lazily, and edits to the world never reach the file.
+
+    Raises:
+        ValueError: If the file is not a world file, has an unknown version,
+            is truncated, or its border or Karel state is invalid
+    """
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size < WORLD_HEADER.size:
+            raise ValueError(f"{path} is too small to be a Karel world file")
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, header_size, width, height, position, direction = WORLD_HEADER.unpack_from(mapped)
+    if magic != WORLD_MAGIC:
+        raise ValueError(f"{path} is not a Karel world file")
+    if version != WORLD_FORMAT_VERSION:
+        raise ValueError(f"{path} uses world format version {version}; expected {WORLD_FORMAT_VERSION}")
+    stride = width + 2
+    if width < 1 or height < 1 or size != header_size + stride * (height + 2):
+        raise ValueError(f"{path} is truncated or has a damaged header")
+
+    cells = memoryview(mapped)[header_size:]
+    # Primitives skip bounds checks because of the wall ring, so a damaged ring must not load
+    ring = (cells[:stride], cells[-stride:], cells[stride::stride], cells[stride - 1 :: stride])
+    if any(part.tobytes().strip(bytes([WALL_CELL])) for part in ring):
+        raise ValueError(f"{path} has a damaged border")
+    if not stride < position < len(cells) - stride or cells[position] == WALL_CELL or direction > WEST:
+        raise ValueError(f"{path} has an invalid Karel position or direction")
+    return _world_from_grid(width, height, cells, position, direction)
+
+
+def world_to_text(world: KarelWorld) -> str:
+    """
+    Human-readable world: a `karel X Y DIRECTION` line, then one line per row, north first.
+
+    Cells are separated by spaces: "#" for a wall, "." for an empty cell and
+    the beeper count otherwise.
+    """
+    cells, stride = world.cells, world.stride
+    x, y = world.karel_position
+    lines = [f"karel {x} {y} {tuple(TEXT_DIRECTIONS)[world.direction]}"]
+    for row in range(world.height, 0, -1):
+        start = row * stride + 1
+        lines.append(
+            " ".join(
+                "#" if value == WALL_CELL else str(value) if value else "."
+                for value in cells[start : start + world.width]
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def world_from_text(text: str) -> KarelWorld:
+    """
+    Build a world from world_to_text output or a hand-drawn grid.
+
+    Rows may separate cells with spaces, or use one character per cell
+    (then beeper counts are single digits). The `karel` line is optional;
+    without it Karel starts at (0, 0) facing north.
+
+    Raises:
+        ValueError: On ragged rows, unknown symbols, an invalid Karel line or a wall on Karel's cell
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    karel = lines.pop(0).split() if lines and lines[0].startswith("karel") else None
+    rows = [line.split() if " " in line else list(line) for line in lines]
+    if not rows or any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError("World rows must all have the same number of cells")
+
+    world = KarelWorld(len(rows[0]), len(rows))
+    # Karel goes in first, so walls elsewhere (including at the default (0, 0)) can be built
+    if karel is not None:
+        try:
+            _, karel_x, karel_y, heading = karel
+            world.place_karel(int(karel_x), int(karel_y), TEXT_DIRECTIONS[heading])
+        except (ValueError, KeyError):
+            raise ValueError(f"Expected 'karel X Y DIRECTION' inside the world, got {' '.join(karel)!r}") from None
+
+    for row_number, row in enumerate(rows):
+        y = world.height - 1 - row_number
+        for x, symbol in enumerate(row):
+            if symbol == "#":
+                world.add_wall(x, y)
+            elif symbol.isdigit():
+                world.set_beepers(x, y, int(symbol))
+            elif symbol != ".":
+                raise ValueError(f"Unknown cell symbol {symbol!r} at ({x}, {y})")
+    return world
+
+
+# --- Step Tracing ---
+class TraceCheckpoint(NamedTuple):
+    """Karel's state at a checkpoint, and the net beeper change per cell since the previous one."""
+
+    position: int
+    direction: int
+    beeper_changes: dict[int, int]
+
+
+class ExecutionTrace:
+    """
+    Every primitive action of one run, as one-byte delta records.
+
+    Records go into a preallocated bytearray that doubles when full. Every
+    `checkpoint_interval` steps a checkpoint stores Karel's position and
+    direction plus the net beeper change of that interval. A replay can
+    then jump over whole intervals instead of stepping through them.
+    """
+
+    __slots__ = (
+        "checkpoint_interval",
+        "checkpoints",
+        "height",
+        "initial_cells",
+        "length",
+        "pending",
+        "records",
+        "width",
+    )
+
+    def __init__(
+        self,
+        world: KarelWorld,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> None:
+        if capacity < 1 or checkpoint_interval < 1:
+            raise ValueError("capacity and checkpoint_interval must be positive")
+        self.width, self.height = world.width, world.height
+        self.initial_cells = bytes(world.cells)
+        self.records = bytearray(capacity)
+        self.length = 0
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = [TraceCheckpoint(world.position, world.direction, {})]
+        self.pending: dict[int, int] = {}  # Beeper changes since the last checkpoint
+
+    def __len__(self) -> int:
+        return self.length
+
+    def record(self, code: int, world: KarelWorld) -> None:
+        """Append one step; `world` is the state after it."""
+        if self.length == len(self.records):
+            self.records.extend(bytes(len(self.records)))
+        self.records[self.length] = code
+        self.length += 1
+
+        if code in (TRACE_PUT, TRACE_PICK):
+            change = self.pending.get(world.position, 0) + (1 if code == TRACE_PUT else -1)
+            if change:
+                self.pending[world.position] = change
+            else:
+                del self.pending[world.position]
+        if not self.length % self.checkpoint_interval:
+            self.checkpoints.append(TraceCheckpoint(world.position, world.direction, self.pending))
+            self.pending = {}
+
+    def replay(self) -> "TraceReplay":
+        """A replay positioned at step 0."""
+        return TraceReplay(self)
+
+
+class TracedWorld(KarelWorld):
+    """A private copy of a world that records every primitive action into an ExecutionTrace."""
+
+    __slots__ = ("trace",)
+
+    def __init__(self, world: KarelWorld, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> None:
+        self.width, self.height, self.stride, self.offsets = world.width, world.height, world.stride, world.offsets
+        self.cells = bytearray(world.cells)
+        self.position, self.direction = world.position, world.direction
+        self.distance_fields = world.distance_fields
+        self.spatial = None
+        self.dirty = None
+        self.trace = ExecutionTrace(world, checkpoint_interval=checkpoint_interval)
+
+    def move(self) -> bool:
+        moved = super().move()
+        self.trace.record(TRACE_MOVE if moved else TRACE_MOVE_BLOCKED, self)
+        return moved
+
+    def turn_left(self) -> None:
+        super().turn_left()
+        self.trace.record(TRACE_TURN_LEFT, self)
+
+    def turn_right(self) -> None:
+        super().turn_right()
+        self.trace.record(TRACE_TURN_RIGHT, self)
+
+    def put_beeper(self) -> None:
+        super().put_beeper()
+        self.trace.record(TRACE_PUT, self)
+
+    def pick_beeper(self) -> bool:
+        picked = super().pick_beeper()
+        self.trace.record(TRACE_PICK if picked else TRACE_PICK_EMPTY, self)
+        return picked
+
+
+class TraceReplay:
+    """
+    Seekable playback of an ExecutionTrace on its own copy of the starting world.
+
+    Stepping applies or undoes one delta record. A long seek walks at most one
+    checkpoint interval at each end and jumps over the intervals in between
+    using their net beeper changes, so it costs O(distance / interval) dict
+    merges plus O(interval) single steps rather than O(distance) steps.
+    """
+
+    __slots__ = ("step", "trace", "world")
+
+    def __init__(self, trace: ExecutionTrace) -> None:
+        start = trace.checkpoints[0]
+        self.trace = trace
+        self.world = _world_from_grid(
+            trace.width, trace.height, bytearray(trace.initial_cells), start.position, start.direction
+        )
+        self.step = 0
+
+    def forward(self, steps: int = 1) -> KarelWorld:
+        """Apply the next `steps` records (fewer at the end of the trace)."""
+        world, records = self.world, self.trace.records
+        cells, offsets, dirty = world.cells, world.offsets, world.dirty
+        world.spatial = None  # Replayed records write the grid directly
+        stop = min(self.step + steps, self.trace.length)
+        for code in records[self.step : stop]:
+            if code == TRACE_MOVE:
+                world.position += offsets[world.direction]
+            elif code == TRACE_TURN_LEFT:
+                world.direction = (world.direction + 3) & 3
+            elif code == TRACE_TURN_RIGHT:
+                world.direction = (world.direction + 1) & 3
+            elif code == TRACE_PUT:
+                cells[world.position] += 1
+                if dirty is not None:
+                    dirty.add(world.position)
+            elif code == TRACE_PICK:
+                cells[world.position] -= 1
+                if dirty is not None:
+                    dirty.add(world.position)
+        self.step = stop
+        return world
+
+    def backward(self, steps: int = 1) -> KarelWorld:
+        """Undo the previous `steps` records (fewer at the start of the trace)."""
+        world, records = self.world, self.trace.records
+        cells, offsets, dirty = world.cells, world.offsets, world.dirty
+        world.spatial = None  # Replayed records write the grid directly
+        stop = max(self.step - steps, 0)
+        for code in reversed(records[stop : self.step]):
+            if code == TRACE_MOVE:
+                world.position -= offsets[world.direction]
+            elif code == TRACE_TURN_LEFT:
+                world.direction = (world.direction + 1) & 3
+            elif code == TRACE_TURN_RIGHT:
+                world.direction = (world.direction + 3) & 3
+            elif code == TRACE_PUT:
+                cells[world.position] -= 1
+                if dirty is not None:
+                    dirty.add(world.position)
+            elif code == TRACE_PICK:
+                cells[world.position] += 1
+                if dirty is not None:
+                    dirty.add(world.position)
+        self.step = stop
+        return world
+
+    def seek(self, step: int) -> KarelWorld:
+        """
+        Put the replay at `step` (0 is the starting world, len(trace) the final one).
+
+        Raises:
+            ValueError: If `step` is outside the trace
+        """
+        trace = self.trace
+        if not 0 <= step <= trace.length:
+            raise ValueError(f"Step {step} is outside the trace (0-{trace.length})")
+        interval = trace.checkpoint_interval
+        if abs(step - self.step) <= interval:
+            return self.forward(step - self.step) if step >= self.step else self.backward(self.step - step)
+
+        # Walk to a checkpoint, jump interval by interval to the one nearest `step`, then walk again
+        world, cells = self.world, self.world.cells
+        if step > self.step:
+            here = -(-self.step // interval)
+            there = step // interval
+            self.forward(here * interval - self.step)
+            for checkpoint in trace.checkpoints[here + 1 : there + 1]:
+                for index, change in checkpoint.beeper_changes.items():
+                    cells[index] += change
+                if world.dirty is not None:
+                    world.dirty.update(checkpoint.beeper_changes)
+        else:
+            here = self.step // interval
+            there = -(-step // interval)
+            self.backward(self.step - here * interval)
+            for checkpoint in reversed(trace.checkpoints[there + 1 : here + 1]):
+                for index, change in checkpoint.beeper_changes.items():
+                    cells[index] -= change
+                if world.dirty is not None:
+                    world.dirty.update(checkpoint.beeper_changes)
+
+        target = trace.checkpoints[there]
+        world.position, world.direction = target.position, target.direction
+        self.step = there * interval
+        return self.forward(step - self.step) if step >= self.step else self.backward(self.step - step)
+
+
+# --- Maze Solving ---
+def _breadth_first(cells: Grid, offsets: tuple[int, int, int, int], source: int) -> array:
+    """
+    Distances in moves from `source` to every cell, UNREACHABLE for walls and cut-off cells.
+
+    Walls are pre-marked as seen, and the border ring keeps every neighbour
+    lookup in range, so the inner loop is four byte checks per cell.
+    """
+    seen = bytearray(cells).translate(bytes(WALL_CELL) + b"\x01")
+    distances = array("i", [UNREACHABLE]) * len(cells)
+    seen[source] = 1
+    distances[source] = 0
+    north, east, south, west = offsets
+    frontier = [source]
+    level = 0
+    while frontier:
+        level += 1
+        following: list[int] = []
+        push = following.append
+        for cell in frontier:
+            for neighbour in (cell + north, cell + east, cell + south, cell + west):
+                if not seen[neighbour]:
+                    seen[neighbour] = 1
+                    distances[neighbour] = level
+                    push(neighbour)
+        frontier = following
+    return distances
+
+
+def distance_field(world: KarelWorld, goal: tuple[int, int]) -> array:
+    """
+    Moves needed to reach `goal` from every cell, computed once per goal and wall layout.
+
+    Fields are cached on the world (the DISTANCE_CACHE_SIZE most recent goals)
+    and dropped whenever add_wall or remove_wall changes the layout.
+
+    Returns:
+        array of int, indexed like world.cells, with UNREACHABLE for walls and cut-off cells
+
+    Raises:
+        ValueError: If the goal is outside the world or inside a wall
+    """
+    index = world.index(*goal)
+    if world.cells[index] == WALL_CELL:
+        raise ValueError(f"Goal {goal} is inside a wall")
+
+    fields = world.distance_fields
+    field = fields.get(index)
+    if field is None:
+        field = fields[index] = _breadth_first(world.cells, world.offsets, index)
+        if len(fields) > DISTANCE_CACHE_SIZE:
+            fields.popitem(last=False)
+    else:
+        fields.move_to_end(index)
+    return field
+
+
+def _path_down_field(world: KarelWorld, field: array, start: int) -> list[int]:
+    """Walk downhill through a distance field, preferring to keep Karel's heading to save turns."""
+    path = [start]
+    position, direction = start, world.direction
+    offsets = world.offsets
+    while field[position]:
+        target = field[position] - 1
+        for turn in (0, 3, 1, 2):
+            heading = (direction + turn) & 3
+            if field[position + offsets[heading]] == target:
+                position += offsets[heading]
+                direction = heading
+                break
+        path.append(position)
+    return path
+
+
+def _a_star(world: KarelWorld, start: int, goal: int) -> list[int] | None:
+    """Single-query A* with the Manhattan heuristic; explores far fewer cells than a full field."""
+    cells, offsets, stride = world.cells, world.offsets, world.stride
+    goal_row, goal_column = divmod(goal, stride)
+
+    def heuristic(cell: int) -> int:
+        row, column = divmod(cell, stride)
+        return abs(row - goal_row) + abs(column - goal_column)
+
+    came_from = {start: start}
+    cost = {start: 0}
+    # (estimate, heuristic, cell): ties go to the cell closest to the goal
+    frontier = [(heuristic(start), heuristic(start), start)]
+    while frontier:
+        _, _, cell = heapq.heappop(frontier)
+        if cell == goal:
+            path = [cell]
+            while cell != start:
+                cell = came_from[cell]
+                path.append(cell)
+            return path[::-1]
+        step_cost = cost[cell] + 1
+        for offset in offsets:
+            neighbour = cell + offset
+            if cells[neighbour] != WALL_CELL and step_cost < cost.get(neighbour, step_cost + 1):
+                cost[neighbour] = step_cost
+                came_from[neighbour] = cell
+                estimate = heuristic(neighbour)
+                heapq.heappush(frontier, (step_cost + estimate, estimate, neighbour))
+    return None
+
+
+def shortest_path(world: KarelWorld, goal: tuple[int, int], method: str = "field") -> list[tuple[int, int]]:
+    """
+    Shortest route from Karel's position to `goal`, as (x, y) cells including both ends.
+
+    Args:
+        world: World to search; Karel's position is the start
+        goal: Target cell
+        method: "field" walks the cached distance field, which makes repeated
+            queries to the same goal O(path length); "astar" runs a one-off A*
+            search that leaves no cache behind
+
+    Raises:
+        ValueError: If the goal is unreachable, inside a wall or the method is unknown
+    """
+    if method == "field":
+        field = distance_field(world, goal)
+        if field[world.position] == UNREACHABLE:
+            raise ValueError(f"No route from {world.karel_position} to {goal}")
+        path = _path_down_field(world, field, world.position)
+    elif method == "astar":
+        goal_index = world.index(*goal)
+        if world.cells[goal_index] == WALL_CELL:
+            raise ValueError(f"Goal {goal} is inside a wall")
+        found = _a_star(world, world.position, goal_index)
+        if found is None:
+            raise ValueError(f"No route from {world.karel_position} to {goal}")
+        path = found
+    else:
+        raise ValueError(f"Unknown method {method!r}; use 'field' or 'astar'")
+    return [world.coordinates(index) for index in path]
+
+
+def path_to_actions(world: KarelWorld, path: Sequence[tuple[int, int]], direction: int | None = None) -> list[str]:
+    """
+    Primitive commands that walk Karel along `path`.
+
+    Turns take the short way round; a U-turn is two left turns.
+
+    Args:
+        world: World the path belongs to
+        path: Adjacent (x, y) cells, starting at Karel's position
+        direction: Heading at the start of the path (default: Karel's current heading)
+
+    Returns:
+        Command names ("move", "turn_left", "turn_right"); joined with spaces they are a Karel program
+    """
+    heading = world.direction if direction is None else direction
+    offsets = world.offsets
+    actions = []
+    for here, there in pairwise(path):
+        step = world.index(*there) - world.index(*here)
+        if step not in offsets:
+            raise ValueError(f"{here} and {there} are not neighbouring cells")
+        wanted = offsets.index(step)
+        turn = (wanted - heading) & 3
+        if turn == 1:
+            actions.append("turn_right")
+        elif turn:
+            actions += ["turn_left"] * (4 - turn)
+        actions.append("move")
+        heading = wanted
+    return actions
+
+
+def navigate_to(world: KarelWorld, goal: tuple[int, int], method: str = "field") -> int:
+    """
+    Drive Karel to `goal` along a shortest route using its primitives.
+
+    Returns:
+        Number of primitive actions taken
+
+    Raises:
+        ValueError: If the goal cannot be reached
+    """
+    actions = path_to_actions(world, shortest_path(world, goal, method))
+    for action in actions:
+        getattr(world, action)()
+    return len(actions)
+
+
+# --- Harvest Planning ---
+class HarvestPlan(NamedTuple):
+    """A closed tour that picks up every reachable beeper and brings Karel back to its start."""
+
+    actions: list[str]
+    beepers: int
+    moves: int
+    unreachable: list[tuple[int, int]]
+    seconds: float  # Planning time
+
+    @property
+    def steps(self) -> int:
+        return len(self.actions)
+
+
+class _TourDistances:
+    """Exact walking distances between tour sites, cached; pairs BFS did not reach are measured on demand."""
+
+    __slots__ = ("known", "site_cells", "world")
+
+    def __init__(self, world: KarelWorld, site_cells: list[int]) -> None:
+        self.world = world
+        self.site_cells = site_cells
+        self.known: dict[tuple[int, int], int] = {}
+
+    def __call__(self, a: int, b: int) -> int:
+        key = (a, b) if a < b else (b, a)
+        distance = self.known.get(key)
+        if distance is None:
+            distance = self.known[key] = len(self.path(a, b)) - 1
+        return distance
+
+    def path(self, a: int, b: int) -> list[int]:
+        """A shortest route between two sites: an L-shaped one when no wall is in the way, else A*."""
+        world, start, goal = self.world, self.site_cells[a], self.site_cells[b]
+        cells, stride = world.cells, world.stride
+        start_row, goal_row = start // stride, goal // stride
+        across = 1 if goal % stride >= start % stride else -1
+        up = stride if goal_row >= start_row else -stride
+        for corner, first, second in (
+            (start + (goal_row - start_row) * stride, up, across),
+            (goal - (goal_row - start_row) * stride, across, up),
+        ):
+            path = [*range(start, corner, first), *range(corner, goal, second), goal]
+            if all(cells[cell] != WALL_CELL for cell in path):
+                return path
+        found = _a_star(world, start, goal)
+        if found is None:
+            raise ValueError(f"No route from {world.coordinates(start)} to {world.coordinates(goal)}")
+        return found
+
+
+def _neighbour_lists(
+    world: KarelWorld, site_cells: list[int], distances: _TourDistances
+) -> list[list[tuple[int, int]]]:
+    """
+    The HARVEST_NEIGHBOURS closest sites to every site, as (distance, site) pairs, nearest first.
+
+    Each list comes from a BFS that stops once it has found enough sites, so
+    the total work grows with the number of beepers, not with the world size.
+    Marks hold the number of the search that last reached a cell, and walls a
+    number no search reaches, so one comparison skips both and nothing is
+    cleared between searches.
+    """
+    cells = world.cells
+    north, east, south, west = world.offsets
+    site_at = array("i", [-1]) * len(cells)
+    for site, cell in enumerate(site_cells):
+        site_at[cell] = site
+    marks = array("i", (len(site_cells) if value == WALL_CELL else -1 for value in cells))
+    known = distances.known
+
+    def search(source: int) -> list[tuple[int, int]]:
+        marks[site_cells[source]] = source
+        frontier = [site_cells[source]]
+        found: list[tuple[int, int]] = []
+        level = 0
+        while frontier:
+            level += 1
+            following: list[int] = []
+            push = following.append
+            for cell in frontier:
+                for neighbour in (cell + north, cell + east, cell + south, cell + west):
+                    if marks[neighbour] < source:
+                        marks[neighbour] = source
+                        push(neighbour)
+                        site = site_at[neighbour]
+                        if site >= 0:
+                            found.append((level, site))
+                            known[(source, site) if source < site else (site, source)] = level
+                            if len(found) == HARVEST_NEIGHBOURS:
+                                return found
+            frontier = following
+        return found
+
+    return [search(source) for source in range(len(site_cells))]
+
+
+def _bucket_ring(column: int, row: int, radius: int) -> Iterator[tuple[int, int]]:
+    """Buckets on the square ring `radius` buckets away from (column, row)."""
+    if not radius:
+        yield column, row
+        return
+    for dx in range(-radius, radius + 1):
+        yield column + dx, row - radius
+        yield column + dx, row + radius
+    for dy in range(1 - radius, radius):
+        yield column - radius, row + dy
+        yield column + radius, row + dy
+
+
+def _nearest_neighbour_tour(
+    world: KarelWorld, site_cells: list[int], neighbours: list[list[tuple[int, int]]]
+) -> list[int]:
+    """
+    Greedy tour from site 0: always walk to the closest unvisited site.
+
+    The neighbour lists answer almost every step. When all of a site's
+    neighbours are taken, the closest stray site by straight-line distance is
+    looked up in HARVEST_BUCKET-sized buckets, searching outward ring by ring.
+    """
+    stride = world.stride
+    buckets: dict[tuple[int, int], set[int]] = {}
+    for site, cell in enumerate(site_cells[1:], start=1):
+        row, column = divmod(cell, stride)
+        buckets.setdefault((column // HARVEST_BUCKET, row // HARVEST_BUCKET), set()).add(site)
+    max_radius = max(world.width, world.height) // HARVEST_BUCKET + 1
+
+    def closest_stray(cell: int) -> int:
+        row, column = divmod(cell, stride)
+        candidates: list[int] = []
+        for radius in range(max_radius + 1):
+            ring = [
+                bucket
+                for key in _bucket_ring(column // HARVEST_BUCKET, row // HARVEST_BUCKET, radius)
+                if (bucket := buckets.get(key))
+            ]
+            if candidates:  # One ring further can still hold a closer site
+                candidates += [site for bucket in ring for site in bucket]
+                break
+            candidates = [site for bucket in ring for site in bucket]
+        return min(
+            candidates, key=lambda site: abs(site_cells[site] // stride - row) + abs(site_cells[site] % stride - column)
+        )
+
+    visited = bytearray(len(site_cells))
+    visited[0] = 1
+    tour = [0]
+    current = 0
+    for _ in range(len(site_cells) - 1):
+        following = next((site for _, site in neighbours[current] if not visited[site]), None)
+        if following is None:
+            following = closest_stray(site_cells[current])
+        row, column = divmod(site_cells[following], stride)
+        key = (column // HARVEST_BUCKET, row // HARVEST_BUCKET)
+        buckets[key].discard(following)
+        if not buckets[key]:
+            del buckets[key]
+        visited[following] = 1
+        tour.append(following)
+        current = following
+    return tour
+
+
+def _reverse_segment(tour: list[int], where: array, first: int, last: int) -> bool:
+    """
+    Reverse the cyclic tour segment first..last, or the complementary one when that is shorter.
+
+    Both give the same closed tour. Returns False, leaving the tour alone, when
+    even the shorter side is longer than MAX_REVERSAL.
+    """
+    size = len(tour)
+    length = (last - first) % size + 1
+    if size - length < length:
+        first, last, length = last + 1, first - 1, size - length
+    if length > MAX_REVERSAL:
+        return False
+    first %= size
+    if first + length <= size:
+        tour[first : first + length] = tour[first + length - 1 : first - 1 if first else None : -1]
+        for position, site in enumerate(tour[first : first + length], first):
+            where[site] = position
+        return True
+    # The segment wraps past the end of the list
+    last %= size
+    for _ in range(length // 2):
+        tour[first], tour[last] = tour[last], tour[first]
+        where[tour[first]], where[tour[last]] = first, last
+        first = (first + 1) % size
+        last = (last - 1) % size
+    return True
+
+
+def _two_opt(tour: list[int], neighbours: list[list[tuple[int, int]]], distance: _TourDistances) -> int:
+    """
+    Improve a closed tour in place with 2-opt moves; returns the number of moves saved.
+
+    Only neighbour-list candidates are tried, and only sites next to a changed
+    edge are looked at again, so each pass costs far less than the O(n²) of
+    trying every pair of edges.
+    """
+    size = len(tour)
+    where = array("i", [0]) * size
+    for position, site in enumerate(tour):
+        where[site] = position
+    queue = deque(tour)
+    queued = bytearray(b"\x01") * size
+    saved = 0
+    while queue:
+        a = queue.popleft()
+        queued[a] = 0
+        i = where[a]
+        for step in (1, -1):  # The edge to a's successor, then to its predecessor
+            b = tour[(i + step) % size]
+            ab = distance(a, b)
+            for ac, c in neighbours[a]:
+                if ac >= ab:
+                    break
+                j = where[c]
+                d = tour[(j + step) % size]
+                if c == b or d == a:
+                    continue
+                gain = ab + distance(c, d) - ac - distance(b, d)
+                # Reconnect as a-c and b-d by reversing the stretch from b to c
+                if gain > 0 and _reverse_segment(tour, where, *((i + 1, j) if step == 1 else (j, i - 1))):
+                    saved += gain
+                    for site in (a, b, c, d):
+                        if not queued[site]:
+                            queued[site] = 1
+                            queue.append(site)
+                    break
+            else:
+                continue
+            break
+    return saved
+
+
+def plan_harvest(world: KarelWorld, improve: bool = True) -> HarvestPlan:
+    """
+    Plan a short closed tour that collects every beeper reachable from Karel.
+
+    Beepers come from `world.beepers`. BFS finds each beeper's closest
+    neighbours by walking distance. A nearest-neighbour tour is built from
+    them and then shortened with 2-opt. Distances that BFS did not find are
+    measured with A* and cached. The world itself is not changed.
+
+    Args:
+        world: World to harvest; Karel's position is the start and end of the tour
+        improve: Run 2-opt on the greedy tour
+
+    Returns:
+        The plan: primitive commands, beepers collected, moves walked,
+        beepers that cannot be reached and the planning time
+    """
+    started = time.perf_counter()
+    reach = distance_field(world, world.karel_position)
+    site_cells = [world.position]
+    counts = [0]
+    unreachable = []
+    for (x, y), count in world.beepers.items():
+        cell = world.index(x, y)
+        if reach[cell] == UNREACHABLE:
+            unreachable.append((x, y))
+        elif cell != world.position:
+            site_cells.append(cell)
+            counts.append(count)
+
+    distances = _TourDistances(world, site_cells)
+    neighbours = _neighbour_lists(world, site_cells, distances)
+    tour = _nearest_neighbour_tour(world, site_cells, neighbours)
+    if improve:
+        _two_opt(tour, neighbours, distances)
+    start = tour.index(0)
+    tour = [*tour[start:], *tour[:start], 0]
+
+    # Beepers under Karel are picked before setting off
+    counts[0] = world.cells[world.position]
+    actions = ["pick_beeper"] * counts[0]
+    heading, moves = world.direction, 0
+    for a, b in pairwise(tour):
+        if a == b:
+            continue
+        path = distances.path(a, b)
+        moves += len(path) - 1
+        actions += path_to_actions(world, [world.coordinates(cell) for cell in path], heading)
+        heading = world.offsets.index(path[-1] - path[-2])
+        if b:
+            actions += ["pick_beeper"] * counts[b]
+    return HarvestPlan(actions, sum(counts), moves, unreachable, time.perf_counter() - started)
+
+
+# --- Animation ---
+class WorldRenderer:
+    """
+    Incremental ANSI renderer: after the first frame only changed cells are redrawn.
+
+    The first frame attaches a dirty set to the world, which every writer of
+    the grid fills in: the primitives and editing methods, compiled programs,
+    trace replays and a swarm sharing the grid. Each later frame visits only
+    those cells, so its cost is O(cells written) rather than O(width x height),
+    compares them with a shadow copy of the last frame and moves the cursor to
+    each one that changed. A frame is sent with a single write. Writes made
+    straight into `world.cells` bypass the dirty set; call invalidate() after
+    them. Use one renderer per world, since they share the world's dirty set.
+    """
+
+    __slots__ = ("direction", "frame_interval", "last_frame", "position", "shadow", "stream", "top", "world")
+
+    def __init__(self, world: KarelWorld, stream: TextIO | None = None, fps: float = DEFAULT_FPS, top: int = 1) -> None:
+        """
+        Args:
+            world: World to draw
+            stream: Terminal stream (default: sys.stdout at render time)
+            fps: Most frames drawn per second by frame(); extra calls are skipped
+            top: Terminal row the world's top row is drawn on
+        """
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}")
+        self.world = world
+        self.stream = stream
+        self.frame_interval = 1 / fps
+        self.top = top
+        self.last_frame = float("-inf")
+        self.shadow: bytearray | None = None  # None until the first full frame
+        self.position = world.position
+        self.direction = world.direction
+
+    def _cursor(self, index: int) -> str:
+        """ANSI sequence moving the cursor onto the cell at flat `index`."""
+        row, column = divmod(index, self.world.stride)
+        return f"\x1b[{self.top + self.world.height - row};{2 * column - 1}H"
+
+    def _full_frame(self) -> str:
+        self.shadow = bytearray(self.world.cells)
+        self.world.dirty = set()
+        return f"\x1b[{self.top};1H\x1b[J" + self.world.render()
+
+    def _changes(self, shadow: bytearray) -> list[str]:
+        """Cursor moves and symbols for every written cell that differs from the last frame."""
+        world = self.world
+        cells = world.cells
+        # Karel's old and new cells are drawn below, whatever happened to them
+        karel_cells = (self.position, world.position)
+        out: list[str] = []
+        dirty, world.dirty = world.dirty or set(), set()
+        for index in sorted(dirty):
+            if cells[index] != shadow[index]:
+                shadow[index] = cells[index]
+                if index not in karel_cells:
+                    out += (self._cursor(index), CELL_SYMBOLS[cells[index]])
+
+        if (world.position, world.direction) != (self.position, self.direction):
+            out += (self._cursor(self.position), CELL_SYMBOLS[cells[self.position]])
+            out += (self._cursor(world.position), DIRECTION_ARROWS[world.direction])
+        return out
+
+    def draw(self) -> int:
+        """
+        Draw a frame now, regardless of the frame rate.
+
+        Returns:
+            Number of cells written (the whole grid for the first frame)
+        """
+        world = self.world
+        if self.shadow is None:
+            payload = [self._full_frame()]
+            written = world.width * world.height
+        else:
+            payload = self._changes(self.shadow)
+            written = len(payload) // 2
+        self.position, self.direction = world.position, world.direction
+        self.last_frame = time.perf_counter()
+
+        if payload:
+            # Park the cursor below the world so typing or other output does not land on it
+            payload.append(f"\x1b[{self.top + world.height};1H")
+            stream = self.stream or sys.stdout
+            stream.write("".join(payload))
+            stream.flush()
+        return written
+
+    def frame(self) -> bool:
+        """
+        Draw a frame if at least 1/fps seconds have passed since the last one.
+
+        Skipped frames cost nothing; their changes are drawn with the next one.
+
+        Returns:
+            True if a frame was drawn
+        """
+        if time.perf_counter() - self.last_frame < self.frame_interval:
+            return False
+        self.draw()
+        return True
+
+    def invalidate(self) -> None:
+        """Force the next frame to redraw everything, e.g. after other output scrolled the screen."""
+        self.shadow = None
+
+
+def animate(world: KarelWorld, actions: Iterable[str], renderer: WorldRenderer | None = None) -> int:
+    """
+    Perform primitive commands one by one, drawing frames at the renderer's rate.
+
+    Args:
+        world: World to act in
+        actions: Command names such as "move" or "turn_left"
+        renderer: Renderer to draw with (default: a new one on stdout)
+
+    Returns:
+        Number of actions performed
+    """
+    renderer = renderer or WorldRenderer(world)
+    renderer.draw()
+    performed = 0
+    for action in actions:
+        getattr(world, action)()
+        performed += 1
+        # Pace to the frame rate so every frame on screen is one visible step
+        time.sleep(max(0.0, renderer.frame_interval - (time.perf_counter() - renderer.last_frame)))
+        renderer.frame()
+    renderer.draw()
+    return performed
 
 
 # --- Challenge Functions ---
+SQUARE_PROGRAM: str = """
+# Trace a square, dropping a beeper on every cell of its outline
+repeat 4 {
+    repeat 3 { put_beeper move }
+    turn_right
+}
+"""
+
+
 def draw_square() -> None:
     """
     Challenge 1: Make Karel draw a square pattern.
@@ -250,9 +2723,24 @@ def draw_square() -> None:
     - Function sequencing
     - Repetitive patterns
     """
-    # TODO: Implement square drawing logic
-    # Use move(), turn_left(), and put_beeper() as needed
-    print("Drawing square...")
+    stats = compile_program(SQUARE_PROGRAM).execute(world)
+    world.display_world()
+    print(f"Square drawn in {stats.actions} actions")
+
+
+# North at the top; "#" is a wall, "." an open cell. Karel starts bottom-left, the goal is top-right
+MAZE_ROWS: tuple[str, ...] = (
+    "....#.....",
+    ".##.#.###.",
+    ".#..#...#.",
+    ".#.####.#.",
+    ".#......#.",
+    ".######.#.",
+    "......#.#.",
+    "#####.#.#.",
+    "......#...",
+    ".######.##",
+)
 
 
 def navigate_maze() -> None:
@@ -267,10 +2755,18 @@ def navigate_maze() -> None:
     - Problem-solving strategies
     - Function composition
     """
-    # TODO: Implement maze navigation logic
-    # Use front_is_clear(), left_is_clear(), right_is_clear()
-    # Use turn_left(), turn_right(), and move()
-    print("Navigating maze...")
+    maze = world_from_text("\n".join(MAZE_ROWS))
+    goal = (maze.width - 1, maze.height - 1)
+    maze.set_beepers(*goal, 1)
+
+    # One BFS from the goal gives the optimal route; no wall-following dead ends
+    if sys.stdout.isatty():
+        actions = animate(maze, path_to_actions(maze, shortest_path(maze, goal)), WorldRenderer(maze, fps=10))
+    else:
+        maze.display_world()
+        actions = navigate_to(maze, goal)
+        maze.display_world()
+    print(f"🏁 Reached the goal at {goal} in {actions} actions")
 
 
 def climb_mountain() -> None:
@@ -291,6 +2787,21 @@ def climb_mountain() -> None:
     print("Climbing mountain...")
 
 
+# A sparse field: digits are beeper counts, "#" a fence. Karel starts bottom-left
+HARVEST_ROWS: tuple[str, ...] = (
+    "..1.......",
+    ".....2....",
+    "1.........",
+    "...####...",
+    "......#.1.",
+    ".3....#...",
+    "......#...",
+    "..1.......",
+    "........2.",
+    "....1.....",
+)
+
+
 def solve_harvest_problem() -> None:
     """
     Challenge 4: Harvest a field of beepers.
@@ -305,8 +2816,20 @@ def solve_harvest_problem() -> None:
     - Resource collection
     - Complete coverage algorithms
     """
-    # TODO: Implement beeper harvesting logic
-    print("Harvesting beepers...")
+    field = world_from_text("\n".join(HARVEST_ROWS))
+    # Visiting the beepers directly beats sweeping every cell of a sparse field
+    plan = plan_harvest(field)
+    if sys.stdout.isatty():
+        animate(field, plan.actions, WorldRenderer(field, fps=10))
+    else:
+        field.display_world()
+        for action in plan.actions:
+            getattr(field, action)()
+        field.display_world()
+    print(
+        f"🌾 Harvested {plan.beepers} beepers in {plan.steps} steps ({plan.moves} moves), "
+        f"planned in {plan.seconds * 1000:.1f} ms"
+    )
 
 
 def create_custom_function(pattern_name: str) -> None:
@@ -395,10 +2918,10 @@ def main() -> None:
 
 
 # TODO: Additional features for enhancement
-# - Save/Load world state
-# - Step-by-step execution
-# - Visual animation
-# - Multiple Karel instances
+# ✅ Save/Load world state  # DONE!
+# ✅ Step-by-step execution  # DONE!
+# ✅ Visual animation  # DONE!
+# ✅ Multiple Karel instances  # DONE!
 # - Complex obstacle courses
 # - Timing and scoring system
 
@@ -1157,56 +1157,104 @@ print("]")
 """
 TOTAL_LIVES = 6
 
-selected_word = secrets.choice(hangman_words)
-failed_attempts = 0
 full_heart = "❤"
 empty_heart = "♡"
-letters_used_so_far = ""
-total_letters_typed_by_user = ""
 
 
-print("Welcome to the hangman game.")
-print("I have selected a word for you to guess.")
-print("You will write a single letter, if that letter is included in the word, it will be displayed.")
-print("If the letter you selected is not in the word, you have only six chances or lives.")
-print(f"{full_heart * (TOTAL_LIVES - failed_attempts)}{empty_heart * failed_attempts}")
+class HangmanGame:
+    """
+    State of one hangman round, kept apart from input() so it can be driven headlessly.
 
-selected_word_list = ["_"] * len(selected_word)
+    Letter positions are indexed once, so revealing a guess only touches the
+    slots where that letter actually occurs.
+    """
 
-unique_letters_in_selected_word = len(set(selected_word))
+    __slots__ = (
+        "failed_attempts",
+        "letter_positions",
+        "letters_used_so_far",
+        "selected_word",
+        "selected_word_list",
+        "total_letters_typed_by_user",
+        "unique_letters_in_selected_word",
+    )
 
-# print(selected_word_list)
-# print(selected_word)
-# print("".join(selected_word_list))
+    def __init__(self, selected_word: str) -> None:
+        self.selected_word = selected_word
+        self.selected_word_list = ["_"] * len(selected_word)
+        self.letter_positions: dict[str, list[int]] = {}
+        for index, letter in enumerate(selected_word):
+            self.letter_positions.setdefault(letter, []).append(index)
+        self.unique_letters_in_selected_word = len(self.letter_positions)
+        self.failed_attempts = 0
+        self.letters_used_so_far = ""
+        self.total_letters_typed_by_user = ""
 
-print("The word you have to guess have this many letters : ")
-print(" ".join(selected_word_list))
+    def guess(self, guess: str) -> str:
+        """
+        Apply one guessed letter.
 
+        Returns:
+            "repeat" if it was already tried, "hit" if it is in the word, "miss" otherwise
+        """
+        if guess in self.total_letters_typed_by_user:
+            return "repeat"
+        self.total_letters_typed_by_user += guess
 
-while selected_word != "".join(selected_word_list) and failed_attempts < TOTAL_LIVES:
-    guess = input("Type a letter : ").lower().strip()
-    if guess in total_letters_typed_by_user:
-        print(f"WARNING: You already used {guess}")
-    else:
-        if guess in selected_word:
+        positions = self.letter_positions.get(guess)
+        if positions is None:
+            self.letters_used_so_far += guess
+            self.failed_attempts += 1
+            return "miss"
+
+        upper = guess.upper()
+        for index in positions:
+            self.selected_word_list[index] = upper
+        self.unique_letters_in_selected_word -= 1
+        return "hit"
+
+    @property
+    def is_over(self) -> bool:
+        """True once the word is guessed or all lives are used."""
+        return self.unique_letters_in_selected_word == 0 or self.failed_attempts >= TOTAL_LIVES
+
+    def hearts(self) -> str:
+        """Remaining lives as hearts."""
+        return f"{full_heart * (TOTAL_LIVES - self.failed_attempts)}{empty_heart * self.failed_attempts}"
+
+
+def main() -> None:
+    game = HangmanGame(secrets.choice(hangman_words))
+
+    print("Welcome to the hangman game.")
+    print("I have selected a word for you to guess.")
+    print("You will write a single letter, if that letter is included in the word, it will be displayed.")
+    print("If the letter you selected is not in the word, you have only six chances or lives.")
+    print(game.hearts())
+
+    print("The word you have to guess have this many letters : ")
+    print(" ".join(game.selected_word_list))
+
+    while not game.is_over:
+        guess = input("Type a letter : ").lower().strip()
+        outcome = game.guess(guess)
+        if outcome == "repeat":
+            print(f"WARNING: You already used {guess}")
+        elif outcome == "hit":
             print(f"{guess} is in the word.")
-            for index, letter in enumerate(selected_word):
-                if guess == letter:
-                    selected_word_list[index] = guess.upper()
-            unique_letters_in_selected_word -= 1
         else:
-            letters_used_so_far += guess
-            failed_attempts += 1
-            print(f"{full_heart * (TOTAL_LIVES - failed_attempts)}{empty_heart * failed_attempts}")
+            print(game.hearts())
 
-        total_letters_typed_by_user += guess
+        print(" ".join(game.selected_word_list))
+        if game.unique_letters_in_selected_word == 0:
+            break
+        print(f"HINT: {game.letters_used_so_far.upper()} are NOT in the word.")
+
+    if game.failed_attempts == TOTAL_LIVES:
+        print("GAME OVER.")
+    else:
+        print("YOU GUESSED IT.")
 
-    print(" ".join(selected_word_list))
-    if unique_letters_in_selected_word == 0:
-        break
-    print(f"HINT: {letters_used_so_far.upper()} are NOT in the word.")
 
-if failed_attempts == TOTAL_LIVES:
-    print("GAME OVER.")
-else:
-    print("YOU GUESSED IT.")
+if __name__ == "__main__":
+    main()
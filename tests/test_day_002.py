@@ -0,0 +1,527 @@
+"""Tests for the tip calculator service and rate tables in day_002."""
+
+import asyncio
+import io
+import json
+import random
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP, Decimal
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
+
+import day_002
+from day_002 import SUPPORTED_ROUNDING, Check, Money, RateTables, TaxRate, TipCalculatorService
+
+
+# --- Money ---
+def test_money_arithmetic_and_ordering() -> None:
+    assert Money(1_050) + Money(-75) == Money(975)
+    assert Money(100) - Money(250) == Money(-150)
+    assert Money(5) < Money(6) <= Money(6)
+    assert sorted([Money(3), Money(-1), Money(2)]) == [Money(-1), Money(2), Money(3)]
+    assert (str(Money(-105)), str(Money(7)), repr(Money(123_456))) == ("-1.05", "0.07", "Money('1234.56')")
+    assert float(Money(250)) == 2.5
+    assert Money.from_decimal(Decimal("19.995")) == Money(2_000)
+    assert Money.from_decimal(Decimal("19.995"), ROUND_DOWN) == Money(1_999)
+    assert Money(1_999).to_decimal() == Decimal("19.99")
+
+
+def test_money_only_equals_money() -> None:
+    assert Money(100) != 100
+    assert Money(100) != Decimal("1.00")
+    assert Money.__eq__(Money(1), 1) is NotImplemented
+    with pytest.raises(TypeError):
+        _ = Money(1) < 2  # type: ignore[operator]
+
+
+def test_money_is_immutable_and_hashable() -> None:
+    amount = Money(500)
+    amounts = {amount}
+
+    with pytest.raises(AttributeError, match="immutable"):
+        amount.cents = 600
+    assert Money(500) in amounts
+    assert {Money(1): "a"}[Money(1)] == "a"
+
+
+@pytest.mark.parametrize(
+    ("cents", "percent", "rounding", "expected"),
+    [
+        (1_005, 10, ROUND_HALF_UP, 101),  # 100.5 rounds up
+        (1_005, 10, ROUND_HALF_EVEN, 100),  # 100.5 rounds to even
+        (1_015, 10, ROUND_HALF_EVEN, 102),  # 101.5 rounds to even
+        (1_001, 10, ROUND_DOWN, 100),
+        (1_001, 10, ROUND_UP, 101),
+        (-1_005, 10, ROUND_HALF_UP, -101),  # Away from zero, like Decimal
+        (-1_001, 10, ROUND_DOWN, -100),
+    ],
+)
+def test_percentage_rounds_like_decimal(cents: int, percent: int, rounding: str, expected: int) -> None:
+    assert Money(cents).percentage(percent, rounding) == Money(expected)
+
+
+def test_share_rounds_each_part() -> None:
+    assert Money(1_000).share(3) == Money(333)
+    assert Money(1_001).share(2) == Money(501)  # 500.5 rounds up
+    assert Money(1_001).share(2, ROUND_HALF_EVEN) == Money(500)
+    assert Money(1_001).share(3, ROUND_UP) == Money(334)
+
+
+def test_split_adds_up_with_independent_shares() -> None:
+    parts = Money(1_002).split(4)
+
+    assert parts == [Money(251), Money(251), Money(250), Money(250)]
+    assert sum(part.cents for part in parts) == 1_002
+    assert len({id(part) for part in parts}) == 4
+    assert Money(2).split(3) == [Money(1), Money(1), Money(0)]
+    with pytest.raises(ValueError, match="fewer than 1"):
+        Money(5).split(0)
+
+
+# --- Batch Calculations ---
+@pytest.mark.parametrize("rounding", SUPPORTED_ROUNDING)
+def test_batch_splits_match_the_decimal_reference(rounding: str) -> None:
+    np = pytest.importorskip("numpy")
+    rng = random.Random(7)
+    checks = [(rng.randrange(0, 10_000_000), rng.randrange(0, 60), rng.randrange(1, 40)) for _ in range(2_000)]
+    checks += [(0, 0, 1), (1, 50, 1), (5, 10, 2), (9_999_999_999, 25, 7)]  # Zero bill, half-cent ties, a large bill
+    bills, tips, people = (np.array(column) for column in zip(*checks, strict=True))
+
+    batch = day_002.calculate_splits_batch(bills, tips, people, rounding)
+
+    for index, (bill, tip, size) in enumerate(checks):
+        exact = day_002.calculate_split_exact(Decimal(bill).scaleb(-2), tip, size, rounding)
+        expected = tuple(day_002.to_cents(amount) for amount in exact)
+        assert (batch.tip_cents[index], batch.total_cents[index], batch.share_cents[index]) == expected
+
+
+def test_batch_splits_reject_invalid_inputs() -> None:
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="non-negative"):
+        day_002.calculate_splits_batch([-1], [15], [2])
+    with pytest.raises(ValueError, match="at least 1"):
+        day_002.calculate_splits_batch([100], [15], [0])
+
+
+# --- Split Strategies ---
+def test_equal_split_gives_leftover_cents_to_the_first_people() -> None:
+    shares = [share.cents for share in day_002.split_equal(Money(1_000), 3)]
+
+    assert shares == [334, 333, 333]
+
+
+def test_weighted_split_gives_leftover_cents_to_the_largest_remainders() -> None:
+    shares = [share.cents for share in day_002.split_weighted(Money(1_000), [1, 2, 4])]
+
+    # Exact shares are 142.86, 285.71 and 571.43 cents
+    assert shares == [143, 286, 571]
+
+
+def test_allocations_always_add_up() -> None:
+    rng = random.Random(11)
+    for _ in range(500):
+        total = Money(rng.randrange(0, 1_000_000))
+        weights = [rng.randrange(0, 6) for _ in range(rng.randrange(1, 9))]
+        if not any(weights):
+            weights[0] = 1
+        shares = [share.cents for share in day_002.split_weighted(total, weights)]
+        weight_sum = sum(weights)
+
+        assert sum(shares) == total.cents
+        for share, weight in zip(shares, weights, strict=True):
+            assert abs(share * weight_sum - total.cents * weight) < weight_sum  # Within one cent of exact
+            if weight == 0:
+                assert share == 0
+
+
+def test_itemized_split_shares_the_tip_by_subtotal() -> None:
+    subtotals = [Money(2_000), Money(1_000), Money(1)]
+
+    shares = [share.cents for share in day_002.split_itemized(subtotals, 15)]
+
+    assert sum(shares) == 3_451  # 30.01 plus a 4.50 tip
+    assert shares == [2_300, 1_150, 1]
+
+
+def test_batch_allocation_matches_row_by_row() -> None:
+    np = pytest.importorskip("numpy")
+    rng = random.Random(13)
+    totals = [rng.randrange(0, 100_000) for _ in range(300)]
+    weights = [[rng.randrange(0, 5) for _ in range(6)] for _ in totals]
+    for row in weights:
+        row[rng.randrange(6)] += 1
+
+    batch = day_002.allocate_cents_batch(np.array(totals), np.array(weights))
+
+    for index, (total, row) in enumerate(zip(totals, weights, strict=True)):
+        assert batch[index].tolist() == [share.cents for share in day_002.allocate_cents(Money(total), row)]
+
+
+def test_equal_split_batch_is_flat_per_party() -> None:
+    pytest.importorskip("numpy")
+    shares = day_002.split_equal_batch([1_000, 7, 5], [3, 1, 2])
+
+    assert shares.tolist() == [334, 333, 333, 7, 3, 2]
+
+
+def test_equal_split_batch_matches_money_split() -> None:
+    np = pytest.importorskip("numpy")
+    rng = random.Random(7)
+    totals = [rng.randrange(0, 100_000) for _ in range(200)]
+    sizes = [rng.randrange(1, 40) for _ in range(200)]
+
+    rows = np.split(day_002.split_equal_batch(totals, sizes), np.cumsum(sizes)[:-1])
+
+    for row, total, size in zip(rows, totals, sizes, strict=True):
+        assert row.tolist() == [share.cents for share in Money(total).split(size)]
+
+
+def test_equal_split_batch_handles_one_huge_party() -> None:
+    pytest.importorskip("numpy")
+    shares = day_002.split_equal_batch([10, 1_000_001] + [5] * 999, [1, 1_000_000] + [1] * 999)
+
+    assert shares.size == 1_000_000 + 1_000
+    assert shares[1:3].tolist() == [2, 1]
+    assert int(shares.sum()) == 10 + 1_000_001 + 5 * 999
+
+
+# --- Bill Pipeline ---
+BILLS_CSV = """bill,tip,people,note
+100,15,4,dinner
+abc,15,2,typo
+50,10,,no party
+80,25,2,
+10,20,2.5,half a person
+"""
+
+
+def test_csv_records_keep_their_line_numbers() -> None:
+    records = list(day_002.iter_bill_records(io.StringIO(BILLS_CSV)))
+
+    assert [line for line, _ in records] == [2, 3, 4, 5, 6]
+    assert records[0][1] == {"bill": "100", "tip": "15", "people": "4", "note": "dinner"}
+    assert records[2][1]["people"] == ""
+
+
+def test_jsonl_records_skip_blank_lines_and_flag_bad_ones() -> None:
+    source = io.StringIO('{"bill": 100, "tip": 15, "people": 4, "note": null}\n\nnot json\n[1, 2]\n')
+
+    records = list(day_002.iter_bill_records(source, "jsonl"))
+
+    assert records == [(1, {"bill": "100", "tip": "15", "people": "4"}), (3, {}), (4, {})]
+
+
+def test_unknown_record_format_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unsupported input format"):
+        list(day_002.iter_bill_records(io.StringIO(""), "xml"))
+
+
+def test_csv_pipeline_writes_valid_rows_and_reports_rejects(capsys: pytest.CaptureFixture[str]) -> None:
+    sink = io.StringIO()
+
+    assert day_002.process_bill_stream(io.StringIO(BILLS_CSV), sink) == (2, 3)
+
+    assert sink.getvalue().splitlines() == [
+        "bill,tip,people,tip_amount,total,per_person",
+        "100.00,15,4,15.00,115.00,28.75",
+        "80.00,25,2,20.00,100.00,50.00",
+    ]
+    rejects = capsys.readouterr().err.splitlines()
+    assert [line.split(":")[0] for line in rejects] == ["Line 3", "Line 4", "Line 6"]
+    assert "Missing field: people" in rejects[1]
+
+
+def test_jsonl_pipeline_keeps_money_as_strings() -> None:
+    source = io.StringIO('{"bill": "100", "tip": 15, "people": 4}\n{"bill": -5, "tip": 15, "people": 1}\nnope\n')
+    sink = io.StringIO()
+
+    assert day_002.process_bill_stream(source, sink, "jsonl") == (1, 2)
+
+    assert [json.loads(line) for line in sink.getvalue().splitlines()] == [
+        {"bill": "100.00", "tip": 15, "people": 4, "tip_amount": "15.00", "total": "115.00", "per_person": "28.75"}
+    ]
+
+
+def test_pipeline_records_written_rows_in_history(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(day_002, "PIPELINE_CHUNK_ROWS", 2)  # Several chunked writes
+    rows = "".join(f"{10 + index},15,2\n" for index in range(5))
+    sink = io.StringIO()
+
+    with day_002.CalculationHistory() as history:
+        assert day_002.process_bill_stream(io.StringIO("bill,tip,people\n" + rows), sink, history=history) == (5, 0)
+        assert history.count() == 5
+    assert len(sink.getvalue().splitlines()) == 6
+
+
+# --- Calculation History ---
+DAY = 86_400
+
+
+def _split(bill_cents: int, tip_percentage: int, num_people: int) -> tuple[Money, int, int, Money, Money, Money]:
+    tip = Money(bill_cents * tip_percentage // 100)
+    total = Money(bill_cents) + tip
+    return Money(bill_cents), tip_percentage, num_people, tip, total, total.split(num_people)[0]
+
+
+def test_history_commits_only_full_batches(tmp_path: Path) -> None:
+    path = tmp_path / "history.db"
+    history = day_002.CalculationHistory(path, batch_size=3)
+    for index in range(7):
+        history.record(_split(1_000 + index, 15, 2), recorded_at=index)
+
+    with day_002.CalculationHistory(path) as reader:
+        assert reader.count() == 6  # The seventh record is still pending in the writer
+    history.close()
+    with day_002.CalculationHistory(path) as reader:
+        assert reader.count() == 7
+
+
+def test_history_count_and_average_apply_filters(tmp_path: Path) -> None:
+    with day_002.CalculationHistory(tmp_path / "history.db") as history:
+        assert history.average_tip_percentage() is None
+        for recorded_at, bill_cents, tip, people in ((0, 5_000, 10, 2), (10, 20_000, 20, 4), (20, 9_000, 15, 2)):
+            history.record(_split(bill_cents, tip, people), recorded_at=recorded_at)
+
+        assert history.count() == 3
+        assert history.count(num_people=2) == 2
+        assert history.count(since=10) == 2
+        assert history.count(until=10) == 1
+        assert history.count(min_bill=Money(9_000)) == 2
+        assert history.average_tip_percentage() == 15.0
+        assert history.average_tip_percentage(num_people=2) == 12.5
+        assert history.average_tip_percentage(since=10, until=20) == 20.0
+
+
+def test_history_daily_totals_group_by_utc_day(tmp_path: Path) -> None:
+    with day_002.CalculationHistory(tmp_path / "history.db", batch_size=2) as history:
+        for recorded_at, bill_cents in ((0, 1_000), (DAY - 1, 2_000), (DAY, 3_000), (3 * DAY + 5, 4_000)):
+            history.record(_split(bill_cents, 10, 1), recorded_at=recorded_at)
+
+        assert history.daily_totals() == [
+            ("1970-01-01", 2, Money(3_000), Money(3_300)),
+            ("1970-01-02", 1, Money(3_000), Money(3_300)),
+            ("1970-01-04", 1, Money(4_000), Money(4_400)),
+        ]
+        assert history.daily_totals(since=DAY) == [
+            ("1970-01-02", 1, Money(3_000), Money(3_300)),
+            ("1970-01-04", 1, Money(4_000), Money(4_400)),
+        ]
+
+
+# --- Validation ---
+def test_bill_record_accepts_values_on_the_limits() -> None:
+    limits = day_002.ValidationLimits(bill=(1.0, 500.0), tip=(5, 30), people=(2, 8))
+
+    assert day_002.parse_bill_record({"bill": "1", "tip": "5", "people": "2"}, limits) == (
+        (Decimal("1.00"), 5, 2),
+        None,
+    )
+    assert day_002.parse_bill_record({"bill": "500.00", "tip": "30.9", "people": "8.0"}, limits) == (
+        (Decimal("500.00"), 30, 8),
+        None,
+    )
+
+
+@pytest.mark.parametrize(
+    ("fields", "error"),
+    [
+        ({"bill": "0.99", "tip": "5", "people": "2"}, "Minimum: $1.00"),
+        ({"bill": "500.01", "tip": "5", "people": "2"}, "Maximum: $500.00"),
+        ({"bill": "nan", "tip": "5", "people": "2"}, "Invalid bill amount"),
+        ({"bill": "10", "tip": "4", "people": "2"}, "Minimum tip: 5%"),
+        ({"bill": "10", "tip": "31", "people": "2"}, "Maximum tip: 30%"),
+        ({"bill": "10", "tip": "lots", "people": "2"}, "Invalid tip percentage"),
+        ({"bill": "10", "tip": "5", "people": "1"}, "at least 2 people"),
+        ({"bill": "10", "tip": "5", "people": "9"}, "Maximum supported: 8"),
+        ({"bill": "10", "tip": "5", "people": "2.5"}, "whole number"),
+        ({"bill": "10", "people": "2"}, "Missing field: tip"),
+        ({"bill": "", "tip": "5"}, "Missing fields: bill, people"),
+    ],
+)
+def test_bill_record_rejects_values_past_the_limits(fields: dict[str, str], error: str) -> None:
+    limits = day_002.ValidationLimits(bill=(1.0, 500.0), tip=(5, 30), people=(2, 8))
+
+    parsed, message = day_002.parse_bill_record(fields, limits)
+
+    assert parsed is None
+    assert message is not None
+    assert error in message
+
+
+def test_validation_limits_reject_impossible_party_sizes() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        day_002.ValidationLimits(people=(0, 5))
+    with pytest.raises(ValueError, match="cannot exceed"):
+        day_002.ValidationLimits(people=(6, 5))
+    assert day_002.ValidationLimits(people=(3, 3)).max_people == 3
+
+
+def test_validate_many_matches_single_parses() -> None:
+    raw = ["15", " 15 ", "abc", "100", "101", "-1", "15", "7.9"]
+
+    results = day_002.validate_many("tip", raw)
+
+    assert [result.code for result in results] == ["ok", "ok", "invalid", "ok", "range", "range", "ok", "ok"]
+    assert [result.value for result in results if result.ok] == [15, 15, 100, 15, 7]
+    assert results == [day_002.parse_tip(value.strip()) for value in raw]
+    assert [result.code for result in day_002.validate_many("people", ["1", "100", "101", "0", "2.5"])] == [
+        "ok",
+        "ok",
+        "range",
+        "range",
+        "fraction",
+    ]
+    assert [result.value for result in day_002.validate_many("bill", ["0.01", "100000", "0.004"])] == [
+        Decimal("0.01"),
+        Decimal("100000.00"),
+        None,
+    ]
+
+
+def test_validate_many_rejects_unknown_fields() -> None:
+    with pytest.raises(ValueError, match="Unknown field 'tax'"):
+        day_002.validate_many("tax", ["1"])
+
+
+# --- Rate Tables ---
+def _write_json(path: Path, table: dict[str, object]) -> Path:
+    path.write_text(json.dumps(table), encoding="utf-8")
+    return path
+
+
+def test_scalar_json_tax_table_reads_as_tax_rate(tmp_path: Path) -> None:
+    tax = _write_json(tmp_path / "tax.json", {"ny": 8.875, "or": {"tax_rate": 0, "service_charge": 3}})
+    fx = _write_json(tmp_path / "fx.json", {"USD": 1, "EUR": "0.92"})
+
+    tables = RateTables.load(tax, fx)
+
+    assert tables.tax_rate("NY") == TaxRate(88_750, 0)
+    assert tables.tax_rate("OR") == TaxRate(0, 30_000)
+
+
+def test_tax_row_without_tax_rate_names_file_and_jurisdiction(tmp_path: Path) -> None:
+    tax = _write_json(tmp_path / "tax.json", {"ny": {"service_charge": 3}})
+    fx = _write_json(tmp_path / "fx.json", {"USD": 1})
+
+    with pytest.raises(ValueError, match=r"tax\.json: jurisdiction 'ny' has no 'tax_rate'"):
+        RateTables.load(tax, fx)
+
+
+@pytest.mark.parametrize("entry", [[8.875], None, True])
+def test_tax_row_of_wrong_type_is_rejected(tmp_path: Path, entry: object) -> None:
+    tax = _write_json(tmp_path / "tax.json", {"ny": entry})
+    fx = _write_json(tmp_path / "fx.json", {"USD": 1})
+
+    with pytest.raises(ValueError, match=r"tax\.json: jurisdiction 'ny' must map to a number or an object"):
+        RateTables.load(tax, fx)
+
+
+def test_non_numeric_tax_rate_names_the_row(tmp_path: Path) -> None:
+    fx = _write_json(tmp_path / "fx.json", {"USD": 1})
+    tax = tmp_path / "tax.csv"
+    tax.write_text("jurisdiction,tax_rate\nny,8.875\nca,abc\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match=r"tax\.csv: jurisdiction 'ca' has an invalid rate"):
+        RateTables.load(tax, fx)
+
+
+def test_non_numeric_exchange_rate_names_the_row(tmp_path: Path) -> None:
+    tax = _write_json(tmp_path / "tax.json", {"ny": 8.875})
+    fx = _write_json(tmp_path / "fx.json", {"USD": 1, "EUR": "NaN"})
+
+    with pytest.raises(ValueError, match=r"fx\.json: currency 'EUR' has an invalid rate: NaN"):
+        RateTables.load(tax, fx)
+
+
+def _checks_tables() -> RateTables:
+    return RateTables(
+        {"NY": TaxRate(88_750, 0), "or": TaxRate(0, 30_000), "QC": TaxRate(149_750, 125_000)},
+        {"USD": Fraction(1), "EUR": Fraction("0.92"), "JPY": Fraction("151.37"), "CAD": Fraction("1.3612")},
+    )
+
+
+def test_batch_check_pricing_matches_one_at_a_time() -> None:
+    pytest.importorskip("numpy")
+    rng = random.Random(12)
+    tables = _checks_tables()
+    checks = [
+        Check(
+            Money(rng.randrange(0, 2_000_000)),
+            rng.randrange(0, 40),
+            rng.randrange(1, 12),
+            rng.choice(("NY", "ny", "OR", "QC")),
+            rng.choice(("USD", "eur", "JPY", "CAD")),
+        )
+        for _ in range(2_000)
+    ]
+
+    for settlement in ("USD", "JPY"):
+        expected = list(day_002.price_checks(checks, tables, settlement))
+        assert day_002.price_checks_batch(iter(checks), tables, settlement) == expected
+    assert day_002.price_checks_batch([], tables, "USD") == []
+
+
+def test_batch_check_pricing_rejects_bad_checks() -> None:
+    pytest.importorskip("numpy")
+    tables = _checks_tables()
+
+    with pytest.raises(ValueError, match="Unknown tax jurisdiction: TX"):
+        day_002.price_checks_batch([Check(Money(100), 15, 2, "tx", "USD")], tables, "USD")
+    with pytest.raises(ValueError, match="Unknown currency"):
+        day_002.price_checks_batch([Check(Money(100), 15, 2, "NY", "GBP")], tables, "USD")
+    with pytest.raises(ValueError, match="non-negative"):
+        day_002.price_checks_batch([Check(Money(-100), 15, 2, "NY", "USD")], tables, "USD")
+    with pytest.raises(ValueError, match="too large for int64"):
+        day_002.price_checks_batch([Check(Money(10**17), 15, 2, "QC", "USD")], tables, "USD")
+
+
+# --- HTTP Service ---
+async def _exchange(service: TipCalculatorService, request: bytes) -> tuple[bytes, bytes]:
+    """Send raw bytes to the service and return the status line and everything after it."""
+    reader, writer = await asyncio.open_connection(service.host, service.port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    status_line, _, rest = response.partition(b"\r\n")
+    return status_line, rest
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5", b"+5", b"1_0"])
+def test_invalid_content_length_is_answered_and_counted(length: bytes) -> None:
+    async def scenario() -> None:
+        service = TipCalculatorService(port=0)
+        await service.start()
+        try:
+            request = b"POST /split HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}"
+            status_line, rest = await _exchange(service, request)
+        finally:
+            await service.close()
+
+        assert status_line == b"HTTP/1.1 400 Bad Request"
+        assert b"Connection: close" in rest
+        assert b"Invalid Content-Length" in rest
+        assert service.requests == 1
+
+    asyncio.run(scenario())
+
+
+def test_valid_request_still_splits() -> None:
+    async def scenario() -> None:
+        service = TipCalculatorService(port=0)
+        await service.start()
+        try:
+            body = json.dumps({"bill": "100.00", "tip": "20", "people": "4"}).encode()
+            request = b"POST /split HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%b" % (len(body), body)
+            status_line, rest = await _exchange(service, request)
+        finally:
+            await service.close()
+
+        assert status_line == b"HTTP/1.1 200 OK"
+        result = json.loads(rest.partition(b"\r\n\r\n")[2])["results"][0]
+        assert result["per_person"] == "30.00"
+        assert service.requests == 1
+
+    asyncio.run(scenario())
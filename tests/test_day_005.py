@@ -0,0 +1,248 @@
+"""Tests for password policies in day_005."""
+
+import io
+import pickle
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import day_005
+from day_005 import LOWERCASE_LETTERS, NUMBERS, SYMBOLS, UPPERCASE_LETTERS
+
+CHARSETS = (LOWERCASE_LETTERS, UPPERCASE_LETTERS, SYMBOLS, NUMBERS)
+
+
+def _composition(password: str) -> tuple[int, int, int, int]:
+    return (
+        sum(char in LOWERCASE_LETTERS for char in password),
+        sum(char in UPPERCASE_LETTERS for char in password),
+        sum(char in SYMBOLS for char in password),
+        sum(char in NUMBERS for char in password),
+    )
+
+
+def test_generate_password_matches_requested_composition() -> None:
+    for counts in ((4, 4, 2, 2), (1, 0, 0, 0), (0, 3, 1, 9), (300, 1, 1, 1)):
+        assert _composition(day_005.generate_password(*counts)) == counts
+
+
+def test_generate_password_uses_the_policy() -> None:
+    day_005.get_password_policy.cache_clear()
+    day_005.generate_password(5, 1, 1, 1)
+    assert day_005.get_password_policy.cache_info().currsize == 1
+
+
+def test_validation_of_long_policy_builds_no_tables() -> None:
+    day_005._shuffle_table.cache_clear()
+    is_valid, errors, _ = day_005.validate_password_requirements(1_000_000, 1, 1, 1)
+    assert is_valid
+    assert not errors
+    assert day_005._shuffle_table.cache_info().currsize == 0
+
+
+def test_validation_reports_missing_classes() -> None:
+    is_valid, errors, suggestions = day_005.validate_password_requirements(3, 0, 1, 1)
+    assert not is_valid
+    assert len(errors) == len(suggestions) == 2  # Too short and no uppercase
+
+
+def _class_index(char: str) -> int:
+    return next(index for index, charset in enumerate(CHARSETS) if char in charset)
+
+
+def _position_frequencies(passwords: list[str]) -> list[list[float]]:
+    """Share of passwords with each character class at each position."""
+    tallies = [[0] * len(CHARSETS) for _ in passwords[0]]
+    for password in passwords:
+        for position, char in enumerate(password):
+            tallies[position][_class_index(char)] += 1
+    return [[count / len(passwords) for count in row] for row in tallies]
+
+
+def test_batch_generation_spreads_every_class_evenly_over_positions() -> None:
+    counts = (4, 4, 2, 2)
+    expected = [count / sum(counts) for count in counts]
+
+    batch = _position_frequencies(day_005.generate_passwords(20_000, *counts))
+    reference = _position_frequencies([day_005._generate_password_reference(*counts) for _ in range(5_000)])
+
+    # Standard errors are about 0.0033 and 0.0067, so these bounds sit near six of them
+    for row in batch:
+        assert all(abs(share - want) < 0.02 for share, want in zip(row, expected, strict=True))
+    for row in reference:
+        assert all(abs(share - want) < 0.04 for share, want in zip(row, expected, strict=True))
+
+
+def test_benchmark_compares_with_the_secrets_loop() -> None:
+    results = day_005.benchmark_password_generation(200)
+
+    assert set(results) == {"loop_us_per_password", "batch_us_per_password", "speedup"}
+    assert results["loop_us_per_password"] > 0
+
+
+def test_policy_keeps_tables_only_for_classes_it_uses() -> None:
+    policy = day_005.PasswordPolicy(3, 0, 2, 0)
+
+    assert [count for _, count in policy.class_tables] == [3, 2]
+    assert all(_composition(password) == (3, 0, 2, 0) for password in policy.generate(50))
+
+
+def test_invalid_stream_spec_leaves_the_output_file_untouched(tmp_path: Path) -> None:
+    output = tmp_path / "passwords.txt"
+    output.write_text("keep me\n", encoding="ascii")
+
+    with pytest.raises(SystemExit) as exit_info:
+        day_005.main(["--stream", "5", "--output", str(output), "--lowercase", "1", "--uppercase", "0"])
+
+    assert exit_info.value.code == 2
+    assert output.read_text(encoding="ascii") == "keep me\n"
+
+
+def test_endless_stream_stops_quietly_when_the_reader_closes_the_pipe() -> None:
+    script = Path(day_005.__file__)
+    with subprocess.Popen(
+        [sys.executable, str(script), "--stream", "0"], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    ) as writer:
+        assert writer.stdout is not None and writer.stderr is not None
+        assert len(writer.stdout.readline()) > 1
+        writer.stdout.close()
+        stderr = writer.stderr.read()
+
+    assert writer.returncode == 1
+    assert b"Traceback" not in stderr
+    assert b"BrokenPipeError" not in stderr
+
+
+def _audit_summary(report: day_005.PasswordAuditReport) -> tuple[object, ...]:
+    return (
+        report.passwords,
+        report.violations,
+        report.bytes_scanned,
+        dict(report.length_histogram),
+        dict(report.missing),
+    )
+
+
+def _expected_audit(text: str) -> tuple[object, ...]:
+    report = day_005.PasswordAuditReport()
+    report.bytes_scanned = len(text.encode("ascii"))
+    for line in text.split("\n"):
+        if not line:
+            continue
+        counts = _composition(line)
+        report.passwords += 1
+        report.length_histogram[len(line)] += 1
+        report.violations += not day_005.validate_password_requirements(*counts)[0]
+        for name, count in zip(("lowercase", "uppercase", "symbols", "numbers"), counts, strict=True):
+            report.missing[name] += not count
+    return _audit_summary(report)
+
+
+def _password_lines(count: int, seed: int) -> str:
+    rng = random.Random(seed)
+    alphabet = "".join(CHARSETS) + " ~"
+    return "\n".join("".join(rng.choices(alphabet, k=rng.randrange(1, 30))) for _ in range(count)) + "\n"
+
+
+def test_audit_matches_brute_force_serially_and_in_parallel(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    text = _password_lines(3_000, seed=6)
+    path = tmp_path / "passwords.txt"
+    path.write_text(text, encoding="ascii")
+    monkeypatch.setattr(day_005, "AUDIT_BLOCK_SIZE", 1_000)  # Many blocks, and shards below the real block size
+
+    serial = day_005.audit_password_file(path)
+    parallel = day_005.audit_password_file(path, workers=3)
+
+    assert _audit_summary(serial) == _audit_summary(parallel) == _expected_audit(text)
+
+
+def test_audit_shards_split_mid_line_without_losing_lines(tmp_path: Path) -> None:
+    text = "aB3$efgh\nshort\n\nNoDigits!!\n12345678\n"
+    path = tmp_path / "passwords.txt"
+    path.write_text(text, encoding="ascii")
+    whole = _audit_summary(day_005._audit_range(path, 0, len(text)))
+
+    for boundary in range(len(text) + 1):
+        report = day_005._audit_range(path, 0, boundary)
+        report.merge(day_005._audit_range(path, boundary, len(text)))
+        assert _audit_summary(report) == whole
+
+
+def test_audit_counts_a_final_line_without_newline(tmp_path: Path) -> None:
+    path = tmp_path / "passwords.txt"
+    path.write_text("aB3$efgh\nlast", encoding="ascii")
+
+    report = day_005.audit_password_file(path)
+
+    assert (report.passwords, report.violations, report.bytes_scanned) == (2, 1, 13)
+    assert report.length_histogram == {8: 1, 4: 1}
+
+
+def test_audit_of_an_empty_file_is_empty(tmp_path: Path) -> None:
+    path = tmp_path / "passwords.txt"
+    path.write_bytes(b"")
+
+    for workers in (None, 2):
+        report = day_005.audit_password_file(path, workers)
+        assert _audit_summary(report) == (0, 0, 0, {}, {})
+
+
+def test_custom_minimum_length_policy_streams_serially_and_in_parallel() -> None:
+    policy = day_005.PasswordPolicy(2, 1, 1, 1, minimum_length=5)
+    assert pickle.loads(pickle.dumps(policy)) == policy
+
+    serial = list(day_005.iter_passwords(policy, 50, batch_size=7))
+    parallel = [password for chunk in day_005.iter_passwords_parallel(policy, 50, workers=2) for password in chunk]
+    stream = io.StringIO()
+    stats = day_005.write_passwords_parallel(stream, policy, 50, workers=2, ordered=False)
+    written = stream.getvalue().splitlines()
+
+    for passwords in (serial, parallel, written):
+        assert len(passwords) == 50
+        assert {_composition(password) for password in passwords} == {(2, 1, 1, 1)}
+    assert sum(worker.passwords for worker in stats.values()) == 50
+
+
+def _reference_score(password: str) -> tuple[int, int, int, int, int]:
+    counts = [sum(char in charset for char in password) for charset in CHARSETS]
+    return (*counts, len(password) - sum(counts))  # type: ignore[return-value]
+
+
+def test_score_passwords_counts_each_class() -> None:
+    scores = day_005.score_passwords(["aB3$", "abcdefgh", "Hello World 42!", "((()))"])
+
+    assert [score[:5] for score in scores] == [(1, 1, 1, 1, 0), (8, 0, 0, 0, 0), (8, 2, 1, 2, 2), (0, 0, 6, 0, 0)]
+    assert [score.length for score in scores] == [4, 8, 15, 6]
+    assert [score.meets_policy for score in scores] == [False, False, True, False]
+    assert day_005.score_password("aB3$efgh").meets_policy
+
+
+def test_score_passwords_counts_non_ascii_as_other() -> None:
+    score = day_005.score_password("pässwörd€1A!")
+
+    assert score[:5] == (6, 1, 1, 1, 3)
+    assert score.length == len("pässwörd€1A!")
+    assert score.entropy_bits == day_005.estimate_entropy((6, 1, 1, 1, 3))
+
+
+def test_score_passwords_handles_empty_strings() -> None:
+    assert day_005.score_passwords([]) == []
+
+    empty, filled, last = day_005.score_passwords(["", "aB3$efgh", ""])
+
+    assert empty == last == (0, 0, 0, 0, 0, 0.0, "Very Weak", False)
+    assert filled.meets_policy
+
+
+def test_score_passwords_matches_a_per_character_count() -> None:
+    rng = random.Random(5)
+    alphabet = "".join(CHARSETS) + " ~é€\n\t"
+    passwords = ["".join(rng.choices(alphabet, k=rng.randrange(0, 20))) for _ in range(500)]
+
+    scores = day_005.score_passwords(passwords)
+
+    assert [score[:5] for score in scores] == [_reference_score(password) for password in passwords]
+    assert scores == [day_005.score_password(password) for password in passwords]
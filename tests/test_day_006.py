@@ -0,0 +1,539 @@
+"""Tests for the Karel world engine in day_006."""
+
+import io
+import os
+import pickle
+import random
+
+import pytest
+
+import day_006
+from day_006 import EAST, MAX_BEEPERS, NORTH, SOUTH, WALL_CELL, WEST, KarelWorld, RunLimits, SpatialIndex
+
+
+def _random_world(seed: int, width: int = 40, height: int = 30, walls: float = 0.2, beepers: float = 0.1) -> KarelWorld:
+    """A world with scattered walls and beeper piles; Karel starts on a free cell near the middle."""
+    rng = random.Random(seed)
+    world = KarelWorld(width, height)
+    world.place_karel(width // 2, height // 2, rng.choice((NORTH, EAST, SOUTH, WEST)))
+    for y in range(height):
+        for x in range(width):
+            roll = rng.random()
+            if roll < walls and (x, y) != world.karel_position:
+                world.add_wall(x, y)
+            elif roll < walls + beepers:
+                world.set_beepers(x, y, rng.randrange(1, 4))
+    return world
+
+
+# --- Engine ---
+def test_new_world_is_empty_inside_a_ring_of_walls() -> None:
+    world = KarelWorld(5, 3)
+    interior = {world.index(x, y) for x in range(5) for y in range(3)}
+
+    assert len(world.cells) == 7 * 5
+    assert all((value == WALL_CELL) != (index in interior) for index, value in enumerate(world.cells))
+    assert not world.walls
+    assert not world.beepers
+
+
+def test_primitives_follow_walls_edges_and_headings() -> None:
+    world = KarelWorld(3, 3)
+    world.add_wall(1, 1)
+
+    assert world.move()
+    assert world.karel_position == (0, 1)
+    assert not world.right_is_clear()  # (1, 1) is a wall
+    assert not world.left_is_clear()  # The western edge
+    assert world.move()
+    assert not world.front_is_clear()
+    assert not world.move()
+    assert world.karel_position == (0, 2)
+
+    world.turn_right()
+    assert world.facing_east()
+    for _ in range(4):
+        world.turn_left()
+    assert world.facing_east()
+    world.turn_left()
+    assert world.facing_north()
+    world.turn_right()
+    world.turn_right()
+    assert world.facing_south()
+
+
+def test_beepers_are_counted_per_cell() -> None:
+    world = KarelWorld(2, 2)
+
+    assert not world.pick_beeper()
+    world.put_beeper()
+    world.put_beeper()
+    assert world.beepers == {(0, 0): 2}
+    assert world.pick_beeper()
+    assert world.beepers_present()
+
+    world.set_beepers(1, 1, MAX_BEEPERS)
+    world.place_karel(1, 1)
+    with pytest.raises(ValueError, match="at most"):
+        world.put_beeper()
+
+
+def test_walls_replace_beepers_and_refuse_karel() -> None:
+    world = KarelWorld(3, 2)
+    world.set_beepers(2, 1, 5)
+    world.add_wall(2, 1)
+
+    assert world.walls == {(2, 1)}
+    with pytest.raises(AttributeError):
+        world.walls.add((0, 1))  # type: ignore[attr-defined]
+    with pytest.raises(TypeError):
+        world.beepers[(0, 1)] = 1  # type: ignore[index]
+    assert world.beeper_count(2, 1) == 0
+    assert not world.beepers
+    with pytest.raises(ValueError, match="wall on Karel"):
+        world.add_wall(0, 0)
+    with pytest.raises(ValueError, match="inside a wall"):
+        world.place_karel(2, 1)
+    with pytest.raises(ValueError, match="outside"):
+        world.index(3, 0)
+    world.remove_wall(2, 1)
+    assert not world.walls
+
+
+def test_pickled_world_is_an_equal_copy() -> None:
+    world = _random_world(1, 12, 9)
+
+    copy = pickle.loads(pickle.dumps(world))
+
+    assert bytes(copy.cells) == bytes(world.cells)
+    assert (copy.karel_position, copy.direction) == (world.karel_position, world.direction)
+    copy.put_beeper()
+    assert bytes(copy.cells) != bytes(world.cells)
+
+
+# --- Save / Load ---
+def test_text_round_trip_with_wall_at_origin() -> None:
+    world = KarelWorld(4, 3)
+    world.place_karel(1, 0, NORTH)
+    world.add_wall(0, 0)
+    world.add_wall(2, 2)
+    world.set_beepers(3, 1, 12)
+
+    loaded = day_006.world_from_text(day_006.world_to_text(world))
+
+    assert bytes(loaded.cells) == bytes(world.cells)
+    assert loaded.karel_position == (1, 0)
+    assert loaded.direction == NORTH
+
+
+def test_text_round_trip_keeps_direction_and_beepers() -> None:
+    world = day_006.world_from_text("\n".join(day_006.MAZE_ROWS))
+    world.place_karel(0, 4, EAST)
+    world.set_beepers(9, 9, 7)
+
+    loaded = day_006.world_from_text(day_006.world_to_text(world))
+
+    assert loaded.walls == world.walls
+    assert loaded.beepers == world.beepers
+    assert (loaded.karel_position, loaded.direction) == ((0, 4), EAST)
+
+
+def test_text_rejects_wall_under_karel() -> None:
+    with pytest.raises(ValueError, match="wall on Karel"):
+        day_006.world_from_text("karel 0 0 north\n..\n#.")
+
+
+# --- Batch Simulation ---
+def _walk_to_wall(world: KarelWorld) -> None:
+    while world.front_is_clear():
+        world.move()
+
+
+def _spin_without_primitives(world: KarelWorld) -> None:
+    while world is not None:
+        pass
+
+
+def _spin_on_odd_widths(world: KarelWorld) -> None:
+    if world.width % 2:
+        _spin_without_primitives(world)
+    _walk_to_wall(world)
+
+
+def _exit_process(world: KarelWorld) -> None:
+    os._exit(3)
+
+
+def _at_east_wall(world: KarelWorld) -> bool:
+    return world.karel_position[0] == world.width - 1
+
+
+def _at_east_wall_or_raise(world: KarelWorld) -> bool:
+    if world.width == 4:
+        raise KeyError("broken check")
+    return _at_east_wall(world)
+
+
+def _worlds(*widths: int) -> list[KarelWorld]:
+    worlds = []
+    for width in widths:
+        world = KarelWorld(width, 2)
+        world.place_karel(0, 0, EAST)
+        worlds.append(world)
+    return worlds
+
+
+def test_batch_grades_worlds_in_order() -> None:
+    report = day_006.run_batch(_walk_to_wall, _worlds(3, 4, 5, 6, 7), _at_east_wall, workers=2)
+
+    assert [result.world_id for result in report.results] == [0, 1, 2, 3, 4]
+    assert report.passed == 5
+    assert [result.steps for result in report.results] == [5, 7, 9, 11, 13]
+
+
+def test_batch_kills_runs_that_never_call_a_primitive(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(day_006, "HARD_TIMEOUT_GRACE", 0.1)
+    limits = RunLimits(timeout=0.2)
+
+    report = day_006.run_batch(_spin_on_odd_widths, _worlds(3, 4, 5, 6), _at_east_wall, limits, workers=2)
+
+    assert [result.outcome for result in report.results] == ["timeout", "passed", "timeout", "passed"]
+    assert report.outcomes["timeout"] == 2
+
+
+def test_batch_reports_a_dead_worker_as_an_error() -> None:
+    report = day_006.run_batch(_exit_process, _worlds(3, 4), workers=1)
+
+    assert [result.outcome for result in report.results] == ["error", "error"]
+
+
+def test_batch_reports_a_raising_check_as_an_error() -> None:
+    report = day_006.run_batch(_walk_to_wall, _worlds(3, 4, 5), _at_east_wall_or_raise, workers=1)
+
+    assert [result.outcome for result in report.results] == ["passed", "error", "passed"]
+    assert report.results[1].error == "check raised KeyError('broken check')"
+    assert report.results[1].steps == 7
+
+
+# --- Multiple Karel Instances ---
+def _swarm(world: KarelWorld, robots: list[tuple[int, int, int]]) -> day_006.KarelSwarm:
+    xs, ys, directions = zip(*robots, strict=True)
+    return day_006.KarelSwarm(world, list(xs), list(ys), list(directions))
+
+
+def test_swarm_queue_behind_a_wall_stays_put() -> None:
+    pytest.importorskip("numpy")
+    world = KarelWorld(50_001, 1)
+    world.add_wall(50_000, 0)
+    swarm = day_006.KarelSwarm(world, range(50_000), [0] * 50_000, EAST)
+
+    stats = swarm.step(day_006.ACTION_MOVE)
+
+    assert (stats.moved, stats.blocked) == (0, 50_000)
+    assert swarm.xs.tolist() == list(range(50_000))
+
+
+def test_swarm_queue_with_room_advances_as_a_whole() -> None:
+    pytest.importorskip("numpy")
+    world = KarelWorld(6, 1)
+    swarm = _swarm(world, [(0, 0, EAST), (1, 0, EAST), (2, 0, EAST), (3, 0, EAST)])
+
+    assert swarm.step(day_006.ACTION_MOVE).moved == 4
+    assert swarm.xs.tolist() == [1, 2, 3, 4]
+    assert swarm.step(day_006.ACTION_MOVE).moved == 4
+    assert swarm.step(day_006.ACTION_MOVE) == day_006.TickStats(0, 4, 0, 0)
+
+
+def test_swarm_robots_cannot_swap_cells() -> None:
+    pytest.importorskip("numpy")
+    world = KarelWorld(4, 1)
+    # A third robot queued behind the pair is blocked too
+    swarm = _swarm(world, [(1, 0, EAST), (2, 0, WEST), (0, 0, EAST)])
+
+    stats = swarm.step(day_006.ACTION_MOVE)
+
+    assert (stats.moved, stats.blocked) == (0, 3)
+    assert swarm.xs.tolist() == [1, 2, 0]
+
+
+def test_swarm_cycle_rotates_as_a_whole() -> None:
+    pytest.importorskip("numpy")
+    # Grid cycles have even length, so four robots round a 2x2 block is the shortest cycle allowed
+    world = KarelWorld(2, 2)
+    swarm = _swarm(world, [(0, 0, EAST), (1, 0, NORTH), (1, 1, WEST), (0, 1, SOUTH)])
+
+    assert swarm.step(day_006.ACTION_MOVE).moved == 4
+    assert list(zip(swarm.xs.tolist(), swarm.ys.tolist(), strict=True)) == [(1, 0), (1, 1), (0, 1), (0, 0)]
+
+
+def test_swarm_contended_cell_goes_to_the_lowest_robot() -> None:
+    pytest.importorskip("numpy")
+    world = KarelWorld(3, 2)
+    swarm = _swarm(world, [(2, 0, WEST), (0, 0, EAST), (1, 1, SOUTH)])
+
+    stats = swarm.step(day_006.ACTION_MOVE)
+
+    assert (stats.moved, stats.blocked) == (1, 2)
+    assert list(zip(swarm.xs.tolist(), swarm.ys.tolist(), strict=True)) == [(1, 0), (0, 0), (1, 1)]
+
+
+def test_swarm_picks_and_puts_update_the_world() -> None:
+    np = pytest.importorskip("numpy")
+    world = KarelWorld(4, 1)
+    world.set_beepers(0, 0, 2)
+    world.set_beepers(2, 0, MAX_BEEPERS)
+    swarm = _swarm(world, [(0, 0, NORTH), (1, 0, NORTH), (2, 0, NORTH), (3, 0, NORTH)])
+    pick, put = day_006.ACTION_PICK, day_006.ACTION_PUT
+
+    stats = swarm.step(np.array([pick, pick, put, put]))
+
+    assert (stats.picked, stats.put) == (1, 1)  # (1, 0) is empty and (2, 0) is full
+    assert world.beepers == {(0, 0): 1, (2, 0): MAX_BEEPERS, (3, 0): 1}
+    assert swarm.beepers_present().tolist() == [True, False, True, True]
+
+
+# --- Karel Language ---
+def test_repeat_count_is_bounded_at_parse_time() -> None:
+    with pytest.raises(ValueError, match="line 2: repeat count"):
+        day_006.compile_program("move\nrepeat 99999999999999999999 { move }")
+
+
+def test_largest_repeat_count_compiles() -> None:
+    program = day_006.compile_program(f"repeat {day_006.MAX_REPEAT} {{ turn_left }}")
+
+    assert day_006.MAX_REPEAT in program.code
+
+
+def test_compiled_program_runs_under_a_step_budget() -> None:
+    program = day_006.compile_program("while front_is_clear { move }")
+    spin = day_006.compile_program("while front_is_clear { turn_left turn_right }")
+
+    report = day_006.run_batch(program, _worlds(3, 4), _at_east_wall, workers=1)
+    assert [(result.outcome, result.steps) for result in report.results] == [("passed", 8), ("passed", 11)]
+
+    result = day_006.run_program(spin, _worlds(3)[0], limits=RunLimits(max_steps=5_000))
+    assert (result.outcome, result.steps) == ("step_limit", 5_000)
+
+
+def test_compiled_program_timeout_charges_the_steps_it_ran() -> None:
+    spin = day_006.compile_program("while front_is_clear { turn_left turn_right }")
+
+    result = day_006.run_program(spin, _worlds(3)[0], limits=RunLimits(max_steps=10**12, timeout=0.05))
+
+    assert result.outcome == "timeout"
+    assert result.steps > 0
+    assert result.error is not None
+    assert f"{result.steps:,} instructions" in result.error
+
+
+# --- Step-by-step execution ---
+TRACED_SOURCE = """
+define sweep { while front_is_clear { move if beepers_present { pick_beeper } } }
+repeat 5 { sweep turn_left sweep turn_right put_beeper }
+"""
+
+
+def _beeper_world() -> KarelWorld:
+    world = KarelWorld(9, 7)
+    world.place_karel(0, 0, EAST)
+    world.add_wall(4, 3)
+    for x, y, count in ((2, 0, 3), (8, 0, 1), (8, 5, 2)):
+        world.set_beepers(x, y, count)
+    return world
+
+
+def test_compiled_program_on_traced_world_records_every_action() -> None:
+    program = day_006.compile_program(TRACED_SOURCE)
+    plain = _beeper_world()
+    traced = day_006.TracedWorld(_beeper_world(), checkpoint_interval=4)
+
+    assert program.execute(traced) == program.execute(plain)
+    assert len(traced.trace) == program.execute(_beeper_world()).actions
+
+    final = traced.trace.replay().seek(len(traced.trace))
+    assert bytes(final.cells) == bytes(plain.cells)
+    assert (final.position, final.direction) == (plain.position, plain.direction)
+
+
+def test_seek_matches_stepping_in_both_directions() -> None:
+    traced = day_006.TracedWorld(_beeper_world(), checkpoint_interval=4)
+    day_006.compile_program(TRACED_SOURCE).execute(traced)
+    stepped = traced.trace.replay()
+    seeking = traced.trace.replay()
+
+    states = []
+    for _ in range(len(traced.trace) + 1):
+        states.append((bytes(stepped.world.cells), stepped.world.position, stepped.world.direction))
+        stepped.forward()
+    for step in (len(traced.trace), 3, 17, 0, len(traced.trace) - 1, 9):
+        world = seeking.seek(step)
+        assert (bytes(world.cells), world.position, world.direction) == states[step]
+
+
+# --- Harvest planning ---
+def _reachable(world: KarelWorld) -> set[tuple[int, int]]:
+    """Cells Karel can walk to, by a plain BFS over coordinates."""
+    seen = {world.karel_position}
+    frontier = [world.karel_position]
+    while frontier:
+        x, y = frontier.pop()
+        for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (
+                neighbour not in seen
+                and 0 <= neighbour[0] < world.width
+                and 0 <= neighbour[1] < world.height
+                and not world.is_wall(*neighbour)
+            ):
+                seen.add(neighbour)
+                frontier.append(neighbour)
+    return seen
+
+
+@pytest.mark.parametrize("seed", [2, 3, 4])
+def test_harvest_plan_collects_every_reachable_beeper_and_returns(seed: int) -> None:
+    world = _random_world(seed, walls=0.3)
+    reachable = _reachable(world)
+    expected_left = {cell: count for cell, count in world.beepers.items() if cell not in reachable}
+    start = world.karel_position
+
+    plan = day_006.plan_harvest(world)
+    for action in plan.actions:
+        assert getattr(world, action)() is not False  # Every move and pick succeeds
+
+    assert world.beepers == expected_left
+    assert sorted(plan.unreachable) == sorted(expected_left)
+    assert world.karel_position == start
+    assert plan.moves == plan.actions.count("move")
+    assert plan.beepers == plan.actions.count("pick_beeper")
+
+
+def test_two_opt_never_lengthens_the_greedy_tour() -> None:
+    for seed in range(5, 10):
+        world = _random_world(seed, 60, 60, walls=0.15, beepers=0.05)
+        greedy = day_006.plan_harvest(world, improve=False)
+        improved = day_006.plan_harvest(world)
+
+        assert improved.moves <= greedy.moves
+        assert improved.beepers == greedy.beepers
+
+
+def test_harvest_of_an_empty_world_is_empty() -> None:
+    plan = day_006.plan_harvest(KarelWorld(5, 5))
+
+    assert (plan.actions, plan.beepers, plan.moves, plan.unreachable) == ([], 0, 0, [])
+
+
+# --- Spatial index ---
+def _assert_index_matches_rebuild(world: KarelWorld) -> None:
+    fresh = SpatialIndex(world)
+    index = world.spatial_index()
+    for name in ("wall_rows", "wall_columns", "beeper_rows", "beeper_columns", "bucket_totals"):
+        assert getattr(index, name) == getattr(fresh, name), name
+
+
+def _walk_ahead(world: KarelWorld) -> tuple[int, int | None]:
+    """Moves possible straight ahead and the distance to the first beepers, by stepping a copy."""
+    walker = pickle.loads(pickle.dumps(world))
+    moves, beeper = 0, None
+    while walker.move():
+        moves += 1
+        if beeper is None and walker.beepers_present():
+            beeper = moves
+    return moves, beeper
+
+
+def test_spatial_queries_match_brute_force() -> None:
+    rng = random.Random(21)
+    world = _random_world(21, 70, 45, walls=0.15, beepers=0.05)
+    beepers = world.beepers
+
+    for _ in range(200):
+        corner = (rng.randrange(world.width), rng.randrange(world.height))
+        opposite = (rng.randrange(world.width), rng.randrange(world.height))
+        xs, ys = sorted((corner[0], opposite[0])), sorted((corner[1], opposite[1]))
+        expected = sum(count for (x, y), count in beepers.items() if xs[0] <= x <= xs[1] and ys[0] <= y <= ys[1])
+        assert world.count_beepers(corner, opposite) == expected
+
+        origin = (rng.randrange(world.width), rng.randrange(world.height))
+        nearest = world.nearest_beeper(origin)
+        assert nearest is not None
+        assert nearest in beepers
+        distance = abs(nearest[0] - origin[0]) + abs(nearest[1] - origin[1])
+        assert distance == min(abs(x - origin[0]) + abs(y - origin[1]) for x, y in beepers)
+
+    assert world.count_beepers((0, 0), (world.width - 1, world.height - 1)) == sum(beepers.values())
+    for cell in rng.sample(sorted(_reachable(world)), 100):
+        world.place_karel(*cell, rng.choice((NORTH, EAST, SOUTH, WEST)))
+        assert (world.open_cells_ahead(), world.beeper_ahead()) == _walk_ahead(world)
+
+
+def test_spatial_index_stays_equal_to_a_rebuild() -> None:
+    rng = random.Random(22)
+    world = _random_world(22, 35, 50, walls=0.1, beepers=0.2)
+    world.spatial_index()
+
+    for _ in range(3_000):
+        x, y = rng.randrange(world.width), rng.randrange(world.height)
+        roll = rng.random()
+        if (x, y) == world.karel_position:
+            continue
+        if roll < 0.1:
+            world.add_wall(x, y)
+        elif roll < 0.2:
+            world.remove_wall(x, y)
+        elif roll < 0.4 and not world.is_wall(x, y):
+            world.set_beepers(x, y, rng.randrange(0, 5))
+        elif not world.is_wall(x, y):
+            world.place_karel(x, y)
+            if world.beepers_present() and roll < 0.7:
+                world.pick_beeper()
+            elif world.beeper_count(x, y) < MAX_BEEPERS:
+                world.put_beeper()
+
+    _assert_index_matches_rebuild(world)
+    assert world.nearest_beeper() is None or world.nearest_beeper() in world.beepers
+
+
+def test_no_beepers_means_no_nearest() -> None:
+    world = KarelWorld(8, 8)
+
+    assert world.nearest_beeper() is None
+    assert world.count_beepers((0, 0), (7, 7)) == 0
+    assert world.beeper_ahead() is None
+    assert world.open_cells_ahead() == 7
+
+
+# --- Rendering ---
+def test_renderer_redraws_only_written_cells() -> None:
+    world = KarelWorld(50, 50)
+    renderer = day_006.WorldRenderer(world, io.StringIO())
+    assert renderer.draw() == 50 * 50
+
+    world.set_beepers(10, 10, 3)
+    world.add_wall(20, 5)
+    world.set_beepers(30, 30, 0)  # Written but unchanged, so not redrawn
+    day_006.compile_program("put_beeper").execute(world)  # Karel's own cell is drawn with the arrow
+
+    assert renderer.draw() == 2
+    assert renderer.shadow == world.cells
+    assert renderer.draw() == 0
+
+
+def test_renderer_follows_replays_and_swarms() -> None:
+    traced = day_006.TracedWorld(_beeper_world(), checkpoint_interval=4)
+    day_006.compile_program(TRACED_SOURCE).execute(traced)
+    trace = traced.trace
+    replay = trace.replay()
+    renderer = day_006.WorldRenderer(replay.world, io.StringIO())
+    renderer.draw()
+
+    for step in (len(trace), 3, len(trace) - 1, 0):
+        replay.seek(step)
+        renderer.draw()
+        assert renderer.shadow == replay.world.cells
+
+    pytest.importorskip("numpy")
+    swarm = day_006.KarelSwarm.scatter(replay.world, 10, seed=3)
+    swarm.step(day_006.ACTION_PUT)
+    assert renderer.draw() > 0
+    assert renderer.shadow == replay.world.cells